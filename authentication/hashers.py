@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class BulkPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 with fewer iterations, for accounts created in bulk by UserProvisioner.
+
+    It is listed after the default hasher in PASSWORD_HASHERS, so it is only
+    used when asked for, and a password stored with it is re-hashed with the
+    default hasher the first time its user logs in.
+    """
+    algorithm = "pbkdf2_sha256_bulk"
+    iterations = settings.BULK_PASSWORD_ITERATIONS
@@ -0,0 +1,40 @@
+import csv
+from django.core.management.base import BaseCommand, CommandError
+from authentication.provisioning import UserProvisioner, synthetic_accounts
+
+
+class Command(BaseCommand):
+    help = "Creates users with their profiles in bulk, from a CSV file or generated for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help="CSV with username, email, password and optionally is_seller "
+                                           "and profile columns.")
+        parser.add_argument('--count', type=int, default=0, help="Number of load testing accounts to generate.")
+        parser.add_argument('--sellers', type=int, default=0, help="How many generated accounts are sellers.")
+        parser.add_argument('--prefix', default='loadtest', help="Username prefix of generated accounts.")
+        parser.add_argument('--start', type=int, default=1, help="Number of the first generated account.")
+        parser.add_argument('--password', default='LoadTestP@ss1', help="Password of generated accounts.")
+        parser.add_argument('--hasher', default='default',
+                            help="Password hasher algorithm, e.g. pbkdf2_sha256_bulk for load testing accounts.")
+        parser.add_argument('--workers', type=int, default=None, help="Hashing processes, all CPUs by default.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Accounts inserted per transaction.")
+
+    def handle(self, *args, **options):
+        provisioner = UserProvisioner(
+            batch_size=options['batch_size'], workers=options['workers'], hasher=options['hasher']
+        )
+        if options['file']:
+            with open(options['file'], newline='', encoding='utf-8-sig') as file:
+                accounts = (
+                    {**row, 'is_seller': row.get('is_seller', '').lower() in ('1', 'true', 'yes')}
+                    for row in csv.DictReader(file)
+                )
+                created = provisioner.run(accounts)
+        elif options['count']:
+            created = provisioner.run(synthetic_accounts(
+                options['count'], prefix=options['prefix'], password=options['password'],
+                sellers=options['sellers'], start=options['start']
+            ))
+        else:
+            raise CommandError("Pass --file or --count.")
+        self.stdout.write(f"Created {created} user(s).")
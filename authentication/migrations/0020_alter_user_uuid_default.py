@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:53
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0019_alter_user_uuid'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+    ]
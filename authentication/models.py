@@ -2,11 +2,11 @@ import uuid
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
 from django.db import models
-from core.models import TimeStampMixin
+from core.models import TimeStampMixin, TrackChangesMixin
 from .managers import UserManager
 
 
-class User(AbstractUser):
+class User(TrackChangesMixin, AbstractUser):
     """
     User model with additional fields and custom validations.
     Attributes:
@@ -41,7 +41,7 @@ class User(AbstractUser):
     is_superuser = models.BooleanField(default=False)
     is_staff = models.BooleanField(default=False)
     is_seller = models.BooleanField(default=False)
-    uuid = models.UUIDField(default=uuid.uuid4(), editable=False, unique=True)
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     objects = UserManager()
 
     REQUIRED_FIELDS = ['email']
@@ -51,7 +51,8 @@ class User(AbstractUser):
 
     def save(self, *args, **kwargs):
         if self.is_superuser == False:
-            if not self.pk:
+            # set_password() records the raw password it hashed, e.g. in create_user().
+            if not self.pk and self._password is None:
                 self.set_password(self.password)
         super().save(*args, **kwargs)
 
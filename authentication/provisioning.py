@@ -0,0 +1,119 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+import django
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.db import transaction
+from .models import User, CustomerProfile, SellerProfile
+
+PROFILES = {
+    False: (CustomerProfile, ('first_name', 'last_name')),
+    True: (SellerProfile, ('first_name', 'last_name', 'company_name', 'about_company')),
+}
+
+
+def synthetic_accounts(count, prefix='loadtest', password='LoadTestP@ss1', sellers=0, start=1):
+    """
+    Generates accounts for load testing.
+
+    Args:
+        count (int): The number of accounts.
+        prefix (str): Prefix of the usernames and email addresses.
+        password (str): The password of every account.
+        sellers (int): How many of the accounts, the first ones, are sellers.
+        start (int): Number of the first account, to add accounts next to earlier ones.
+
+    Yields:
+        dict: One account, as accepted by UserProvisioner.run().
+    """
+    for number in range(start, start + count):
+        name = f"{prefix}_{number:07d}"
+        yield {
+            'username': name,
+            'email': f"{name}@gmail.com",
+            'password': password,
+            'first_name': prefix,
+            'last_name': str(number),
+            'is_seller': number - start < sellers,
+        }
+
+
+class UserProvisioner:
+    """
+    Creates users with their customer or seller profiles in batches.
+
+    Creating users one by one pays a full password hash per row in the
+    request process, while ``bulk_create`` skips User.save() and would store
+    raw passwords. Here each batch's passwords are hashed in parallel across
+    a process pool, and the users and their profiles are inserted with one
+    ``bulk_create`` per table in a single transaction. Usernames and emails
+    are not validated; a batch with a duplicate fails as a whole.
+
+    Attributes:
+        batch_size: Accounts hashed and inserted at a time.
+        workers: Hashing processes; 1 hashes in this process.
+        hasher: Algorithm of a configured password hasher, e.g.
+            ``pbkdf2_sha256_bulk`` for load testing accounts.
+
+    Raises:
+        ValueError: If the hasher is not configured.
+    """
+
+    def __init__(self, batch_size=1000, workers=None, hasher='default'):
+        self.batch_size = batch_size
+        self.workers = workers or os.cpu_count() or 1
+        self.hasher = get_hasher(hasher).algorithm
+
+    def run(self, accounts):
+        """
+        Provisions every account.
+
+        Args:
+            accounts (iterable): Dicts with ``username``, ``email`` and ``password``,
+                optionally ``is_seller`` and the profile fields.
+
+        Returns:
+            int: The number of created users.
+        """
+        hash_password = partial(make_password, hasher=self.hasher)
+        executor = None
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=django.setup)
+        created = 0
+        accounts = iter(accounts)
+        try:
+            while chunk := list(islice(accounts, self.batch_size)):
+                passwords = [account['password'] for account in chunk]
+                if executor is not None:
+                    hashed = list(executor.map(
+                        hash_password, passwords, chunksize=max(1, len(passwords) // (self.workers * 4))
+                    ))
+                else:
+                    hashed = [hash_password(password) for password in passwords]
+                self.insert(chunk, hashed)
+                created += len(chunk)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return created
+
+    def insert(self, accounts, passwords):
+        users = [
+            User(
+                username=account['username'],
+                email=account['email'],
+                password=password,
+                is_seller=bool(account.get('is_seller'))
+            )
+            for account, password in zip(accounts, passwords)
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=self.batch_size)
+            profiles = {model: [] for model, _ in PROFILES.values()}
+            for account, user in zip(accounts, users):
+                model, fields = PROFILES[user.is_seller]
+                values = {field: account[field] for field in fields if account.get(field)}
+                profiles[model].append(model(user=user, **values))
+            for model, rows in profiles.items():
+                model.objects.bulk_create(rows, batch_size=self.batch_size)
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import User
+from .tokens import CLAIMS, token_user_cache
+
+REVOKING_FIELDS = (*CLAIMS, 'password', 'is_active')
+
+
+@receiver(post_save, sender=User)
+def revoke_stale_tokens(sender, instance, created, **kwargs):
+    """
+    Revokes the tokens of an existing user whenever a claimed field, the
+    password or the active flag changes, so no accepted token carries stale claims.
+
+    A login re-encoding the password with the preferred hasher saves only the
+    password without setting a new one, and keeps the tokens.
+    """
+    update_fields = kwargs.get('update_fields')
+    if update_fields == {'password'} and instance._password is None:
+        return
+    if not created and any(instance.has_changed(field) for field in REVOKING_FIELDS):
+        token_user_cache.revoke(instance.id)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    """
+    Revokes the tokens of a deleted user.
+    """
+    token_user_cache.revoke(instance.id)
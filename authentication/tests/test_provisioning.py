@@ -0,0 +1,95 @@
+from io import StringIO
+from django.contrib.auth.hashers import identify_hasher
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from authentication.models import User, CustomerProfile, SellerProfile
+from authentication.provisioning import UserProvisioner, synthetic_accounts
+from authentication.tokens import TokenUserCache
+from config.settings import redis_client_first_db
+
+
+class UserProvisioningTestCase(TestCase):
+    """
+    Test case for verifying that users are provisioned in bulk with hashed passwords.
+    """
+
+    def provision(self, count, sellers=0, workers=1, batch_size=1000):
+        provisioner = UserProvisioner(batch_size=batch_size, workers=workers, hasher='pbkdf2_sha256_bulk')
+        return provisioner.run(synthetic_accounts(count, prefix='bulkuser', password='BulkP@ss123', sellers=sellers))
+
+    def test_users_and_profiles_are_inserted_in_bulk(self):
+        """
+        Test that a batch of users and their profiles costs one insert per table.
+        """
+        with CaptureQueriesContext(connection) as context:
+            created = self.provision(50, sellers=10)
+
+        inserts = [query for query in context.captured_queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(created, 50)
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(SellerProfile.objects.filter(user__username__startswith='bulkuser').count(), 10)
+        self.assertEqual(CustomerProfile.objects.filter(user__username__startswith='bulkuser').count(), 40)
+        self.assertEqual(User.objects.filter(is_seller=True, username__startswith='bulkuser').count(), 10)
+        self.assertEqual(len(set(User.objects.values_list('uuid', flat=True))), User.objects.count())
+
+    def test_every_password_is_hashed(self):
+        """
+        Test that provisioned passwords are stored hashed and still verify.
+        """
+        self.provision(5, workers=2, batch_size=2)
+
+        for user in User.objects.filter(username__startswith='bulkuser'):
+            self.assertEqual(identify_hasher(user.password).algorithm, 'pbkdf2_sha256_bulk')
+            self.assertTrue(user.check_password('BulkP@ss123'))
+
+    def test_login_upgrades_the_hash_and_keeps_the_token_valid(self):
+        """
+        Test that logging in re-hashes a bulk password with the default hasher without revoking the new token.
+        """
+        self.provision(1)
+        user = User.objects.get(username='bulkuser_0000001')
+        client = APIClient()
+
+        response = client.post(reverse('token_obtain_pair'),
+                               {'username': user.username, 'password': 'BulkP@ss123'}, format='json')
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        basket = client.get(reverse('basket-list'))
+
+        user.refresh_from_db()
+        self.assertEqual(identify_hasher(user.password).algorithm, 'pbkdf2_sha256')
+        self.assertEqual(basket.status_code, status.HTTP_404_NOT_FOUND)
+        redis_client_first_db.delete(TokenUserCache.revoked_key(user.id))
+
+    def test_created_users_are_not_hashed_twice(self):
+        """
+        Test that saving a user whose password is already encoded keeps it as is.
+        """
+        user = User.objects.create_user(email='hashonce@gmail.com', username='hashOnceUser', password='Hash0nceP@ss')
+
+        self.assertTrue(user.check_password('Hash0nceP@ss'))
+
+    def test_raw_passwords_looking_like_hashes_are_hashed(self):
+        """
+        Test that a raw password in the format of an encoded one is still hashed on create.
+        """
+        password = 'pbkdf2_sha256$1$salt$hash'
+        user = User.objects.create(email='hashlike@gmail.com', username='hashLikeUser', password=password)
+
+        self.assertNotEqual(user.password, password)
+        self.assertTrue(user.check_password(password))
+
+    def test_command_generates_accounts(self):
+        """
+        Test that the command provisions generated load testing accounts.
+        """
+        out = StringIO()
+        call_command('provision_users', '--count', '5', '--sellers', '2', '--prefix', 'cmduser',
+                     '--hasher', 'pbkdf2_sha256_bulk', '--workers', '1', stdout=out)
+
+        self.assertIn("Created 5 user(s).", out.getvalue())
+        self.assertEqual(SellerProfile.objects.filter(user__username__startswith='cmduser').count(), 2)
@@ -0,0 +1,44 @@
+import uuid
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from authentication.models import User, Address
+from core.testing import QueryPlanAssertionsMixin
+
+
+class AddressQueryPlansTestCase(QueryPlanAssertionsMixin, APITestCase):
+    """
+    Test case for verifying that address lookups by user UUID are planned on indexes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Seeds 2,000 users with 5 addresses each.
+        """
+        cls.users = User.objects.bulk_create([
+            User(email=f'plan{i}@gmail.com', username=f'planUser{i}', password='TestP@assword', uuid=uuid.uuid4())
+            for i in range(2000)
+        ])
+        Address.objects.bulk_create([
+            Address(
+                costumer=user,
+                province="Tehran",
+                city="Tehran",
+                street=f"Street {i}",
+                alley="alley",
+                house_number=str(i),
+                full_address=f"Street {i}, Tehran"
+            )
+            for user in cls.users
+            for i in range(5)
+        ], batch_size=5000)
+        cls.analyze('authentication_user', 'authentication_address')
+
+    def test_address_list_uses_the_user_indexes(self):
+        """
+        Test that listing a user's addresses reads both the user and the address tables through indexes.
+        """
+        url = reverse('user-addresses-list', kwargs={'user_uuid': self.users[1234].uuid})
+        response = self.assertIndexScan(lambda: self.client.get(url), 'authentication_address')
+        self.assertIndexScan(lambda: self.client.get(url), 'authentication_user')
+        self.assertEqual(len(response.data), 5)
@@ -0,0 +1,140 @@
+import uuid
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from authentication.models import User, SellerProfile
+from authentication.tokens import TokenUserCache
+from config.settings import redis_client_first_db
+from order.reservation import StockReservation
+from products.models import Product, Category
+
+
+class StatelessTokenTestCase(TestCase):
+    """
+    Test case for verifying that token-authenticated requests are served without user queries.
+    """
+
+    def setUp(self):
+        """
+        Creates a user with a product to put in the basket and logs the user in.
+        """
+        self.client = APIClient()
+        self.user = User.objects.create(
+            email='statelessuser@gmail.com',
+            username='statelessUsername',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        seller = SellerProfile.objects.create(user=self.user)
+        self.product = Product.objects.create(
+            name="Stateless Product",
+            price=1000,
+            detail="stateless product",
+            category=Category.objects.create(name='stateless-category'),
+            warehouse=10,
+            slug="stateless-product",
+            seller=seller
+        )
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'statelessUsername', 'password': 'TestP@assword'},
+            format='json'
+        )
+        self.access = response.data['access']
+
+    def tearDown(self):
+        redis_client_first_db.delete(
+            f"user:{self.user.id}",
+            TokenUserCache.revoked_key(self.user.id),
+            TokenUserCache.snapshot_key(self.user.id)
+        )
+        redis_client_first_db.zrem(StockReservation.deadlines_key, self.user.id)
+
+    def request_basket(self, token):
+        """
+        Adds the product to the basket and reads it back with a token.
+
+        Returns:
+            tuple: The responses and the number of queries reading the user table.
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        with CaptureQueriesContext(connection) as context:
+            added = self.client.post(reverse('basket-list'), {'product_id': self.product.id, 'quantity': 1})
+            listed = self.client.get(reverse('basket-list'))
+        user_queries = [query for query in context.captured_queries if '"authentication_user"' in query['sql']]
+        return added, listed, len(user_queries)
+
+    def test_tokens_carry_user_claims(self):
+        """
+        Test that issued access tokens carry the claims the stateless user is built from.
+        """
+        token = AccessToken(self.access)
+        self.assertEqual(token['uuid'], str(self.user.uuid))
+        self.assertFalse(token['is_seller'])
+        self.assertFalse(token['is_superuser'])
+
+    def test_basket_requests_run_no_user_query(self):
+        """
+        Test that authenticated basket requests never read the user from the database.
+        """
+        added, listed, user_queries = self.request_basket(self.access)
+
+        self.assertEqual(added.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(listed.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries, 0)
+
+    def test_tokens_without_claims_use_the_user_snapshot(self):
+        """
+        Test that a token issued without claims reads the user once and then its snapshot.
+        """
+        token = str(RefreshToken.for_user(self.user).access_token)
+
+        _, _, first_queries = self.request_basket(token)
+        _, listed, second_queries = self.request_basket(token)
+
+        self.assertEqual(first_queries, 1)
+        self.assertEqual(second_queries, 0)
+        self.assertEqual(listed.status_code, status.HTTP_200_OK)
+
+    def test_changing_a_claimed_field_revokes_tokens(self):
+        """
+        Test that tokens issued before a claimed field changed are rejected.
+        """
+        self.user.is_seller = True
+        self.user.save()
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        response = self.client.get(reverse('basket-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_obtained_right_after_a_revocation_is_accepted(self):
+        """
+        Test that logging in within the second of a revocation yields a token that is not revoked.
+        """
+        self.user.is_seller = True
+        self.user.save()
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'statelessUsername', 'password': 'TestP@assword'},
+            format='json'
+        )
+
+        _, listed, _ = self.request_basket(response.data['access'])
+
+        self.assertEqual(listed.status_code, status.HTTP_200_OK)
+
+    def test_saving_unchanged_claims_keeps_tokens(self):
+        """
+        Test that saving a user without touching claimed fields leaves its tokens valid.
+        """
+        self.user.first_name = 'Stateless'
+        self.user.save()
+
+        _, listed, _ = self.request_basket(self.access)
+
+        self.assertEqual(listed.status_code, status.HTTP_200_OK)
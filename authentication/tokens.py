@@ -0,0 +1,187 @@
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+from config.settings import redis_client_first_db
+
+CLAIMS = ('uuid', 'is_seller', 'is_superuser', 'is_staff')
+# Sub-second issue time, as ``iat`` only has whole seconds.
+ISSUED_AT_CLAIM = 'issued_at'
+
+
+def user_claims(user):
+    """
+    Returns:
+        dict: The user fields carried by the tokens of a user, keyed by claim.
+    """
+    return {
+        'uuid': str(user.uuid),
+        'is_seller': user.is_seller,
+        'is_superuser': user.is_superuser,
+        'is_staff': user.is_staff
+    }
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Issues token pairs carrying the user claims and the precise issue time,
+    which access tokens created from the refresh token copy.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[ISSUED_AT_CLAIM] = time.time()
+        for claim, value in user_claims(user).items():
+            token[claim] = value
+        return token
+
+
+class ClaimsUser(TokenUser):
+    """
+    Stateless user built from token claims or a cached user snapshot instead of a database row.
+    """
+
+    def __init__(self, token, claims):
+        super().__init__(token)
+        self.claims = claims
+
+    @property
+    def uuid(self):
+        return self.claims['uuid']
+
+    @property
+    def is_seller(self):
+        return self.claims['is_seller']
+
+    @property
+    def is_superuser(self):
+        return self.claims['is_superuser']
+
+    @property
+    def is_staff(self):
+        return self.claims['is_staff']
+
+
+class TokenUserCache:
+    """
+    Redis state backing stateless token authentication: revocations and user snapshots.
+
+    Revoking a user stores the moment of revocation, and every token of the
+    user issued up to that moment is rejected, including access tokens created
+    later from an older refresh token, since they inherit its issue time.
+    Tokens are compared by their sub-second ``issued_at`` claim, so a token
+    obtained right after a revocation is accepted; tokens without it fall back
+    to ``iat`` and are rejected up to the end of the revocation's second. Users
+    are revoked whenever a claimed field, their password or their active flag
+    changes, so the claims of a token that is still accepted are current.
+    Tokens issued without claims are served from a short-lived snapshot of the
+    user, read from the database once per TTL.
+
+    Attributes:
+        ttl: Seconds a user snapshot is kept.
+        revocation_ttl: Seconds a revocation is kept, the lifetime of the longest-lived token.
+    """
+    __client = redis_client_first_db
+    ttl = settings.USER_SNAPSHOT_TTL
+    revocation_ttl = int(max(api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME).total_seconds())
+
+    @staticmethod
+    def revoked_key(user_id):
+        return f"auth:revoked:{user_id}"
+
+    @staticmethod
+    def snapshot_key(user_id):
+        return f"auth:user:{user_id}"
+
+    def get_claims(self, token):
+        """
+        Returns the claims of the user a token was issued to, unless the token was revoked.
+
+        Tokens carrying every claim cost a single GET; others add the snapshot to
+        the same round trip and read the database on a miss.
+
+        Args:
+            token (Token): A validated token.
+
+        Returns:
+            dict: The user's claims.
+
+        Raises:
+            AuthenticationFailed: If the token was revoked or the user no longer exists.
+        """
+        user_id = token[api_settings.USER_ID_CLAIM]
+        stateless = all(claim in token for claim in CLAIMS)
+        pipeline = self.__class__.__client.pipeline()
+        pipeline.get(self.revoked_key(user_id))
+        if not stateless:
+            pipeline.hgetall(self.snapshot_key(user_id))
+        revoked, *snapshot = pipeline.execute()
+
+        if revoked is not None and token.get(ISSUED_AT_CLAIM, token.get('iat', 0)) <= float(revoked):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        if stateless:
+            return {claim: token[claim] for claim in CLAIMS}
+        if snapshot[0]:
+            return {
+                'uuid': snapshot[0][b'uuid'].decode('utf-8'),
+                **{claim: snapshot[0][claim.encode()] == b'1' for claim in CLAIMS[1:]}
+            }
+        return self.load(user_id)
+
+    def load(self, user_id):
+        """
+        Reads a user's claims from the database and caches them as a snapshot.
+
+        Raises:
+            AuthenticationFailed: If the user does not exist or is inactive.
+        """
+        user = get_user_model().objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}, is_active=True
+        ).only('uuid', *CLAIMS[1:]).first()
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        claims = user_claims(user)
+        pipeline = self.__class__.__client.pipeline()
+        pipeline.hset(
+            self.snapshot_key(user_id),
+            mapping={claim: value if claim == 'uuid' else int(value) for claim, value in claims.items()}
+        )
+        pipeline.expire(self.snapshot_key(user_id), self.ttl)
+        pipeline.execute()
+        return claims
+
+    def revoke(self, user_id):
+        """
+        Rejects every token issued to a user so far and drops the user's snapshot.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+        pipeline = self.__class__.__client.pipeline()
+        pipeline.set(self.revoked_key(user_id), time.time(), ex=self.revocation_ttl)
+        pipeline.delete(self.snapshot_key(user_id))
+        pipeline.execute()
+
+
+token_user_cache = TokenUserCache()
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication returning a ClaimsUser, so authenticated requests run no user query.
+
+    Only the revocation check of TokenUserCache runs per request; the user is
+    built from the token's signed claims.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        return ClaimsUser(validated_token, token_user_cache.get_claims(validated_token))
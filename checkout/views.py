@@ -1,5 +1,6 @@
+from rest_framework import status
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from authentication.tokens import StatelessJWTAuthentication
 from order.basket import BasketAndOrderRedisAdapter
 from django.http import HttpRequest
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
@@ -7,12 +8,17 @@ from authentication.permissions import ValidateBasket
 
 
 @api_view(["GET", "POST"])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([StatelessJWTAuthentication])
 @permission_classes([ValidateBasket])
 def payment_gateway(request: HttpRequest):
     """
     Handles payments by interacting with the user's basket and processing payment details.
 
+    A successful payment only hands the basket to the order finalization queue;
+    the order is written by a finalize_orders worker, so the response time does
+    not depend on the basket size. If the basket cannot be queued the payment
+    is recorded as failed.
+
     Args:
         request (HttpRequest): The HTTP request object containing user data.
 
@@ -33,10 +39,16 @@ def payment_gateway(request: HttpRequest):
                 basket.set_payment_information(message="fail")
                 return Response({"message": "Please enter all information"})
 
-        basket.set_payment_information(message="success")
+        payment = basket.set_payment_information(message="success")
+        payment_id = payment[b"payment_id"].decode("utf-8")
 
-        basket.create_order()
-        return Response({"message": "Payment was successful!"})
+        try:
+            basket.submit_order(payment_id)
+        except ValueError as e:
+            basket.set_payment_information(message="fail", payment_id=payment_id)
+            return Response({"message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"message": "Payment was successful!", "payment_id": payment_id},
+                        status=status.HTTP_202_ACCEPTED)
 
     else:
 
@@ -13,6 +13,7 @@ import os
 import sys
 from datetime import timedelta
 from pathlib import Path
+from django.conf import global_settings
 # from dotenv import load_dotenv
 
 # load_dotenv("/home/alibaghani/projects/hello/E-commerce/.env")
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     "core.apps.CoreConfig",
     "authentication.apps.AuthenticationConfig",
     "products.apps.ProductsConfig",
@@ -65,6 +67,7 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.RequestContextMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -148,7 +151,8 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
     "BLACKLIST_AFTER_ROTATION": False,
-    "UPDATE_LAST_LOGIN": False}
+    "UPDATE_LAST_LOGIN": False,
+    "TOKEN_OBTAIN_SERIALIZER": "authentication.tokens.ClaimsTokenObtainPairSerializer"}
 
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
@@ -189,3 +193,25 @@ CACHES = {
         "KEY_PREFIX": "example"
     }
 }
+
+BASKET_RESERVATION_TTL = int(os.getenv("BASKET_RESERVATION_TTL", 60 * 30))
+PRODUCT_SNAPSHOT_TTL = int(os.getenv("PRODUCT_SNAPSHOT_TTL", 60 * 60))
+PRODUCT_SNAPSHOT_LOCAL_SIZE = int(os.getenv("PRODUCT_SNAPSHOT_LOCAL_SIZE", 10000))
+ORDER_FINALIZATION_MAX_ATTEMPTS = int(os.getenv("ORDER_FINALIZATION_MAX_ATTEMPTS", 5))
+ORDER_FINALIZATION_RETRY_AFTER = int(os.getenv("ORDER_FINALIZATION_RETRY_AFTER", 60 * 1000))
+PRODUCT_PAGE_SIZE = int(os.getenv("PRODUCT_PAGE_SIZE", 20))
+CATALOG_CACHE_ENABLED = os.getenv("CATALOG_CACHE_ENABLED", str(not TESTING)).lower() in ("1", "true", "yes")
+CATALOG_CACHE_TTL = int(os.getenv("CATALOG_CACHE_TTL", 60 * 5))
+CATEGORY_PRODUCT_COUNTER_ENABLED = os.getenv("CATEGORY_PRODUCT_COUNTER_ENABLED", "false").lower() in ("1", "true", "yes")
+PRODUCT_PRICE_FACET_BOUNDS = tuple(int(bound) for bound in os.getenv("PRODUCT_PRICE_FACET_BOUNDS", "100,500,1000,5000,10000").split(","))
+PRODUCT_FACET_CACHE_ENABLED = os.getenv("PRODUCT_FACET_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+SOFT_DELETE_ARCHIVE_AFTER_DAYS = int(os.getenv("SOFT_DELETE_ARCHIVE_AFTER_DAYS", 30))
+PRODUCT_IMPORT_BATCH_SIZE = int(os.getenv("PRODUCT_IMPORT_BATCH_SIZE", 2000))
+PRODUCT_IMPORT_MAX_ERRORS = int(os.getenv("PRODUCT_IMPORT_MAX_ERRORS", 100))
+USER_SNAPSHOT_TTL = int(os.getenv("USER_SNAPSHOT_TTL", 60 * 5))
+DISCOUNT_CODE_CACHE_TTL = int(os.getenv("DISCOUNT_CODE_CACHE_TTL", 60 * 10))
+DISCOUNT_CODE_NEGATIVE_CACHE_TTL = int(os.getenv("DISCOUNT_CODE_NEGATIVE_CACHE_TTL", 60))
+DISCOUNT_CODE_ATTEMPT_LIMIT = int(os.getenv("DISCOUNT_CODE_ATTEMPT_LIMIT", 10))
+DISCOUNT_CODE_ATTEMPT_WINDOW = int(os.getenv("DISCOUNT_CODE_ATTEMPT_WINDOW", 60))
+BULK_PASSWORD_ITERATIONS = int(os.getenv("BULK_PASSWORD_ITERATIONS", 20000))
+PASSWORD_HASHERS = [*global_settings.PASSWORD_HASHERS, "authentication.hashers.BulkPBKDF2PasswordHasher"]
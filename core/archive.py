@@ -0,0 +1,157 @@
+from django.db import connection, transaction
+
+_archives = {}
+
+
+def archive_table(table):
+    return f"{table}_archive"
+
+
+def create_archive_sql(table, deleted_only=True, index_columns=()):
+    """
+    Returns the SQL creating the archive table of a table.
+
+    The archive inherits from the table, so scans of the table include archived
+    rows while ``ONLY`` and constraint exclusion keep them out of hot queries.
+
+    Args:
+        table (str): The table whose rows are archived.
+        deleted_only (bool): Whether the archive only holds soft-deleted rows. The
+            CHECK constraint lets the planner skip the archive for live-row queries.
+        index_columns (iterable): Columns archived rows are looked up by, e.g. foreign keys.
+
+    Returns:
+        list: The statements creating the archive table and its indexes.
+    """
+    archive = archive_table(table)
+    check = "CHECK (is_deleted)" if deleted_only else ""
+    return [
+        f'CREATE TABLE "{archive}" ({check}) INHERITS ("{table}")',
+        f'ALTER TABLE "{archive}" ADD PRIMARY KEY (id)',
+        *(f'CREATE INDEX "{archive}_{column}_idx" ON "{archive}" ("{column}")' for column in index_columns),
+    ]
+
+
+def drop_archive_sql(table):
+    return [f'DROP TABLE IF EXISTS "{archive_table(table)}"']
+
+
+def get_archive(model):
+    """
+    Returns:
+        SoftDeleteArchive|None: The archive registered for a model, if any.
+    """
+    return _archives.get(model._meta.concrete_model)
+
+
+def registered_archives():
+    """
+    Returns:
+        list: Every registered archive.
+    """
+    return list(_archives.values())
+
+
+class SoftDeleteArchive:
+    """
+    Moves long soft-deleted rows of a model into its archive table.
+
+    The archive table inherits from the model's table (see create_archive_sql),
+    so the model's ``everything`` manager, which scans the table without
+    ``ONLY``, still sees archived rows and can update or delete them, while the
+    ``is_deleted = false`` queries of ``objects`` are planned on the hot table
+    alone. Rows of dependent models pointing at archived rows are moved into
+    their own archive tables in the same transaction, since foreign keys only
+    reference the hot table.
+
+    Attributes:
+        model: The soft-deletable model.
+        dependents: ``(model, foreign key column)`` pairs archived along with it.
+    """
+
+    def __init__(self, model, dependents=()):
+        self.model = model
+        self.dependents = [(dependent, dependent._meta.get_field(field).column) for dependent, field in dependents]
+        _archives[model] = self
+
+    @staticmethod
+    def columns(model):
+        return ', '.join(
+            connection.ops.quote_name(field.column)
+            for field in model._meta.concrete_fields
+            if not field.generated
+        )
+
+    @staticmethod
+    def move(cursor, model, source, target, where, params):
+        """
+        Moves the rows matching a condition from one table to another.
+
+        Returns:
+            list: The primary keys of the moved rows.
+        """
+        columns = SoftDeleteArchive.columns(model)
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM ONLY "{source}" WHERE {where} RETURNING {columns}) '
+            f'INSERT INTO "{target}" ({columns}) SELECT {columns} FROM moved RETURNING id',
+            params
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def archive(self, deleted_before, batch_size=1000):
+        """
+        Archives the rows soft-deleted before a moment, one batch per transaction.
+
+        Args:
+            deleted_before (datetime): Rows deleted before this moment are archived.
+            batch_size (int): Rows moved per transaction.
+
+        Returns:
+            int: The number of archived rows.
+        """
+        table = self.model._meta.db_table
+        archived = 0
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                ids = self.move(
+                    cursor, self.model, table, archive_table(table),
+                    f'id IN (SELECT id FROM ONLY "{table}" WHERE is_deleted AND deleted_at < %s '
+                    f'ORDER BY id LIMIT %s FOR UPDATE SKIP LOCKED)',
+                    [deleted_before, batch_size]
+                )
+                for dependent, column in self.dependents if ids else ():
+                    dependent_table = dependent._meta.db_table
+                    self.move(cursor, dependent, dependent_table, archive_table(dependent_table),
+                              f'"{column}" = ANY(%s)', [ids])
+            archived += len(ids)
+            if len(ids) < batch_size:
+                return archived
+
+    def unarchive(self, ids):
+        """
+        Moves archived rows and their dependents back into the hot tables.
+
+        Args:
+            ids (iterable): The primary keys of the rows.
+
+        Returns:
+            int: The number of rows moved back.
+        """
+        ids = list(ids)
+        table = self.model._meta.db_table
+        with transaction.atomic(), connection.cursor() as cursor:
+            moved = self.move(cursor, self.model, archive_table(table), table, 'id = ANY(%s)', [ids])
+            for dependent, column in self.dependents if moved else ():
+                dependent_table = dependent._meta.db_table
+                self.move(cursor, dependent, archive_table(dependent_table), dependent_table,
+                          f'"{column}" = ANY(%s)', [moved])
+        return len(moved)
+
+    def count(self):
+        """
+        Returns:
+            int: The number of archived rows.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM "{archive_table(self.model._meta.db_table)}"')
+            return cursor.fetchone()[0]
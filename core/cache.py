@@ -0,0 +1,102 @@
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+
+class TaggedResponseCache:
+    """
+    Caches rendered API response payloads in the default Django cache and
+    invalidates them by tag.
+
+    Every entry is stored with a list of tags, e.g. ``product:12`` or
+    ``category:3``. Each tag is a Redis set holding the keys of the entries
+    carrying it, so invalidating a tag deletes exactly those entries and
+    nothing else.
+
+    Attributes:
+        prefix: Prefix of entry keys.
+        tag_prefix: Prefix of the Redis sets listing the entries of a tag.
+        timeout: Seconds an entry is kept.
+    """
+    prefix = "response"
+    tag_prefix = "response:tag"
+    timeout = settings.CATALOG_CACHE_TTL
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+
+    @property
+    def enabled(self):
+        return settings.CATALOG_CACHE_ENABLED
+
+    @property
+    def client(self):
+        return get_redis_connection(self.alias)
+
+    def make_key(self, path, params):
+        """
+        Builds the entry key from the request URL and query parameters.
+
+        Args:
+            path (str): The request URL without its query string.
+            params (dict): The query parameters that affect the response.
+
+        Returns:
+            str: The entry key, independent of the parameter order.
+        """
+        query = urlencode(sorted((key, value) for key, value in params.items() if value not in (None, '')))
+        return f"{self.prefix}:{path}?{query}"
+
+    def tag_key(self, tag):
+        return cache.make_key(f"{self.tag_prefix}:{tag}")
+
+    def get(self, key):
+        """
+        Returns:
+            dict|None: The cached entry, or None on a miss.
+        """
+        return cache.get(key)
+
+    def set(self, key, value, tags):
+        """
+        Stores an entry and registers it under each of its tags.
+
+        Args:
+            key (str): The entry key.
+            value (dict): The entry to cache.
+            tags (iterable): The tags the entry depends on.
+        """
+        cache.set(key, value, self.timeout)
+        pipeline = self.client.pipeline(transaction=False)
+        for tag in tags:
+            pipeline.sadd(self.tag_key(tag), key)
+            pipeline.expire(self.tag_key(tag), self.timeout)
+        pipeline.execute()
+
+    def invalidate(self, *tags):
+        """
+        Deletes every entry carrying any of the given tags.
+
+        Args:
+            tags (str): The tags whose entries are stale.
+        """
+        if not self.enabled or not tags:
+            return
+        tag_keys = [self.tag_key(tag) for tag in tags]
+        pipeline = self.client.pipeline(transaction=False)
+        for tag_key in tag_keys:
+            pipeline.smembers(tag_key)
+        keys = {key.decode('utf-8') for members in pipeline.execute() for key in members}
+        if keys:
+            cache.delete_many(keys)
+        self.client.delete(*tag_keys)
+
+    def clear(self):
+        """
+        Deletes every cached response and tag.
+        """
+        cache.delete_pattern(f"{self.prefix}:*")
+
+
+response_cache = TaggedResponseCache()
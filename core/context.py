@@ -0,0 +1,61 @@
+from authentication.models import Address
+
+
+class RequestContext:
+    """
+    Facts about the requesting user, each fetched at most once per request.
+
+    RequestContextMiddleware attaches a context to every request as
+    ``request.context``, so permissions, views and the basket adapter they
+    build share the user, their addresses, their discount code checks and
+    their decoded basket instead of fetching them again. Code that changes
+    one of these facts during the request drops it with forget().
+
+    Attributes:
+        request: The request the facts belong to.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self._values = {}
+
+    @property
+    def user(self):
+        """
+        Returns:
+            The authenticated user, as set by the authentication class.
+        """
+        return self.request.user
+
+    @property
+    def user_id(self):
+        return getattr(self.user, 'id', None)
+
+    def memoize(self, key, loader):
+        """
+        Returns a memoized value, computing it on first use.
+
+        Args:
+            key (str): The name of the fact.
+            loader (callable): Computes the value.
+
+        Returns:
+            The value returned by the loader when the fact was first used.
+        """
+        if key not in self._values:
+            self._values[key] = loader()
+        return self._values[key]
+
+    def forget(self, *keys):
+        for key in keys:
+            self._values.pop(key, None)
+
+    def addresses(self):
+        """
+        Returns:
+            dict: The user's addresses keyed by ID.
+        """
+        return self.memoize(
+            'addresses',
+            lambda: {address.id: address for address in Address.objects.filter(costumer_id=self.user_id)}
+        )
@@ -0,0 +1,20 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from core.archive import registered_archives
+
+
+class Command(BaseCommand):
+    help = "Moves rows soft-deleted long ago into the archive tables of their models."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=settings.SOFT_DELETE_ARCHIVE_AFTER_DAYS,
+                            help="Archive rows soft-deleted more than this many days ago.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows moved per transaction.")
+
+    def handle(self, *args, **options):
+        deleted_before = timezone.now() - timedelta(days=options['older_than'])
+        for archive in registered_archives():
+            archived = archive.archive(deleted_before, batch_size=options['batch_size'])
+            self.stdout.write(f"Archived {archived} {archive.model._meta.verbose_name_plural}.")
@@ -0,0 +1,14 @@
+from .context import RequestContext
+
+
+class RequestContextMiddleware:
+    """
+    Attaches a RequestContext to every request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.context = RequestContext(request)
+        return self.get_response(request)
@@ -0,0 +1,205 @@
+import hashlib
+from django.db.models import Count, Max, Subquery, Value
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+from core.cache import response_cache
+
+VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+
+
+def conditional(request, response):
+    """
+    Turns a response into a 304 Not Modified if the request's conditional
+    headers match the response's ETag or Last-Modified validators.
+
+    Args:
+        request (Request): The current request.
+        response (Response): The full response carrying the validators.
+
+    Returns:
+        HttpResponse: The 304 response, or the given response.
+    """
+    etag = response.get('ETag')
+    last_modified = parse_http_date_safe(response['Last-Modified']) if response.has_header('Last-Modified') else None
+    if etag is None and last_modified is None:
+        return response
+    return get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
+
+
+def scalar_aggregate(queryset, aggregate):
+    """
+    Wraps an aggregate over a whole queryset as a scalar subquery.
+
+    Args:
+        queryset (QuerySet): The rows to aggregate.
+        aggregate (Aggregate): The aggregate, e.g. ``Max('updated_at')``.
+
+    Returns:
+        Subquery: An expression evaluating to the aggregate.
+    """
+    return Subquery(queryset.order_by().annotate(group=Value(1)).values('group').annotate(value=aggregate).values('value'))
+
+
+class CachedResponseMixin:
+    """
+    Serves the cached payload of read-only viewset actions from the response
+    cache, computing and storing it on a miss.
+
+    The cache key is the request URL plus the query parameters listed in
+    ``cache_query_params``; other parameters do not change the response and
+    are ignored. Views tag their entries through get_cache_tags(), and model
+    signals invalidate the tags when the underlying rows change. ETag and
+    Last-Modified headers are cached with the payload, so revalidating a cached
+    response does not touch the database either.
+
+    Attributes:
+        cache_actions: Actions whose successful responses are cached.
+        cache_query_params: Query parameters that are part of the cache key.
+    """
+    cache_actions = ('list',)
+    cache_query_params = ()
+
+    def get_cache_tags(self, response):
+        """
+        Returns the tags a freshly computed response depends on.
+
+        Args:
+            response (Response): The response about to be cached.
+
+        Returns:
+            list: The tags of the response.
+        """
+        return []
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        """
+        Returns the cached response for the request, or calls the handler and caches its result.
+
+        Args:
+            request (Request): The current request.
+            handler (callable): The action computing the response on a miss.
+
+        Returns:
+            Response: The cached or freshly computed response.
+        """
+        if self.action not in self.cache_actions or not response_cache.enabled:
+            return handler(request, *args, **kwargs)
+
+        params = {param: request.query_params.get(param) for param in self.cache_query_params}
+        key = response_cache.make_key(request.build_absolute_uri(request.path), params)
+        cached = response_cache.get(key)
+        if cached is not None:
+            return conditional(request, Response(cached['data'], headers=cached['headers']))
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            headers = {header: response[header] for header in VALIDATOR_HEADERS if response.has_header(header)}
+            response_cache.set(key, {'data': response.data, 'headers': headers}, self.get_cache_tags(response))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag and Last-Modified validators to read-only viewset actions and
+    answers matching If-None-Match / If-Modified-Since requests with 304.
+
+    The validators come from one aggregate query over the rows behind the
+    response, ``max(updated_at)`` and ``count(*)``, so a client that already
+    has the current representation is answered without serializing anything.
+    The count catches deletions, which do not move ``max(updated_at)``.
+    Views whose responses also embed counts or fields of other rows add them
+    through get_related_validator_querysets(); they are aggregated as scalar
+    subqueries of the same query.
+    Deleting the newest of several rows moves ``max(updated_at)`` backwards,
+    so Last-Modified is only sent for a retrieved row without related rows;
+    every other response is revalidated by its ETag alone.
+
+    Attributes:
+        conditional_actions: Actions that get validators.
+    """
+    conditional_actions = ('list', 'retrieve')
+
+    def get_validator_queryset(self, request, *args, **kwargs):
+        """
+        Returns the rows the response is built from.
+
+        Returns:
+            QuerySet: The filtered queryset, narrowed to the looked up row for retrieve.
+        """
+        queryset = self.get_queryset()
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def get_related_validator_querysets(self, request, *args, **kwargs):
+        """
+        Returns other rows the response depends on, e.g. counted or joined rows.
+
+        Returns:
+            list: Querysets whose changes must change the validators too.
+        """
+        return []
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Computes the ETag and the Last-Modified timestamp of the response.
+
+        Returns:
+            tuple: The quoted ETag and the last modification as a Unix timestamp, or None
+            when the response is not built from a single row.
+        """
+        aggregates = {'last_modified': Max('updated_at'), 'count': Count('pk')}
+        related = self.get_related_validator_querysets(request, *args, **kwargs)
+        for index, queryset in enumerate(related):
+            aggregates[f'last_modified_{index}'] = Max(scalar_aggregate(queryset, Max('updated_at')))
+            aggregates[f'count_{index}'] = Max(scalar_aggregate(queryset, Count('pk')))
+        stats = self.get_validator_queryset(request, *args, **kwargs).order_by().aggregate(**aggregates)
+        timestamps = [stats['last_modified'], *(stats[f'last_modified_{index}'] for index in range(len(related)))]
+        counts = [stats['count'], *(stats[f'count_{index}'] for index in range(len(related)))]
+        fingerprint = request.get_full_path() + ''.join(
+            f":{count}:{timestamp.isoformat() if timestamp else ''}" for count, timestamp in zip(counts, timestamps)
+        )
+        etag = quote_etag(hashlib.md5(fingerprint.encode('utf-8')).hexdigest())
+        last_modified = stats['last_modified'] if self.action == 'retrieve' and not related else None
+        return etag, int(last_modified.timestamp()) if last_modified else None
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        """
+        Returns 304 if the client's copy is current, otherwise the handler's response with validators.
+
+        Args:
+            request (Request): The current request.
+            handler (callable): The action computing the full response.
+
+        Returns:
+            Response: The 304 or the full response.
+        """
+        if self.action not in self.conditional_actions or request.method not in ('GET', 'HEAD'):
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators(request, *args, **kwargs)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().retrieve, *args, **kwargs)
@@ -1,4 +1,6 @@
 from django.db import models
+from django.utils import timezone
+from .archive import get_archive
 from .managers import NonDeletedObjects
 
 class TimeStampMixin(models.Model):
@@ -18,17 +20,68 @@ class TimeStampMixin(models.Model):
         abstract = True
 
 
+class TrackChangesMixin:
+    """
+    Remembers the field values a model instance was loaded or last saved with,
+    so saves and signals can tell which fields changed.
+
+    ``post_save`` handlers still see the previous values in ``_loaded_values``,
+    as they are replaced only once the save completed.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = {field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields}
+
+    def has_changed(self, field):
+        """
+        Checks whether a field differs from the value it was loaded from the database with.
+
+        Args:
+            field (str): The attribute name of the field.
+
+        Returns:
+            bool: True if the field changed or the instance was not loaded from the database.
+        """
+        loaded_values = getattr(self, '_loaded_values', {})
+        if field not in loaded_values:
+            return True
+        return loaded_values[field] != getattr(self, field)
+
+
 class SoftDelete(models.Model):
+    """
+    A base model for rows that are flagged as deleted instead of removed.
+
+    Attributes:
+        is_deleted (BooleanField): Whether the row is soft-deleted.
+        deleted_at (DateTimeField): When the row was soft-deleted.
+
+    ``objects`` only returns live rows and ``everything`` returns all of them,
+    including rows moved into an archive table (see core.archive).
+    """
     is_deleted = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
     everything = models.Manager()
     objects = NonDeletedObjects()
 
     def soft_delete(self):
         self.is_deleted = True
+        self.deleted_at = timezone.now()
         self.save()
 
     def restore(self):
+        archive = get_archive(type(self))
+        if archive is not None:
+            archive.unarchive([self.pk])
         self.is_deleted = False
+        self.deleted_at = None
         self.save()
 
     class Meta:
@@ -0,0 +1,99 @@
+import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+INDEX_SCANS = ('Index Scan', 'Index Only Scan', 'Bitmap Index Scan')
+
+
+def plan_nodes(plan):
+    """
+    Flattens an EXPLAIN (FORMAT JSON) plan into its nodes.
+
+    Args:
+        plan (dict): The root node of the plan.
+
+    Returns:
+        list: Every node of the plan, root first.
+    """
+    nodes = [plan]
+    for child in plan.get('Plans', []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+def explain(sql):
+    """
+    Returns the nodes of the plan the database picks for an executed query.
+
+    Args:
+        sql (str): The query with its parameters interpolated.
+
+    Returns:
+        list: The plan nodes.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan_nodes(plan[0]['Plan'])
+
+
+class QueryPlanAssertionsMixin:
+    """
+    Test case mixin asserting that the queries behind a request are planned on indexes.
+
+    The queries a callable executes are captured and explained one by one, so
+    a test states which table must be read through an index and, optionally,
+    which index, without restating the SQL the ORM builds. Plans only mean
+    something on realistic data, so tests seed a large dataset and ANALYZE it.
+    """
+
+    @staticmethod
+    def analyze(*tables):
+        with connection.cursor() as cursor:
+            for table in tables:
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(table)}")
+
+    def capture_plans(self, func):
+        """
+        Runs a callable and explains every SELECT it executed.
+
+        Returns:
+            tuple: The callable's result and a list of ``(sql, nodes)`` pairs.
+        """
+        with CaptureQueriesContext(connection) as context:
+            result = func()
+        plans = [
+            (query['sql'], explain(query['sql']))
+            for query in context.captured_queries
+            if query['sql'].lstrip().upper().startswith('SELECT')
+        ]
+        return result, plans
+
+    def assertIndexScan(self, func, table, index=None, contains=None):
+        """
+        Asserts that every query reading a table scans it through an index.
+
+        Args:
+            func (callable): The code under test, e.g. a test client request.
+            table (str): The table that must not be scanned sequentially.
+            index (str): An index that at least one of the queries must use.
+            contains (str): Only check queries whose SQL contains this text.
+
+        Returns:
+            The callable's result.
+        """
+        result, plans = self.capture_plans(func)
+        checked, used = 0, set()
+        for sql, nodes in plans:
+            if f'"{table}"' not in sql or (contains and contains not in sql):
+                continue
+            checked += 1
+            sequential = [node for node in nodes if node['Node Type'] == 'Seq Scan' and node.get('Relation Name') == table]
+            self.assertFalse(sequential, f"Sequential scan of {table} in:\n{sql}")
+            used.update(node.get('Index Name') for node in nodes if node['Node Type'] in INDEX_SCANS)
+        self.assertTrue(checked, f"No query read {table}")
+        if index is not None:
+            self.assertIn(index, used)
+        return result
@@ -1,12 +1,126 @@
-import json
 import uuid
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.http import HttpRequest
-from authentication.models import User, Address
+from authentication.models import Address
 from config.settings import redis_client_first_db, redis_client_second_db
-from order.models import DiscountCode, Order
-from products.models import Product, Discount
+from order.discounts import discount_codes
+from order.finalization import OrderFinalizationQueue
+from order.models import Order, OrderItem
+from order.redemptions import CHECK_REDEMPTION_FUNCTION, RedemptionError, redemption_ledger
+from order.reservation import StockReservation
+from products.models import Product
+from products.signals import PRICE_VERSION_KEY
+from products.snapshots import snapshot_cache
+
+REFRESH_PAY_AMOUNT_FUNCTION = """
+local function refresh_pay_amount(key)
+    local total = tonumber(redis.call('HGET', key, 'total_price') or '0')
+    local discount_type = redis.call('HGET', key, 'discount_type')
+    local pay_amount = total
+    if discount_type == 'cash' then
+        pay_amount = total - tonumber(redis.call('HGET', key, 'discount_value'))
+    elseif discount_type then
+        pay_amount = total - (total * (tonumber(redis.call('HGET', key, 'discount_value')) / 100))
+    end
+    redis.call('HSET', key, 'pay_amount', tostring(pay_amount))
+end
+"""
+
+ADD_TO_BASKET_SCRIPT = REFRESH_PAY_AMOUNT_FUNCTION + """
+if redis.call('HSETNX', KEYS[1], ARGV[1], ARGV[2]) == 0 then
+    return 0
+end
+local subtotal = tonumber(ARGV[2]) * tonumber(ARGV[3])
+redis.call('HSET', KEYS[1], 'subtotal:' .. ARGV[1], subtotal)
+redis.call('HINCRBY', KEYS[1], 'total_price', subtotal)
+redis.call('HSETNX', KEYS[1], 'price_version', redis.call('GET', KEYS[3]) or '0')
+refresh_pay_amount(KEYS[1])
+redis.call('ZADD', KEYS[2], ARGV[5], ARGV[4])
+return 1
+"""
+
+UPDATE_BASKET_SCRIPT = REFRESH_PAY_AMOUNT_FUNCTION + """
+local previous = redis.call('HGET', KEYS[1], ARGV[1])
+local subtotal = tonumber(ARGV[2]) * tonumber(ARGV[3])
+local previous_subtotal = tonumber(redis.call('HGET', KEYS[1], 'subtotal:' .. ARGV[1]) or '0')
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2], 'subtotal:' .. ARGV[1], subtotal)
+redis.call('HINCRBY', KEYS[1], 'total_price', subtotal - previous_subtotal)
+redis.call('HSETNX', KEYS[1], 'price_version', redis.call('GET', KEYS[3]) or '0')
+refresh_pay_amount(KEYS[1])
+redis.call('ZADD', KEYS[2], ARGV[5], ARGV[4])
+return previous
+"""
+
+DELETE_FROM_BASKET_SCRIPT = REFRESH_PAY_AMOUNT_FUNCTION + """
+local quantity = redis.call('HGET', KEYS[1], ARGV[1])
+if not quantity then
+    return false
+end
+local subtotal = tonumber(redis.call('HGET', KEYS[1], 'subtotal:' .. ARGV[1]) or '0')
+redis.call('HDEL', KEYS[1], ARGV[1], 'subtotal:' .. ARGV[1])
+redis.call('HINCRBY', KEYS[1], 'total_price', -subtotal)
+refresh_pay_amount(KEYS[1])
+return quantity
+"""
+
+RECONCILE_TOTALS_SCRIPT = REFRESH_PAY_AMOUNT_FUNCTION + """
+for i = 2, #ARGV, 2 do
+    local quantity = redis.call('HGET', KEYS[1], ARGV[i])
+    if quantity then
+        redis.call('HSET', KEYS[1], 'subtotal:' .. ARGV[i], tonumber(quantity) * tonumber(ARGV[i + 1]))
+    end
+end
+local total = 0
+local fields = redis.call('HGETALL', KEYS[1])
+for i = 1, #fields, 2 do
+    if string.sub(fields[i], 1, 9) == 'subtotal:' then
+        if redis.call('HEXISTS', KEYS[1], string.sub(fields[i], 10)) == 1 then
+            total = total + tonumber(fields[i + 1])
+        else
+            redis.call('HDEL', KEYS[1], fields[i])
+        end
+    end
+end
+if #fields > 0 then
+    redis.call('HSET', KEYS[1], 'total_price', total, 'price_version', ARGV[1])
+    refresh_pay_amount(KEYS[1])
+end
+return total
+"""
+
+SET_ADDRESS_SCRIPT = """
+if ARGV[2] == '1' and redis.call('HGET', KEYS[1], 'address') == ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'address', ARGV[1])
+redis.call('ZADD', KEYS[2], ARGV[4], ARGV[3])
+return 1
+"""
+
+APPLY_DISCOUNT_SCRIPT = REFRESH_PAY_AMOUNT_FUNCTION + CHECK_REDEMPTION_FUNCTION + """
+if redis.call('HGET', KEYS[1], 'discount') == '1' then
+    return -2
+end
+local allowed = check_redemption(KEYS[2], ARGV[3], ARGV[4])
+if allowed ~= 1 then
+    return allowed
+end
+redis.call('HSET', KEYS[1], 'discount', 1, 'discount_type', ARGV[1], 'discount_value', ARGV[2],
+           'discount_code', ARGV[5], 'discount_limit', ARGV[4])
+refresh_pay_amount(KEYS[1])
+return 1
+"""
+
+REMOVE_DISCOUNT_SCRIPT = REFRESH_PAY_AMOUNT_FUNCTION + """
+if redis.call('HGET', KEYS[1], 'discount_code') ~= ARGV[1] or redis.call('HGET', KEYS[1], 'discount_claimed') then
+    return 0
+end
+redis.call('HDEL', KEYS[1], 'discount', 'discount_type', 'discount_value', 'discount_code', 'discount_limit')
+refresh_pay_amount(KEYS[1])
+return 1
+"""
 
 
 class BasketAndOrderRedisAdapter:
@@ -18,19 +132,141 @@ class BasketAndOrderRedisAdapter:
         product: ID of the product being manipulated in the basket.
         quantity: Quantity of the product to be added or updated in the basket.
         address: ID of the address associated with the order.
-        user: ID of the user associated with the current request.
+        user: ID of the user associated with the current request, or the given
+            user ID when the adapter is used outside a request (e.g. by workers).
         basket_to_display: Dictionary to hold basket data for display.
+
+    Every basket mutation runs as a single server-side Lua script, so each one
+    costs one Redis round trip and concurrent requests from the same user cannot
+    interleave and corrupt the quantities, ``pay_amount`` or the ``discount`` flag.
+
+    The basket hash keeps ``total_price`` and a ``subtotal:<product>`` field per
+    line, updated by deltas on add, update and delete, so mutations cost the same
+    regardless of basket size. The totals are recomputed from the catalog only by
+    reconcile_totals(), which runs when product prices have changed since the
+    basket's ``price_version``.
     """
     __client = redis_client_first_db
     __payment_client = redis_client_second_db
-
-    def __init__(self, request: HttpRequest = None, product=None, quantity=None, address=None):
+    __reservation = StockReservation()
+    __finalization = OrderFinalizationQueue()
+    __add_script = redis_client_first_db.register_script(ADD_TO_BASKET_SCRIPT)
+    __update_script = redis_client_first_db.register_script(UPDATE_BASKET_SCRIPT)
+    __delete_script = redis_client_first_db.register_script(DELETE_FROM_BASKET_SCRIPT)
+    __address_script = redis_client_first_db.register_script(SET_ADDRESS_SCRIPT)
+    __discount_script = redis_client_first_db.register_script(APPLY_DISCOUNT_SCRIPT)
+    __remove_discount_script = redis_client_first_db.register_script(REMOVE_DISCOUNT_SCRIPT)
+    __reconcile_script = redis_client_first_db.register_script(RECONCILE_TOTALS_SCRIPT)
+
+    def __init__(self, request: HttpRequest = None, product=None, quantity=None, address=None, user=None):
         self.request = request
         self.product = product
         self.quantity = quantity
         self.address = address
-        self.user = self.request.user.id
+        self.user = user if user is not None else self.request.user.id
         self.basket_to_display = {}
+        self._basket = None
+        self._lines = None
+        self._price_version = None
+
+    @property
+    def context(self):
+        """
+        Returns:
+            RequestContext|None: The context of the request, if the basket belongs to the requesting user.
+        """
+        context = getattr(self.request, 'context', None)
+        if context is not None and context.user_id == self.user:
+            return context
+        return None
+
+    def get_basket(self):
+        """
+        Reads the user's basket hash from Redis with a single HGETALL.
+
+        The decoded hash is kept on the instance, and on the request context when
+        there is one, so permissions, display, totals, discount and receipt
+        building share one round trip per request. The current product price
+        version is fetched in the same pipeline.
+
+        Returns:
+            dict: The decoded basket fields and values.
+        """
+        if self._basket is None:
+            context = self.context
+            if context is not None:
+                self._basket, self._price_version = context.memoize('basket', self.read_basket)
+            else:
+                self._basket, self._price_version = self.read_basket()
+        return self._basket
+
+    def read_basket(self):
+        pipeline = self.__class__.__client.pipeline(transaction=False)
+        pipeline.hgetall(f"user:{self.user}")
+        pipeline.get(PRICE_VERSION_KEY)
+        basket, price_version = pipeline.execute()
+        return (
+            {key.decode('utf-8'): value.decode('utf-8') for key, value in basket.items()},
+            (price_version or b'0').decode('utf-8')
+        )
+
+    def hydrate_basket(self):
+        """
+        Loads a snapshot of every product in the basket from the product snapshot
+        cache, which falls back to one batched query for products it does not hold.
+
+        Returns:
+            list: (product snapshot, quantity) tuples in basket order. Products that
+            no longer exist in the catalog are skipped.
+        """
+        if self._lines is None:
+            quantities = {int(key): int(value) for key, value in self.get_basket().items() if key.isdigit()}
+            products = snapshot_cache.get_many(quantities.keys())
+            self._lines = [
+                (products[product_id], quantity)
+                for product_id, quantity in quantities.items()
+                if product_id in products
+            ]
+        return self._lines
+
+    def invalidate_basket(self):
+        """
+        Drops the basket read by get_basket() and hydrate_basket() after a mutation.
+        """
+        self._basket = None
+        self._lines = None
+        if self.context is not None:
+            self.context.forget('basket')
+
+    def has_stale_totals(self):
+        """
+        Checks whether product prices changed since the basket totals were computed.
+
+        Returns:
+            bool: True if the basket has lines and its price version is outdated.
+        """
+        basket = self.get_basket()
+        has_lines = any(key.isdigit() for key in basket)
+        return has_lines and basket.get("price_version") != self._price_version
+
+    def reconcile_totals(self):
+        """
+        Recomputes every line subtotal and the basket total from current product prices.
+
+        Returns:
+            int: The reconciled basket total.
+        """
+        basket = self.get_basket()
+        prices = {product.id: product.price for product, _ in self.hydrate_basket()}
+        args = [self._price_version]
+        for key in basket:
+            if key.isdigit():
+                args.extend([key, prices.get(int(key), 0)])
+        total = self.__class__.__reconcile_script(keys=[f"user:{self.user}"], args=args)
+        self._basket = None
+        if self.context is not None:
+            self.context.forget('basket')
+        return total
 
     def check_if_basket_exists(self):
         """
@@ -39,14 +275,15 @@ class BasketAndOrderRedisAdapter:
         Returns:
             bool: True if the basket exists, otherwise False.
         """
-        return self.__class__.__client.exists(f"user:{self.user}") == 1
+        return bool(self.get_basket())
 
     def add_to_basket(self):
         """
         Adds a specified product and quantity to the basket.
 
         Raises:
-            ValueError: If product or quantity not specified, or if the product is already in the basket.
+            ValueError: If product or quantity not specified, the product is not in stock,
+                or the product is already in the basket.
 
         Returns:
             bool: True if the product is added successfully.
@@ -54,13 +291,17 @@ class BasketAndOrderRedisAdapter:
         if not self.product or self.quantity is None:
             raise ValueError("Product and quantity must be specified.")
 
-        if self.check_warehouse(self.product, self.quantity):
-            if not self.__class__.__client.hexists(f"user:{self.user}", self.product):
-                self.__class__.__client.hset(f"user:{self.user}", self.product, self.quantity)
-                self.__class__.__client.hset(f"user:{self.user}", "pay_amount", self.total_price)
-                self.change_stock()
-            else:
-                raise ValueError('Product already exists in basket')
+        price = self.get_unit_price(self.product)
+        self.__class__.__reservation.reserve(self.product, self.quantity)
+        added = self.__class__.__add_script(
+            keys=[f"user:{self.user}", StockReservation.deadlines_key, PRICE_VERSION_KEY],
+            args=[self.product, self.quantity, price, self.user,
+                  self.__class__.__reservation.deadline()]
+        )
+        if not added:
+            self.__class__.__reservation.release(self.product, self.quantity)
+            raise ValueError('Product already exists in basket')
+        self.invalidate_basket()
         return True
 
     def delete_from_basket(self):
@@ -73,11 +314,12 @@ class BasketAndOrderRedisAdapter:
         Returns:
             bool: True if the product is deleted successfully.
         """
-        if not self.__class__.__client.hexists(f"user:{self.user}", self.product):
+        quantity = self.__class__.__delete_script(keys=[f"user:{self.user}"], args=[self.product])
+        if quantity is None:
             raise ValueError("Product not found in basket.")
 
-        self.__class__.__client.hdel(f"user:{self.user}", self.product)
-        self.change_stock()
+        self.invalidate_basket()
+        self.__class__.__reservation.release(self.product, quantity)
         return True
 
     def display_basket(self):
@@ -87,29 +329,19 @@ class BasketAndOrderRedisAdapter:
         Returns:
             dict: A dictionary representation of the user's basket.
         """
-        basket = self.__class__.__client.hgetall(f"user:{self.user}")
-        basket_dict = {key.decode('utf-8'): value.decode('utf-8') for key, value in basket.items()}
-        address = None
-        for key, value in basket_dict.items():
-            if key == "address":
-                address = value
-                continue
-
-            if key.isdigit():
-                try:
-                    product = Product.objects.get(id=str(key))
-                    self.basket_to_display[product.name] = value
-                except Product.DoesNotExist:
-                    continue
+        total_price = self.total_price
+        basket_dict = self.get_basket()
+        for product, quantity in self.hydrate_basket():
+            self.basket_to_display[product.name] = str(quantity)
 
+        address = basket_dict.get("address")
         if address:
             self.basket_to_display["address"] = address
-        if self.__class__.__client.hexists(f"user:{self.user}", "pay_amount"):
-            price_after_discount = self.__class__.__client.hget(f"user:{self.user}", "pay_amount")
-            self.basket_to_display['total_price'] = float(self.total_price)
-            self.basket_to_display['price_after_discount'] = float(price_after_discount)
+        if "pay_amount" in basket_dict:
+            self.basket_to_display['total_price'] = float(total_price)
+            self.basket_to_display['price_after_discount'] = float(basket_dict["pay_amount"])
         else:
-            self.basket_to_display['total_price'] = self.total_price
+            self.basket_to_display['total_price'] = total_price
 
         return self.basket_to_display
 
@@ -120,123 +352,144 @@ class BasketAndOrderRedisAdapter:
         Raises:
             ValueError: If the address is not provided or already exists.
         """
-        if self.request.method == "POST":
-            if not self.address:
-                raise ValueError("Address must be set!")
+        if self.request.method == "POST" and not self.address:
+            raise ValueError("Address must be set!")
 
-            value = self.__class__.__client.hget(f"user:{self.user}", "address")
-            if str(self.address) == str(value):
-                raise ValueError("Address already exists!")
-
-        self.__class__.__client.hset(f"user:{self.user}", "address", self.address)
+        added = self.__class__.__address_script(
+            keys=[f"user:{self.user}", StockReservation.deadlines_key],
+            args=[self.address, '1' if self.request.method == "POST" else '0', self.user,
+                  self.__class__.__reservation.deadline()]
+        )
+        if not added:
+            raise ValueError("Address already exists!")
+        self.invalidate_basket()
 
     def update_basket(self):
         """
         Updates the quantity of a specified product in the basket.
 
+        Only the difference from the quantity already in the basket is reserved
+        or given back, and the basket is restored if the stock is not available.
+
         Raises:
-            ValueError: If product or quantity not specified.
+            ValueError: If product or quantity not specified, or the new quantity is not in stock.
         """
         if not self.product or self.quantity is None:
             raise ValueError("Product and quantity must be specified.")
 
-        if self.check_warehouse(self.product, self.quantity):
-            self.__class__.__client.hset(f"user:{self.user}", self.product, self.quantity)
-            self.change_stock()
+        price = self.get_unit_price(self.product)
+        previous_quantity = self.__class__.__update_script(
+            keys=[f"user:{self.user}", StockReservation.deadlines_key, PRICE_VERSION_KEY],
+            args=[self.product, self.quantity, price, self.user, self.__class__.__reservation.deadline()]
+        )
+        self.invalidate_basket()
+
+        difference = int(self.quantity) - int(previous_quantity or 0)
+        try:
+            if difference > 0:
+                self.__class__.__reservation.reserve(self.product, difference)
+            elif difference < 0:
+                self.__class__.__reservation.release(self.product, -difference)
+        except ValueError:
+            if previous_quantity is None:
+                self.__class__.__delete_script(keys=[f"user:{self.user}"], args=[self.product])
+            else:
+                self.__class__.__update_script(
+                    keys=[f"user:{self.user}", StockReservation.deadlines_key, PRICE_VERSION_KEY],
+                    args=[self.product, previous_quantity, price, self.user,
+                          self.__class__.__reservation.deadline()]
+                )
+            raise
 
     @staticmethod
-    def check_warehouse(product_id, quantity):
+    def get_unit_price(product_id):
         """
-        Checks if the specified quantity of a product is available in stock.
+        Looks up the current unit price of a product.
 
         Args:
-            product_id (int): The ID of the product being checked.
-            quantity (int): The quantity requested.
+            product_id (int): The ID of the product.
 
         Raises:
-            ValueError: If requested quantity exceeds available stock.
+            ValueError: If the product does not exist.
 
         Returns:
-            bool: True if the requested quantity is available, otherwise raises ValueError.
+            int: The product price.
         """
-        available_in_stock = Product.objects.get(id=product_id).warehouse
-        if int(quantity) > available_in_stock:
-            raise ValueError("Product not available in stock!")
-        return True
+        snapshot = snapshot_cache.get(product_id)
+        if snapshot is None:
+            raise ValueError("Product not found.")
+        return snapshot.price
 
     def get_total_price(self):
         """
-        Calculates the total price of items in the basket.
+        Returns the maintained subtotal of each line in the basket.
 
         Returns:
             list: A list of calculated prices for each product in the basket.
         """
-        basket = self.__class__.__client.hgetall(f"user:{self.user}")
-        basket_dict = {key.decode('utf-8'): value.decode('utf-8') for key, value in basket.items()}
-
-        if 'address' in basket_dict:
-            del basket_dict['address']
-
-        list_of_prices = []
-        for key, value in basket_dict.items():
-            if key.isdigit():
-                try:
-                    price = Product.objects.get(id=str(key)).price
-                    list_of_prices.append(price * int(value))
-                except Product.DoesNotExist:
-                    continue
-
-        return list_of_prices
+        if self.has_stale_totals():
+            self.reconcile_totals()
+        return [int(value) for key, value in self.get_basket().items() if key.startswith("subtotal:")]
 
     @property
     def total_price(self):
         """
-        Computes the total price of items in the basket.
+        Returns the maintained total price of items in the basket, reconciling it
+        first if product prices changed since it was computed.
 
         Returns:
-            float: The total price calculated from all basket items.
+            int: The total price of all basket items.
         """
-        return sum(self.get_total_price())
+        if self.has_stale_totals():
+            self.reconcile_totals()
+        return int(float(self.get_basket().get("total_price", 0)))
 
-    def change_stock(self):
+    @property
+    def user_uuid(self):
         """
-        Updates the product stock based on remaining items after adding or removing from basket.
+        Returns the UUID of the basket's user, from the authenticated user when
+        the basket belongs to it, so stateless token users cost no query.
 
         Returns:
-            bool: True if the stock is changed successfully.
+            str|UUID: The user's UUID.
         """
-        product_stock = Product.objects.get(id=self.product).warehouse
-        if self.request.method in ["POST", "PATCH"]:
-            Product.objects.filter(id=self.product).update(warehouse=product_stock - int(self.quantity))
-            return True
-        Product.objects.filter(id=self.product).update(warehouse=product_stock + int(self.quantity))
-        return True
+        user = getattr(self.request, 'user', None)
+        if getattr(user, 'id', None) == self.user and getattr(user, 'uuid', None):
+            return user.uuid
+        return get_user_model().objects.values_list('uuid', flat=True).get(id=self.user)
 
-    def set_payment_information(self, message=None):
+    def set_payment_information(self, message=None, payment_id=None):
         """
         Sets payment information in the payment Redis client for the user.
 
+        Stale totals are reconciled first, so the recorded amount is the one the
+        order is later written with.
+
         Args:
             message (str): Custom message for payment status.
+            payment_id (str): The ID to record the payment under, a new one if not given.
 
         Returns:
             dict: A dictionary of stored payment information.
         """
-        user = get_user_model().objects.get(id=self.user).uuid
-        if self.__class__.__client.hexists(f"user:{self.user}", "pay_amount"):
-            pay_amount = self.__class__.__client.hget(f"user:{self.user}", "pay_amount")
-        else:
+        user = self.user_uuid
+        if self.has_stale_totals():
+            self.reconcile_totals()
+        pay_amount = self.get_basket().get("pay_amount")
+        if pay_amount is None:
             pay_amount = self.total_price
-        self.__class__.__payment_client.hset(
+        pipeline = self.__class__.__payment_client.pipeline()
+        pipeline.hset(
             f"payment:{str(user)}",
             mapping={
                 "total_price": pay_amount,
                 "user": str(user),
-                "payment_id": str(uuid.uuid4()),
+                "payment_id": payment_id or str(uuid.uuid4()),
                 "status": str(message)
             }
         )
-        return self.__class__.__payment_client.hgetall(f"payment:{user}")
+        pipeline.hgetall(f"payment:{user}")
+        return pipeline.execute()[-1]
 
     @property
     def payment_information(self):
@@ -256,36 +509,14 @@ class BasketAndOrderRedisAdapter:
             code (str): The discount code to be checked.
 
         Returns:
-            list|None: A list containing discount type and value if valid, otherwise None.
-        """
-        user = User.objects.get(id=self.user)
-        if user.user_discount_code.filter(code=code).exists():
-            discount_type = DiscountCode.objects.get(code=code).type_of_discount
-            discount = DiscountCode.objects.get(code=code).discount
-            return [discount_type, discount]
-        return None
-
-    @staticmethod
-    def calculate_discount(discount_information: list, total_price):
-        """
-        Applies the discount on the total price based on the discount information.
-
-        Args:
-            discount_information (list): A list with discount type and value.
-            total_price (float): The original total price before discount.
-
-        Returns:
-            float: The new total price after applying the discount.
+            dict|None: The code as returned by DiscountCodeService.check() if valid, otherwise None.
 
         Raises:
-            AssertionError: If the discount_information list does not contain exactly 2 elements.
+            TooManyAttempts: If the user tried too many codes recently.
         """
-        assert len(discount_information) == 2, "Invalid input"
-        if discount_information[0] == 'cash':
-            discounted_price = total_price - int(discount_information[1])
-            return discounted_price
-        discounted_price = total_price - (total_price * (int(discount_information[1]) / 100))
-        return discounted_price
+        if self.context is not None:
+            return self.context.memoize(f"discount:{code}", lambda: discount_codes.check(self.user, code))
+        return discount_codes.check(self.user, code)
 
     def apply_discount(self, code):
         """
@@ -294,78 +525,224 @@ class BasketAndOrderRedisAdapter:
         Args:
             code (str): The discount code to apply.
 
+        The code is checked against its redemptions in the same script that
+        applies it, but only redeemed when the basket is ordered, see
+        submit_order() and create_order(), so a basket that is flushed or
+        expires does not use the code up.
+
         Returns:
             bool: True if the discount is applied successfully.
 
         Raises:
-            ValueError: If the discount code has already been used or is invalid.
+            RedemptionError: If the code has already been used or reached its usage limit.
+            ValueError: If the basket already has a discount.
+            RuntimeError: If the code is invalid or expired.
         """
-        total_price = int(self.total_price)
-        discount_information = self.check_discount(code=code)
-
-        if discount_information:
-            amount_to_pay = self.calculate_discount(discount_information=discount_information, total_price=total_price)
+        discount = self.check_discount(code=code)
 
-            stored_discount = self.__class__.__client.hget(f"user:{self.user}", "discount")
-
-            if stored_discount is not None and stored_discount.decode('utf-8') == '1':
-                raise ValueError('You have already used this code')
-
-            self.__class__.__client.hset(f"user:{self.user}", mapping={
-                "pay_amount": amount_to_pay,
-                "discount": 1
-            })
+        if discount:
+            applied = self.__class__.__discount_script(
+                keys=[f"user:{self.user}", redemption_ledger.redemptions_key(discount['id'])],
+                args=[discount['type'], discount['value'], self.user, discount['usage_limit'] or 0, discount['id']]
+            )
+            if applied == -2:
+                raise ValueError('A discount is already applied to this basket')
+            if applied != 1:
+                raise RedemptionError(applied)
+            self.invalidate_basket()
             return True
         else:
             raise RuntimeError('Invalid code!')
 
+    def redeem_discount(self, redeem):
+        """
+        Runs the redemption of the basket's discount code, dropping the code from
+        the basket if it can no longer be redeemed so the user can pay without it.
+
+        Args:
+            redeem (callable): Redeems the code, given the ID it was read with.
+
+        Returns:
+            The result of redeem.
+
+        Raises:
+            ValueError: If the code cannot be redeemed.
+        """
+        code_id = self.get_basket().get('discount_code')
+        try:
+            return redeem(code_id)
+        except RedemptionError as e:
+            if e.result == -3:
+                raise
+            self.__class__.__remove_discount_script(keys=[f"user:{self.user}"], args=[code_id])
+            raise ValueError(f"{e}, it was removed from your basket") from e
+        finally:
+            self.invalidate_basket()
+
     def flush_basket(self):
         """
-        Clears the user's basket from Redis.
+        Clears the user's basket from Redis and returns its reserved stock.
 
         Returns:
             bool: True if the basket is flushed successfully; otherwise False.
         """
         try:
-            self.__class__.__client.delete(f"user:{self.user}")
+            self.__class__.__reservation.release_basket(self.user)
+            self.invalidate_basket()
             return True
         except Exception:
             return False
 
     def create_order(self):
         """
-        Creates an order from the user's basket data.
+        Creates an order from the user's basket data in a single unit of work.
+
+        The basket's discount code is redeemed first. The basket is then claimed
+        from Redis atomically, which commits its stock reservation and removes it
+        so it cannot be changed or ordered twice. The order is then written by
+        finalize_order(). If the order cannot be saved the claimed basket is put
+        back, keeping its redeemed code.
 
         Returns:
             bool: True if the order is created successfully.
 
         Raises:
-            ValueError: If the basket is incomplete.
+            ValueError: If the basket is incomplete or its discount code cannot be redeemed.
+        """
+        if self.has_stale_totals():
+            self.reconcile_totals()
+        self.redeem_discount(lambda code_id: redemption_ledger.redeem(f"user:{self.user}", code_id, self.user))
+        basket = self.__class__.__reservation.claim(self.user)
+        if 'pay_amount' not in basket:
+            self.__class__.__reservation.restore(self.user, basket)
+            raise ValueError("Basket is not completed yet")
+
+        try:
+            self.finalize_order(basket)
+        except Exception:
+            self.__class__.__reservation.restore(self.user, basket)
+            raise
+        return True
+
+    def submit_order(self, payment_id):
         """
-        basket_copy = self.display_basket().copy()
-        user = get_user_model().objects.get(id=self.user)
-        order = Order.objects.create(user=user)
+        Hands the paid basket over to the order finalization queue.
+
+        The basket is claimed, its discount code redeemed and the job queued in
+        one Redis round trip, so the cost does not depend on the basket size. The
+        order itself is written later by a finalize_orders worker.
+
+        Args:
+            payment_id (str): The ID of the payment that paid for the basket.
 
-        if 'address' in basket_copy:
-            order.address = self.get_address(int(basket_copy['address']))
-            order.save()
-            del basket_copy['address']
+        Returns:
+            str: The ID of the queued job.
 
-        if 'price_after_discount' not in basket_copy:
+        Raises:
+            ValueError: If the basket is incomplete or its discount code cannot be redeemed.
+        """
+        if self.has_stale_totals():
+            self.reconcile_totals()
+        message_id = self.redeem_discount(
+            lambda code_id: self.__class__.__finalization.enqueue(self.user, payment_id, code_id)
+        )
+        if message_id is None:
             raise ValueError("Basket is not completed yet")
+        self.invalidate_basket()
+        return message_id
+
+    def finalize_order(self, basket, payment_id=None):
+        """
+        Writes the order for an already claimed basket.
 
-        order.total_price = basket_copy['price_after_discount']
-        order.save()
-        del basket_copy['price_after_discount']
-        del basket_copy['total_price']
-        #
-        receipt = self.get_receipt(basket_copy)
-        order.product_list = receipt
-        order.save()
+        The order row is written with one INSERT inside a transaction, with the
+        receipt built from the quantities and subtotals of the claimed basket, and
+        its OrderItem rows are bulk inserted in the same transaction. The payment
+        ID is unique per order, so finalizing the same payment twice writes a
+        single order.
 
-        self.flush_basket()
+        Args:
+            basket (dict): The basket fields returned when the basket was claimed.
+            payment_id (str): The ID of the payment that paid for the basket.
+
+        Returns:
+            bool: True if the order was written, False if it already existed.
+        """
+        self._basket = basket
+        self._lines = None
+        lines = self.get_ordered_lines()
+        order_fields = {
+            "total_price": float(basket['pay_amount']),
+            "product_list": {
+                product.id: self.make_receipt(
+                    product_name=product.name,
+                    slug=product.slug,
+                    price=subtotal // quantity,
+                    quantity=quantity,
+                    total_price=subtotal
+                )
+                for product, quantity, subtotal in lines
+            },
+            "payment_id": payment_id
+        }
+        if 'address' in basket:
+            order_fields["address"] = self.get_address(int(basket['address']))
+        try:
+            with transaction.atomic():
+                order = Order.objects.create(user_id=self.user, **order_fields)
+                OrderItem.objects.bulk_create(self.get_order_items(order, lines))
+        except IntegrityError:
+            if payment_id and Order.objects.filter(payment_id=payment_id).exists():
+                return False
+            raise
+        finally:
+            self.invalidate_basket()
         return True
 
+    def get_ordered_lines(self):
+        """
+        Reads the lines of a claimed basket as they were paid for.
+
+        Quantities and subtotals come from the basket hash, so the order keeps the
+        prices the customer paid even if the catalog changed since. Names, slugs
+        and sellers are loaded with one query through ``Product.everything`` so
+        products deleted after being added to the basket are still resolved.
+
+        Returns:
+            list: (product, quantity, subtotal) tuples in basket order.
+        """
+        basket = self.get_basket()
+        quantities = {int(key): int(value) for key, value in basket.items() if key.isdigit()}
+        products = Product.everything.only('id', 'name', 'slug', 'seller').in_bulk(quantities.keys())
+        return [
+            (products[product_id], quantity, int(basket[f"subtotal:{product_id}"]))
+            for product_id, quantity in quantities.items()
+            if product_id in products
+        ]
+
+    def get_order_items(self, order, lines):
+        """
+        Builds the normalized order lines from the claimed basket lines.
+
+        Args:
+            order (Order): The order the lines belong to.
+            lines (list): (product, quantity, subtotal) tuples from get_ordered_lines().
+
+        Returns:
+            list: Unsaved OrderItem instances, one per basket line.
+        """
+        return [
+            OrderItem(
+                order=order,
+                product_id=product.id,
+                seller_id=product.seller_id,
+                quantity=quantity,
+                unit_price=subtotal // quantity,
+                total_price=subtotal
+            )
+            for product, quantity, subtotal in lines
+        ]
+
     def get_address(self, id):
         """
         Retrieves the full address associated with the given ID.
@@ -389,34 +766,25 @@ class BasketAndOrderRedisAdapter:
         Returns:
             bool: True if the basket is valid, otherwise raises ValidationError.
         """
-        if self.__class__.__client.hexists(f"user:{self.user}", "address"):
+        if "address" in self.get_basket():
             return True
         raise ValidationError("Basket is not complete!")
 
-    def get_each_product_information_and_make_receipt(self, basket):
+    def get_each_product_information_and_make_receipt(self):
         """
-        Args:
-            basket:
+        Builds receipt lines from the hydrated basket products.
+
         Returns:
             final receipt (a dictionary containing all product details)
         """
         receipt = {}
-        for key, value in basket.items():
-            product_name = key
-            product_obj = Product.objects.get(name=product_name)
-            product_id = product_obj.id
-            product_slug = product_obj.slug
-            product_price = product_obj.price
-            quantity = int(value)
-            total_price = product_price * quantity
-
-
-            receipt[product_id] = self.make_receipt(
-                product_name=product_name,
-                slug=product_slug,
-                price=product_price,
+        for product, quantity in self.hydrate_basket():
+            receipt[product.id] = self.make_receipt(
+                product_name=product.name,
+                slug=product.slug,
+                price=product.price,
                 quantity=quantity,
-                total_price=total_price
+                total_price=product.price * quantity
             )
         return receipt
 
@@ -443,12 +811,10 @@ class BasketAndOrderRedisAdapter:
         }
 
 
-    def get_receipt(self, basket):
+    def get_receipt(self):
         """
-        Args:
-            basket:
         Returns
             final receipt
         """
-        result = self.get_each_product_information_and_make_receipt(basket)
+        result = self.get_each_product_information_and_make_receipt()
         return result
@@ -0,0 +1,120 @@
+import json
+import time
+from django.conf import settings
+from config.settings import redis_client_first_db
+from order.models import DiscountCode
+
+
+class TooManyAttempts(Exception):
+    """
+    Raised when a user tried too many discount codes within the rate limit window.
+    """
+
+
+class DiscountCodeService:
+    """
+    Validates discount codes against a Redis cache in front of one indexed query.
+
+    A code is resolved to its owner, visibility, type, value, usage limit and
+    expiry with a single lookup on the unique ``code`` index. Both hits and
+    misses are cached, misses for a shorter time, so retrying a code, valid
+    or not, does not reach PostgreSQL. Signals drop the cached entry whenever
+    a code is saved or deleted; codes written with ``bulk_create`` bypass them
+    and can be reported missing until the negative entry expires.
+
+    Every attempt counts against a per-user fixed window checked in the same
+    script call as the cache read, so a brute-force or retry storm is stopped
+    before it costs a query.
+
+    Attributes:
+        ttl: Seconds a valid code is cached.
+        negative_ttl: Seconds a missing code is cached.
+        attempt_limit: Attempts a user may make per window.
+        attempt_window: Length of the rate limit window in seconds.
+    """
+    __client = redis_client_first_db
+    ttl = settings.DISCOUNT_CODE_CACHE_TTL
+    negative_ttl = settings.DISCOUNT_CODE_NEGATIVE_CACHE_TTL
+    attempt_limit = settings.DISCOUNT_CODE_ATTEMPT_LIMIT
+    attempt_window = settings.DISCOUNT_CODE_ATTEMPT_WINDOW
+
+    CHECK_SCRIPT = """
+    local attempts = redis.call('INCR', KEYS[1])
+    if attempts == 1 then
+        redis.call('EXPIRE', KEYS[1], ARGV[1])
+    end
+    if attempts > tonumber(ARGV[2]) then
+        return {0, false}
+    end
+    return {1, redis.call('GET', KEYS[2])}
+    """
+
+    def __init__(self):
+        self.__check = self.__class__.__client.register_script(self.CHECK_SCRIPT)
+
+    @staticmethod
+    def code_key(code):
+        return f"discount:code:{code}"
+
+    @staticmethod
+    def attempts_key(user_id):
+        return f"discount:attempts:{user_id}"
+
+    def check(self, user_id, code):
+        """
+        Checks whether a user may redeem a discount code: the code exists, has not
+        expired and belongs to the user or is public. Redemption itself is claimed
+        by DiscountRedemptionLedger.
+
+        Args:
+            user_id (int): The ID of the user applying the code.
+            code (str): The discount code.
+
+        Returns:
+            dict|None: The ID, owner, visibility, type, value, usage limit and expiry
+            timestamp of the code if the user may redeem it, otherwise None.
+
+        Raises:
+            TooManyAttempts: If the user exceeded the attempt limit.
+        """
+        if not code:
+            return None
+        allowed, cached = self.__check(
+            keys=[self.attempts_key(user_id), self.code_key(code)],
+            args=[self.attempt_window, self.attempt_limit]
+        )
+        if not allowed:
+            raise TooManyAttempts("Too many discount code attempts, try again later.")
+        discount = json.loads(cached) if cached is not None else self.load(code)
+        if discount is None or not (discount.get('public') or discount['user'] == user_id):
+            return None
+        if discount['expires_at'] is not None and discount['expires_at'] <= time.time():
+            return None
+        return discount
+
+    def load(self, code):
+        """
+        Resolves a code with one query on its unique index and caches the result.
+
+        Returns:
+            dict|None: The code as returned by check(), or None if it does not exist.
+        """
+        row = DiscountCode.objects.filter(code=code).values_list(
+            'id', 'user_id', 'is_public', 'type_of_discount', 'discount', 'usage_limit', 'expires_at'
+        ).first()
+        discount = None
+        if row:
+            discount = dict(zip(('id', 'user', 'public', 'type', 'value', 'usage_limit', 'expires_at'), row))
+            discount['expires_at'] = discount['expires_at'] and discount['expires_at'].timestamp()
+        self.__class__.__client.set(
+            self.code_key(code), json.dumps(discount), ex=self.ttl if discount else self.negative_ttl
+        )
+        return discount
+
+    def invalidate(self, *codes):
+        codes = [code for code in codes if code]
+        if codes:
+            self.__class__.__client.delete(*(self.code_key(code) for code in codes))
+
+
+discount_codes = DiscountCodeService()
@@ -0,0 +1,160 @@
+import json
+from django.conf import settings
+from redis.exceptions import ResponseError
+from config.settings import redis_client_first_db
+from order.redemptions import REDEEM_BASKET_DISCOUNT_FUNCTION, RedemptionError, redemption_ledger
+from order.reservation import StockReservation
+
+SUBMIT_BASKET_SCRIPT = REDEEM_BASKET_DISCOUNT_FUNCTION + """
+if redis.call('HEXISTS', KEYS[2], 'pay_amount') == 0 then
+    return false
+end
+local redeemed = redeem_basket_discount(KEYS[2], KEYS[4], KEYS[5], ARGV[1], ARGV[3], ARGV[4])
+if redeemed ~= 1 then
+    return redeemed
+end
+local basket = redis.call('HGETALL', KEYS[2])
+local fields = {}
+for i = 1, #basket, 2 do
+    fields[basket[i]] = basket[i + 1]
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('DEL', KEYS[2])
+return redis.call('XADD', KEYS[3], '*', 'user', ARGV[1], 'payment_id', ARGV[2], 'basket', cjson.encode(fields))
+"""
+
+
+class OrderFinalizationQueue:
+    """
+    Redis stream of paid baskets waiting to be turned into orders.
+
+    Submitting a basket claims it, redeems its discount code and appends a job
+    to the stream in one Lua script, so the basket is frozen with its stock
+    reservation the moment the payment succeeds and the request never waits
+    for the order to be written.
+    Workers read jobs through a consumer group; a job stays pending until it is
+    acknowledged, jobs left pending by a crashed or failing worker are reclaimed
+    by another one after ``retry_after`` milliseconds, and a job that keeps
+    failing is moved to a dead letter stream with its basket given back.
+
+    Attributes:
+        stream_key: Redis stream holding the pending jobs.
+        dead_key: Redis stream holding jobs that exhausted their attempts.
+        attempts_key: Redis hash counting failed attempts per job.
+        group: Consumer group shared by all finalization workers.
+        max_attempts: Failed attempts after which a job is given up.
+        retry_after: Milliseconds a job stays pending before another worker may take it.
+    """
+    __client = redis_client_first_db
+    __reservation = StockReservation()
+    stream_key = "order:finalization"
+    dead_key = StockReservation.dead_key
+    attempts_key = "order:finalization:attempts"
+    group = "finalizers"
+    max_attempts = settings.ORDER_FINALIZATION_MAX_ATTEMPTS
+    retry_after = settings.ORDER_FINALIZATION_RETRY_AFTER
+
+    def __init__(self):
+        self.submit_basket_script = self.__class__.__client.register_script(SUBMIT_BASKET_SCRIPT)
+
+    def enqueue(self, user, payment_id, code_id=None):
+        """
+        Atomically claims the user's basket, redeems its discount code and appends a finalization job for it.
+
+        Args:
+            user (int): The ID of the basket owner.
+            payment_id (str): The ID of the payment that paid for the basket.
+            code_id (str): The ID of the discount code the basket was read with, if any.
+
+        Returns:
+            str|None: The ID of the job, or None if the basket is missing or not completed.
+
+        Raises:
+            RedemptionError: If the basket's discount code cannot be redeemed.
+        """
+        result = self.submit_basket_script(
+            keys=[StockReservation.deadlines_key, f"user:{user}", self.stream_key,
+                  *redemption_ledger.claim_keys(code_id or 0)],
+            args=[user, payment_id, code_id or '', redemption_ledger.record(code_id or 0, user)]
+        )
+        if isinstance(result, int):
+            raise RedemptionError(result)
+        return result.decode('utf-8') if result else None
+
+    def ensure_group(self):
+        """
+        Creates the consumer group and the stream if they do not exist yet.
+        """
+        try:
+            self.__class__.__client.xgroup_create(self.stream_key, self.group, id='0', mkstream=True)
+        except ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+
+    def read(self, consumer, count=10, block=None):
+        """
+        Returns the next jobs for a worker, taking over stale pending jobs first.
+
+        Args:
+            consumer (str): The unique name of the worker.
+            count (int): The maximum number of jobs to return.
+            block (int): Milliseconds to wait for new jobs. Returns immediately when None.
+
+        Returns:
+            list: (job ID, job fields) tuples.
+        """
+        client = self.__class__.__client
+        reclaimed = client.xautoclaim(
+            self.stream_key, self.group, consumer, min_idle_time=self.retry_after, count=count
+        )[1]
+        messages = [message for message in reclaimed if message[1]]
+        deleted = [message[0] for message in reclaimed if not message[1]]
+        if deleted:
+            client.xack(self.stream_key, self.group, *deleted)
+        if not messages:
+            streams = client.xreadgroup(self.group, consumer, {self.stream_key: '>'}, count=count, block=block)
+            messages = streams[0][1] if streams else []
+        return [
+            (message_id.decode('utf-8'), {key.decode('utf-8'): value.decode('utf-8') for key, value in fields.items()})
+            for message_id, fields in messages
+        ]
+
+    def ack(self, message_id):
+        """
+        Marks a job as done and removes it from the stream.
+
+        Args:
+            message_id (str): The ID of the finished job.
+        """
+        pipeline = self.__class__.__client.pipeline()
+        pipeline.xack(self.stream_key, self.group, message_id)
+        pipeline.xdel(self.stream_key, message_id)
+        pipeline.hdel(self.attempts_key, message_id)
+        pipeline.execute()
+
+    def fail(self, message_id, job):
+        """
+        Records a failed attempt, giving the job up once it has failed too often.
+
+        A job that is given up is copied to the dead letter stream and its basket
+        is put back, so the customer keeps the reserved products and the payment
+        can be reconciled by hand. If the customer already has a new basket the
+        job is only dead-lettered. A restored basket keeps the discount code it
+        redeemed, so submitting it again does not claim the code twice. Only the
+        worker whose attempt reaches ``max_attempts`` gives the job up, so a job
+        reclaimed by several workers is restored and dead-lettered once.
+
+        Args:
+            message_id (str): The ID of the failed job.
+            job (dict): The fields of the failed job.
+
+        Returns:
+            bool: True if the job was given up.
+        """
+        attempts = self.__class__.__client.hincrby(self.attempts_key, message_id, 1)
+        if attempts != self.max_attempts:
+            return False
+        if self.__class__.__reservation.restore(job['user'], json.loads(job['basket']), job):
+            self.__class__.__client.xadd(self.dead_key, job)
+        self.ack(message_id)
+        return True
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from order.models import Order, OrderItem
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = "Writes OrderItem rows for orders that only have a JSON product_list receipt."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Orders processed per transaction.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = 0
+        backfilled = 0
+        while True:
+            orders = list(
+                Order.objects.filter(id__gt=last_id, order_items__isnull=True)
+                .order_by('id')
+                .only('id', 'product_list')[:batch_size]
+            )
+            if not orders:
+                break
+            last_id = orders[-1].id
+
+            lines = [
+                (order, int(product_id), line)
+                for order in orders
+                for product_id, line in (order.product_list or {}).items()
+                if str(product_id).isdigit()
+            ]
+            sellers = dict(
+                Product.everything.filter(id__in={product_id for _, product_id, _ in lines})
+                .values_list('id', 'seller_id')
+            )
+            items = [
+                OrderItem(
+                    order=order,
+                    product_id=product_id,
+                    seller_id=sellers.get(product_id),
+                    quantity=int(line['quantity']),
+                    unit_price=int(line['price']),
+                    total_price=int(line['total_price'])
+                )
+                for order, product_id, line in lines
+            ]
+            with transaction.atomic():
+                OrderItem.objects.bulk_create(items, batch_size=batch_size)
+            backfilled += len(orders)
+
+        self.stdout.write(f"Backfilled items for {backfilled} order(s).")
@@ -0,0 +1,67 @@
+import json
+import logging
+import os
+import socket
+import threading
+from django.core.management.base import BaseCommand
+from django.db import connection
+from order.basket import BasketAndOrderRedisAdapter
+from order.finalization import OrderFinalizationQueue
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Turns paid baskets from the order finalization queue into orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help="Number of worker threads in this process.")
+        parser.add_argument('--batch-size', type=int, default=10, help="Jobs a worker reads at a time.")
+        parser.add_argument('--block', type=int, default=5000, help="Milliseconds a worker waits for new jobs.")
+        parser.add_argument('--drain', action='store_true', help="Exit once the queue has no more new jobs.")
+
+    def handle(self, *args, **options):
+        self.queue = OrderFinalizationQueue()
+        self.queue.ensure_group()
+        self.finalized = 0
+        self.lock = threading.Lock()
+
+        prefix = f"{socket.gethostname()}-{os.getpid()}"
+        workers = [
+            threading.Thread(target=self.work, args=(f"{prefix}-{i}", options), daemon=True)
+            for i in range(options['workers'])
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.stdout.write(f"Finalized {self.finalized} order(s).")
+
+    def work(self, consumer, options):
+        """
+        Reads and finalizes jobs until the queue is drained, or forever without --drain.
+        """
+        block = None if options['drain'] else options['block']
+        try:
+            while True:
+                jobs = self.queue.read(consumer, count=options['batch_size'], block=block)
+                if not jobs and options['drain']:
+                    break
+                for message_id, job in jobs:
+                    self.finalize(message_id, job)
+        finally:
+            connection.close()
+
+    def finalize(self, message_id, job):
+        basket = BasketAndOrderRedisAdapter(user=int(job['user']))
+        try:
+            created = basket.finalize_order(json.loads(job['basket']), payment_id=job['payment_id'])
+        except Exception:
+            logger.exception("Could not finalize order for payment %s", job['payment_id'])
+            if self.queue.fail(message_id, job):
+                logger.error("Gave up on payment %s, basket was put back", job['payment_id'])
+            return
+        self.queue.ack(message_id)
+        if created:
+            with self.lock:
+                self.finalized += 1
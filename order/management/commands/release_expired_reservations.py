@@ -0,0 +1,20 @@
+import time
+from django.core.management.base import BaseCommand
+from order.reservation import StockReservation
+
+
+class Command(BaseCommand):
+    help = "Returns the stock reserved by abandoned baskets whose reservation TTL has passed."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep releasing expired baskets until stopped.")
+        parser.add_argument('--interval', type=int, default=60, help="Seconds to sleep between passes with --loop.")
+
+    def handle(self, *args, **options):
+        reservation = StockReservation()
+        while True:
+            released = reservation.release_expired()
+            self.stdout.write(f"Released {released} expired basket(s).")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,25 @@
+import time
+from django.core.management.base import BaseCommand
+from order.redemptions import redemption_ledger
+
+
+class Command(BaseCommand):
+    help = "Writes the discount redemptions claimed in Redis to the database in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Redemptions inserted per query.")
+        parser.add_argument('--loop', action='store_true', help="Keep writing redemptions until stopped.")
+        parser.add_argument('--interval', type=int, default=5, help="Seconds to sleep between passes with --loop.")
+        parser.add_argument('--restore', action='store_true',
+                            help="Add the stored redemptions to Redis first, e.g. after Redis lost its data.")
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            restored = redemption_ledger.restore()
+            self.stdout.write(f"Restored redemptions of {restored} discount code(s).")
+        while True:
+            written = redemption_ledger.drain(options['batch_size'])
+            self.stdout.write(f"Wrote {written} redemption(s).")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
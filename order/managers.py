@@ -0,0 +1,22 @@
+from django.db import models
+from django.db.models import Sum
+
+
+class OrderItemQuerySet(models.QuerySet):
+    def containing(self, product_id):
+        """
+        Returns the items of every order that contains the given product.
+        """
+        return self.filter(product_id=product_id)
+
+    def units_sold_per_product(self):
+        """
+        Returns the number of units sold per product, best sellers first.
+        """
+        return self.values('product_id').annotate(units_sold=Sum('quantity')).order_by('-units_sold')
+
+    def revenue_per_seller(self):
+        """
+        Returns the revenue made by each seller, highest first.
+        """
+        return self.values('seller_id').annotate(revenue=Sum('total_price')).order_by('-revenue')
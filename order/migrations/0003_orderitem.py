@@ -0,0 +1,33 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0019_alter_user_uuid'),
+        ('order', '0002_order'),
+        ('products', '0004_delete_discountcode'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('quantity', models.PositiveIntegerField()),
+                ('unit_price', models.PositiveIntegerField()),
+                ('total_price', models.PositiveIntegerField()),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_items', to='order.order')),
+                ('product', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='order_items', to='products.product')),
+                ('seller', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='seller_order_items', to='authentication.sellerprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product', 'order'], name='order_item_product_order_idx'), models.Index(fields=['seller', 'created_at'], name='order_item_seller_created_idx')],
+            },
+        ),
+    ]
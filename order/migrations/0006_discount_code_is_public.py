@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0005_discount_redemptions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='discountcode',
+            name='is_public',
+            field=models.BooleanField(default=False),
+        ),
+    ]
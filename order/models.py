@@ -1,8 +1,10 @@
 from django.contrib.auth import get_user_model
 
+from authentication.models import SellerProfile
 from core.models import TimeStampMixin
 from django.db import models
 
+from order.managers import OrderItemQuerySet
 from products.models import Product
 
 User = get_user_model()
@@ -15,12 +17,52 @@ class Order(TimeStampMixin):
     product_list = models.JSONField(default=dict)
     address = models.TextField(default='iran')
     total_price = models.FloatField(default='4.20')
+    payment_id = models.CharField(max_length=36, unique=True, null=True, blank=True)
     expired_at = None
 
     def __str__(self):
         return f"{self.user} --- {self.address}"
 
 
+class OrderItem(TimeStampMixin):
+    """
+    A single product line of an order.
+
+    Items are written next to the JSON receipt in Order.product_list so sales
+    questions (orders containing a product, units sold, revenue per seller) run
+    as indexed SQL. Product and seller are kept without database constraints so
+    order history outlives hard-deleted or archived catalog rows.
+
+    -----fields-----
+        order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='order_items')
+        product = models.ForeignKey(Product, on_delete=models.DO_NOTHING, db_constraint=False)
+        seller = models.ForeignKey(SellerProfile, on_delete=models.DO_NOTHING, db_constraint=False, null=True)
+        quantity = models.PositiveIntegerField()
+        unit_price = models.PositiveIntegerField()
+        total_price = models.PositiveIntegerField()
+    """
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='order_items')
+    product = models.ForeignKey(Product, on_delete=models.DO_NOTHING, db_constraint=False,
+                                related_name='order_items')
+    seller = models.ForeignKey(SellerProfile, on_delete=models.DO_NOTHING, db_constraint=False, null=True,
+                               blank=True, related_name='seller_order_items')
+    quantity = models.PositiveIntegerField()
+    unit_price = models.PositiveIntegerField()
+    total_price = models.PositiveIntegerField()
+    expired_at = None
+
+    objects = OrderItemQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['product', 'order'], name='order_item_product_order_idx'),
+            models.Index(fields=['seller', 'created_at'], name='order_item_seller_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.order_id} --- {self.product_id} x {self.quantity}"
+
+
 
 
 
@@ -29,8 +71,14 @@ class DiscountCode(TimeStampMixin, models.Model):
     """
     discount coupon model
 
+    A code can only be redeemed by its owner, unless it is public, in which
+    case anyone can redeem it. Either way a user redeems a code once.
+
     -----fields-----
         code = models.CharField(max_length=8, blank=True, null=True, unique=True)
+        is_public = models.BooleanField(default=False)
+        usage_limit = models.PositiveIntegerField(null=True, blank=True)
+        expires_at = models.DateTimeField(null=True, blank=True)
 
     """
     DISCOUNT_CHOICES = (
@@ -41,6 +89,35 @@ class DiscountCode(TimeStampMixin, models.Model):
     discount = models.PositiveIntegerField(blank=True, null=True)
     code = models.CharField(max_length=8, blank=True, null=True, unique=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='user_discount_code')
+    is_public = models.BooleanField(default=False)
+    usage_limit = models.PositiveIntegerField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return "%s" % self.code
+
+
+class DiscountRedemption(models.Model):
+    """
+    A discount code redeemed by a user.
+
+    Redemptions are claimed in Redis and written here in bulk by
+    write_discount_redemptions, see DiscountRedemptionLedger. The unique
+    constraint keeps the table correct if a claim is ever written twice.
+
+    -----fields-----
+        discount_code = models.ForeignKey(DiscountCode, on_delete=models.CASCADE, related_name='redemptions')
+        user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='discount_redemptions')
+        redeemed_at = models.DateTimeField()
+    """
+    discount_code = models.ForeignKey(DiscountCode, on_delete=models.CASCADE, related_name='redemptions')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='discount_redemptions')
+    redeemed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['discount_code', 'user'], name='discount_redemption_once_per_user'),
+        ]
+
+    def __str__(self):
+        return f"{self.discount_code_id} --- {self.user_id}"
@@ -0,0 +1,231 @@
+import json
+import time
+from datetime import datetime, timezone
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from config.settings import redis_client_first_db
+from order.models import DiscountCode, DiscountRedemption
+
+CHECK_REDEMPTION_FUNCTION = """
+local function check_redemption(redemptions_key, user, limit)
+    if redis.call('SISMEMBER', redemptions_key, user) == 1 then
+        return 0
+    end
+    if tonumber(limit) > 0 and redis.call('SCARD', redemptions_key) >= tonumber(limit) then
+        return -1
+    end
+    return 1
+end
+"""
+
+CLAIM_REDEMPTION_FUNCTION = CHECK_REDEMPTION_FUNCTION + """
+local function claim_redemption(redemptions_key, queue_key, user, limit, record)
+    local allowed = check_redemption(redemptions_key, user, limit)
+    if allowed ~= 1 then
+        return allowed
+    end
+    redis.call('SADD', redemptions_key, user)
+    redis.call('RPUSH', queue_key, record)
+    return 1
+end
+"""
+
+REDEEM_BASKET_DISCOUNT_FUNCTION = CLAIM_REDEMPTION_FUNCTION + """
+local function redeem_basket_discount(basket_key, redemptions_key, queue_key, user, code, record)
+    local applied = redis.call('HMGET', basket_key, 'discount_code', 'discount_limit', 'discount_claimed')
+    if (not applied[1]) or applied[3] == '1' then
+        return 1
+    end
+    if applied[1] ~= code then
+        return -3
+    end
+    local claimed = claim_redemption(redemptions_key, queue_key, user, applied[2], record)
+    if claimed == 1 then
+        redis.call('HSET', basket_key, 'discount_claimed', 1)
+    end
+    return claimed
+end
+"""
+
+
+class RedemptionError(ValueError):
+    """
+    Raised when a discount code cannot be redeemed by the user.
+
+    Attributes:
+        result: The result of the redemption script, a key of ``messages``.
+    """
+    messages = {
+        0: 'You have already used this code',
+        -1: 'This code has reached its usage limit',
+        -3: 'The basket changed, please try again',
+    }
+
+    def __init__(self, result):
+        super().__init__(self.messages[result])
+        self.result = result
+
+
+class DiscountRedemptionLedger:
+    """
+    Ledger of discount code redemptions, claimed in Redis and persisted in bulk.
+
+    Every code has a Redis set of the users who redeemed it. A claim checks
+    membership and the usage limit, adds the user and queues the redemption
+    in one script, so concurrent claims of a code are serialized by Redis
+    and the hot path costs a single call. Applying a code to a basket only
+    checks it; the code is claimed when the basket is ordered, so abandoned,
+    flushed and expired baskets never use a code up. Queued redemptions are
+    written to DiscountRedemption by write_discount_redemptions, whose unique
+    constraint makes rewriting a batch harmless. restore() rebuilds the sets
+    from the table, e.g. after Redis lost its data.
+
+    Attributes:
+        queue_key: Redis list of redemptions waiting to be written.
+    """
+    __client = redis_client_first_db
+    queue_key = "discount:redemption:queue"
+
+    CLAIM_SCRIPT = CLAIM_REDEMPTION_FUNCTION + """
+    return claim_redemption(KEYS[1], KEYS[2], ARGV[1], ARGV[2], ARGV[3])
+    """
+
+    REDEEM_SCRIPT = REDEEM_BASKET_DISCOUNT_FUNCTION + """
+    if redis.call('HEXISTS', KEYS[1], 'pay_amount') == 0 then
+        return 1
+    end
+    return redeem_basket_discount(KEYS[1], KEYS[2], KEYS[3], ARGV[1], ARGV[2], ARGV[3])
+    """
+
+    POP_SCRIPT = """
+    local records = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+    redis.call('LTRIM', KEYS[1], #records, -1)
+    return records
+    """
+
+    def __init__(self):
+        self.__claim = self.__class__.__client.register_script(self.CLAIM_SCRIPT)
+        self.__redeem = self.__class__.__client.register_script(self.REDEEM_SCRIPT)
+        self.__pop = self.__class__.__client.register_script(self.POP_SCRIPT)
+
+    @staticmethod
+    def redemptions_key(code_id):
+        return f"discount:redemptions:{code_id}"
+
+    def claim_keys(self, code_id):
+        return [self.redemptions_key(code_id), self.queue_key]
+
+    @staticmethod
+    def record(code_id, user_id):
+        """
+        Returns:
+            str: The queued record of a claim.
+        """
+        return json.dumps({'code': int(code_id), 'user': int(user_id), 'at': time.time()})
+
+    def claim(self, discount, user_id):
+        """
+        Redeems a discount code for a user.
+
+        Args:
+            discount (dict): The code as returned by DiscountCodeService.check().
+            user_id (int): The ID of the user.
+
+        Returns:
+            int: 1 if redeemed, 0 if the user already redeemed the code, -1 if its usage limit is reached.
+        """
+        return self.__claim(
+            keys=self.claim_keys(discount['id']),
+            args=[user_id, discount['usage_limit'] or 0, self.record(discount['id'], user_id)]
+        )
+
+    def redeem(self, basket_key, code_id, user_id):
+        """
+        Claims the code applied to a completed basket, unless the basket already claimed it.
+
+        Args:
+            basket_key (str): The Redis key of the basket.
+            code_id (str): The ID of the code the basket was read with.
+            user_id (int): The ID of the basket owner.
+
+        Raises:
+            RedemptionError: If the code cannot be redeemed or the basket's code changed.
+        """
+        result = self.__redeem(
+            keys=[basket_key, *self.claim_keys(code_id or 0)],
+            args=[user_id, code_id or '', self.record(code_id or 0, user_id)]
+        )
+        if result != 1:
+            raise RedemptionError(result)
+
+    def write(self, batch_size=1000):
+        """
+        Writes one batch of queued redemptions with a single insert.
+
+        Redemptions of codes or users deleted meanwhile are dropped. If the insert fails
+        the batch is put back on the queue.
+
+        Args:
+            batch_size (int): Redemptions popped from the queue at a time.
+
+        Returns:
+            int: The number of redemptions popped.
+        """
+        records = self.__pop(keys=[self.queue_key], args=[batch_size])
+        if not records:
+            return 0
+        redemptions = [json.loads(record) for record in records]
+        try:
+            with transaction.atomic():
+                codes = set(DiscountCode.objects.filter(
+                    id__in={redemption['code'] for redemption in redemptions}
+                ).values_list('id', flat=True))
+                users = set(get_user_model().objects.filter(
+                    id__in={redemption['user'] for redemption in redemptions}
+                ).values_list('id', flat=True))
+                DiscountRedemption.objects.bulk_create([
+                    DiscountRedemption(
+                        discount_code_id=redemption['code'],
+                        user_id=redemption['user'],
+                        redeemed_at=datetime.fromtimestamp(redemption['at'], tz=timezone.utc)
+                    )
+                    for redemption in redemptions
+                    if redemption['code'] in codes and redemption['user'] in users
+                ], ignore_conflicts=True)
+        except Exception:
+            self.__class__.__client.lpush(self.queue_key, *reversed(records))
+            raise
+        return len(records)
+
+    def drain(self, batch_size=1000):
+        """
+        Writes queued redemptions until the queue is empty.
+
+        Returns:
+            int: The number of redemptions popped.
+        """
+        written = 0
+        while count := self.write(batch_size):
+            written += count
+        return written
+
+    def restore(self):
+        """
+        Adds the redemptions stored in the table to the Redis sets, e.g. after Redis lost its data.
+
+        Members are only added, so claims made while restoring are kept.
+
+        Returns:
+            int: The number of codes with redemptions.
+        """
+        redeemed = {}
+        for code_id, user_id in DiscountRedemption.objects.values_list('discount_code_id', 'user_id').iterator():
+            redeemed.setdefault(code_id, []).append(user_id)
+        pipeline = self.__class__.__client.pipeline()
+        for code_id, users in redeemed.items():
+            pipeline.sadd(self.redemptions_key(code_id), *users)
+        pipeline.execute()
+        return len(redeemed)
+
+
+redemption_ledger = DiscountRedemptionLedger()
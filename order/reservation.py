@@ -0,0 +1,194 @@
+import json
+import time
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from config.settings import redis_client_first_db
+from core.cache import response_cache
+from products.models import Product
+from products.snapshots import snapshot_cache
+
+CLAIM_BASKET_SCRIPT = """
+local deadline = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if ARGV[2] ~= '*' then
+    if (not deadline) or tonumber(deadline) > tonumber(ARGV[2]) then
+        return {}
+    end
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+local basket = redis.call('HGETALL', KEYS[2])
+redis.call('DEL', KEYS[2])
+return basket
+"""
+
+RESTORE_BASKET_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('XADD', KEYS[3], '*', unpack(ARGV, 4))
+    return 0
+end
+local basket = cjson.decode(ARGV[3])
+for field, value in pairs(basket) do
+    redis.call('HSET', KEYS[2], field, value)
+end
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+return 1
+"""
+
+
+class StockReservation:
+    """
+    Reserves product stock for baskets without read-modify-write races.
+
+    Stock is checked and decremented in one conditional UPDATE, so concurrent
+    checkouts can never take more than the warehouse holds. The cached product
+    snapshot is consulted first so requests for sold-out products fail without
+    touching the database, and it and cached product responses are invalidated
+    whenever stock moves. The quantities kept in a user's basket hash are the
+    reservation itself; a sorted set tracks when each basket expires so
+    abandoned reservations can flow back into stock.
+
+    Attributes:
+        deadlines_key: Redis sorted set of user ids scored by reservation deadline.
+        dead_key: Redis stream of claimed baskets that could neither be ordered nor put back.
+        ttl: Seconds a basket keeps its reservation after its last mutation.
+    """
+    __client = redis_client_first_db
+    deadlines_key = "basket:deadlines"
+    dead_key = "order:finalization:dead"
+    ttl = settings.BASKET_RESERVATION_TTL
+
+    def __init__(self):
+        self.claim_basket_script = self.__class__.__client.register_script(CLAIM_BASKET_SCRIPT)
+        self.restore_basket_script = self.__class__.__client.register_script(RESTORE_BASKET_SCRIPT)
+
+    @staticmethod
+    def reserve(product_id, quantity):
+        """
+        Takes the requested quantity out of the warehouse if it is available.
+
+        Args:
+            product_id (int): The ID of the product to reserve.
+            quantity (int): The quantity to reserve.
+
+        Raises:
+            ValueError: If requested quantity exceeds available stock.
+
+        Returns:
+            bool: True if the stock was reserved.
+        """
+        snapshot = snapshot_cache.get(product_id)
+        if snapshot is None or (snapshot.warehouse or 0) < int(quantity):
+            raise ValueError("Product not available in stock!")
+
+        updated = Product.objects.filter(id=product_id, warehouse__gte=int(quantity)).update(
+            warehouse=F('warehouse') - int(quantity), updated_at=timezone.now()
+        )
+        if not updated:
+            raise ValueError("Product not available in stock!")
+        snapshot_cache.invalidate(product_id)
+        response_cache.invalidate(f"product:{product_id}")
+        return True
+
+    @staticmethod
+    def release(product_id, quantity):
+        """
+        Puts a previously reserved quantity back into the warehouse.
+
+        Args:
+            product_id (int): The ID of the reserved product.
+            quantity (int): The quantity to give back.
+        """
+        Product.everything.filter(id=product_id).update(
+            warehouse=F('warehouse') + int(quantity), updated_at=timezone.now()
+        )
+        snapshot_cache.invalidate(product_id)
+        response_cache.invalidate(f"product:{product_id}")
+
+    def deadline(self):
+        """
+        Returns:
+            float: The timestamp a reservation made now expires at.
+        """
+        return time.time() + self.ttl
+
+    def claim(self, user, expired_before=None):
+        """
+        Atomically takes the user's basket out of Redis together with its deadline.
+
+        Claiming a basket for an order commits its reservation: the stock stays
+        taken and no other request can change or order the same basket again.
+
+        Args:
+            user (int): The ID of the basket owner.
+            expired_before (float): Only claim the basket if its deadline is
+                earlier than this timestamp. Claims unconditionally when None.
+
+        Returns:
+            dict: The decoded basket fields, empty if nothing was claimed.
+        """
+        fields = self.claim_basket_script(
+            keys=[self.deadlines_key, f"user:{user}"],
+            args=[user, '*' if expired_before is None else expired_before]
+        )
+        return {key.decode('utf-8'): value.decode('utf-8') for key, value in zip(fields[::2], fields[1::2])}
+
+    def restore(self, user, basket, job=None):
+        """
+        Puts a claimed basket back, e.g. when the order built from it could not be saved.
+
+        If the user started a new basket meanwhile the two are not merged: the
+        claimed basket keeps its stock reserved and is moved to the dead letter
+        stream instead, to be reconciled by hand.
+
+        Args:
+            user (int): The ID of the basket owner.
+            basket (dict): The basket fields returned by claim().
+            job (dict): Fields of the dead letter entry. Defaults to the user and the basket.
+
+        Returns:
+            bool: True if the basket was put back.
+        """
+        if not basket:
+            return True
+        job = job or {'user': user, 'basket': json.dumps(basket)}
+        return bool(self.restore_basket_script(
+            keys=[self.deadlines_key, f"user:{user}", self.dead_key],
+            args=[user, self.deadline(), json.dumps(basket), *(item for pair in job.items() for item in pair)]
+        ))
+
+    def release_basket(self, user, expired_before=None):
+        """
+        Atomically removes the user's basket and returns its quantities to stock.
+
+        Args:
+            user (int): The ID of the basket owner.
+            expired_before (float): Only release the basket if its deadline is
+                earlier than this timestamp. Releases unconditionally when None.
+
+        Returns:
+            dict: The released product quantities keyed by product ID.
+        """
+        released = {}
+        for key, value in self.claim(user, expired_before).items():
+            if key.isdigit():
+                released[int(key)] = int(value)
+                self.release(key, value)
+        return released
+
+    def release_expired(self, now=None):
+        """
+        Releases every basket whose reservation deadline has passed.
+
+        Args:
+            now (float): Timestamp to compare deadlines against. Defaults to now.
+
+        Returns:
+            int: The number of baskets released.
+        """
+        now = time.time() if now is None else now
+        users = self.__class__.__client.zrangebyscore(self.deadlines_key, '-inf', now)
+        released = 0
+        for user in users:
+            if self.release_basket(user.decode('utf-8'), expired_before=now):
+                released += 1
+        return released
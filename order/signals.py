@@ -0,0 +1,23 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .discounts import discount_codes
+from .models import DiscountCode
+
+
+@receiver(pre_save, sender=DiscountCode)
+def remember_previous_code(sender, instance, **kwargs):
+    """
+    Records the code an existing discount code is stored under, so a renamed code's old entry is dropped too.
+    """
+    instance._previous_code = (
+        DiscountCode.objects.filter(pk=instance.pk).values_list('code', flat=True).first() if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=DiscountCode)
+@receiver(post_delete, sender=DiscountCode)
+def invalidate_discount_code(sender, instance, **kwargs):
+    """
+    Drops the cached lookups of a discount code whenever it is saved or deleted.
+    """
+    discount_codes.invalidate(instance.code, getattr(instance, '_previous_code', None))
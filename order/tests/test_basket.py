@@ -0,0 +1,339 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from authentication.models import User, SellerProfile, Address
+from config.settings import redis_client_first_db, redis_client_second_db
+from order.basket import BasketAndOrderRedisAdapter
+from order.discounts import DiscountCodeService
+from order.models import DiscountCode, Order
+from order.redemptions import DiscountRedemptionLedger
+from order.reservation import StockReservation
+from products.models import Product, Category
+
+
+class BasketHydrationTestCase(TestCase):
+    """
+    Test case for verifying that basket reads hydrate products in bulk.
+    """
+
+    def setUp(self):
+        """
+        Creates a seller, a category and a catalog of products to fill baskets with.
+        """
+        self.user = User.objects.create(
+            email='basketuser@gmail.com',
+            username='basketUsername',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        self.seller = SellerProfile.objects.create(user=self.user)
+        self.category = Category.objects.create(name='basket-category')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.products = [
+                Product.objects.create(
+                    name=f"Basket Product {i}",
+                    price=1000 + i,
+                    detail="basket product",
+                    category=self.category,
+                    warehouse=100,
+                    slug=f"basket-product-{i}",
+                    seller=self.seller
+                )
+                for i in range(30)
+            ]
+        self.request = RequestFactory().get('/api/order/basket/')
+        self.request.user = self.user
+
+    def tearDown(self):
+        redis_client_first_db.delete(f"user:{self.user.id}")
+        redis_client_first_db.zrem(StockReservation.deadlines_key, self.user.id)
+
+    def fill_basket(self, products):
+        redis_client_first_db.delete(f"user:{self.user.id}")
+        redis_client_first_db.hset(
+            f"user:{self.user.id}",
+            mapping={product.id: 2 for product in products}
+        )
+
+    def count_display_queries(self):
+        basket = BasketAndOrderRedisAdapter(request=self.request)
+        with CaptureQueriesContext(connection) as context:
+            displayed = basket.display_basket()
+        return len(context.captured_queries), displayed
+
+    def test_display_basket_query_count_is_constant(self):
+        """
+        Test that displaying a basket costs the same number of queries for 3 and 30 items.
+        """
+        self.fill_basket(self.products[:3])
+        small_basket_queries, _ = self.count_display_queries()
+
+        self.fill_basket(self.products)
+        large_basket_queries, displayed = self.count_display_queries()
+
+        self.assertEqual(small_basket_queries, 1)
+        self.assertEqual(small_basket_queries, large_basket_queries)
+        self.assertEqual(displayed['total_price'], sum(product.price * 2 for product in self.products))
+
+    def test_add_to_basket_cost_does_not_grow_with_basket_size(self):
+        """
+        Test that adding to a 29-item basket costs the same queries as adding to an empty one.
+        """
+        request = RequestFactory().post('/api/order/basket/')
+        request.user = self.user
+
+        with CaptureQueriesContext(connection) as first_add:
+            BasketAndOrderRedisAdapter(request=request, product=self.products[0].id, quantity=2).add_to_basket()
+        for product in self.products[1:29]:
+            BasketAndOrderRedisAdapter(request=request, product=product.id, quantity=2).add_to_basket()
+        with CaptureQueriesContext(connection) as last_add:
+            BasketAndOrderRedisAdapter(request=request, product=self.products[29].id, quantity=2).add_to_basket()
+
+        self.assertEqual(len(first_add.captured_queries), len(last_add.captured_queries))
+        basket = BasketAndOrderRedisAdapter(request=self.request)
+        self.assertFalse(basket.has_stale_totals())
+        self.assertEqual(basket.total_price, sum(product.price * 2 for product in self.products))
+
+    def test_price_change_reconciles_maintained_totals(self):
+        """
+        Test that basket totals are recomputed after a product price changes.
+        """
+        request = RequestFactory().post('/api/order/basket/')
+        request.user = self.user
+        BasketAndOrderRedisAdapter(request=request, product=self.products[0].id, quantity=3).add_to_basket()
+
+        product = Product.objects.get(id=self.products[0].id)
+        with self.captureOnCommitCallbacks(execute=True):
+            product.price = 2000
+            product.save()
+
+        displayed = BasketAndOrderRedisAdapter(request=self.request).display_basket()
+        self.assertEqual(displayed['total_price'], 6000)
+        self.assertEqual(displayed['price_after_discount'], 6000)
+
+    def test_payment_records_the_reconciled_amount(self):
+        """
+        Test that the payment is recorded with the basket total reconciled after a price change.
+        """
+        request = RequestFactory().post('/api/order/basket/')
+        request.user = self.user
+        BasketAndOrderRedisAdapter(request=request, product=self.products[0].id, quantity=2).add_to_basket()
+        product = Product.objects.get(id=self.products[0].id)
+        with self.captureOnCommitCallbacks(execute=True):
+            product.price = 2000
+            product.save()
+
+        payment = BasketAndOrderRedisAdapter(request=request).set_payment_information(message="success")
+
+        self.assertEqual(float(payment[b'total_price']), 4000)
+        self.assertEqual(float(redis_client_first_db.hget(f"user:{self.user.id}", 'pay_amount')), 4000)
+        redis_client_second_db.delete(f"payment:{self.user.uuid}")
+
+    def test_receipt_is_built_from_hydrated_products(self):
+        """
+        Test that the receipt reuses the hydrated products instead of querying per line.
+        """
+        self.fill_basket(self.products[:5])
+        basket = BasketAndOrderRedisAdapter(request=self.request)
+        basket.display_basket()
+        with self.assertNumQueries(0):
+            receipt = basket.get_receipt()
+        self.assertEqual(len(receipt), 5)
+        self.assertEqual(receipt[self.products[0].id]['total_price'], self.products[0].price * 2)
+
+
+class OrderCreationTestCase(TestCase):
+    """
+    Test case for verifying that orders are created from baskets in a single unit of work.
+    """
+
+    def setUp(self):
+        """
+        Creates a customer with an address and a catalog of products.
+        """
+        self.user = User.objects.create(
+            email='orderuser@gmail.com',
+            username='orderUsername',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        self.address = Address.objects.create(
+            costumer=self.user,
+            province="Tehran",
+            city="Tehran",
+            street="1st Golbarg",
+            house_number=5,
+            full_address="1st Golbarg, Narenjestan Blvd."
+        )
+        seller = SellerProfile.objects.create(user=self.user)
+        category = Category.objects.create(name='order-category')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.products = [
+                Product.objects.create(
+                    name=f"Order Product {i}",
+                    price=1000 + i,
+                    detail="order product",
+                    category=category,
+                    warehouse=10,
+                    slug=f"order-product-{i}",
+                    seller=seller
+                )
+                for i in range(10)
+            ]
+
+    def tearDown(self):
+        redis_client_first_db.delete(f"user:{self.user.id}")
+        redis_client_first_db.zrem(StockReservation.deadlines_key, self.user.id)
+
+    def get_basket(self, **kwargs):
+        request = RequestFactory().post('/api/order/basket/')
+        request.user = self.user
+        return BasketAndOrderRedisAdapter(request=request, **kwargs)
+
+    def fill_basket(self, products, address=None):
+        for product in products:
+            self.get_basket(product=product.id, quantity=2).add_to_basket()
+        self.get_basket(address=str(address or self.address.id)).add_or_update_address()
+
+    def capture_order_creation(self):
+        with CaptureQueriesContext(connection) as context:
+            self.get_basket().create_order()
+        return [query['sql'] for query in context.captured_queries]
+
+    def test_order_is_created_with_a_single_insert(self):
+        """
+        Test that the order row and its items are written with one INSERT each and the basket is consumed.
+        """
+        self.fill_basket(self.products[:3])
+
+        queries = self.capture_order_creation()
+
+        self.assertEqual(len([sql for sql in queries if sql.startswith('INSERT')]), 2)
+        order = Order.objects.get(user=self.user)
+        self.assertEqual(order.address, self.address.full_address)
+        self.assertEqual(order.total_price, sum(product.price * 2 for product in self.products[:3]))
+        self.assertEqual(len(order.product_list), 3)
+        self.assertEqual(order.order_items.count(), 3)
+        self.assertFalse(self.get_basket().check_if_basket_exists())
+        self.assertEqual(Product.objects.get(id=self.products[0].id).warehouse, 8)
+
+    def test_order_creation_cost_does_not_grow_with_order_size(self):
+        """
+        Test that ordering 10 products costs the same queries as ordering 2.
+        """
+        self.fill_basket(self.products[:2])
+        small_order_queries = self.capture_order_creation()
+        self.fill_basket(self.products[2:])
+        large_order_queries = self.capture_order_creation()
+
+        self.assertEqual(len(small_order_queries), len(large_order_queries))
+
+    def test_failed_order_restores_the_basket(self):
+        """
+        Test that the claimed basket is put back when the order cannot be saved.
+        """
+        self.fill_basket(self.products[:2], address=self.address.id + 1000)
+
+        with self.assertRaises(Address.DoesNotExist):
+            self.get_basket().create_order()
+
+        self.assertFalse(Order.objects.filter(user=self.user).exists())
+        self.assertEqual(len(self.get_basket().hydrate_basket()), 2)
+
+    def test_failed_order_does_not_merge_into_a_new_basket(self):
+        """
+        Test that a claimed basket is dead-lettered instead of merged when the user started a new basket.
+        """
+        self.fill_basket(self.products[:2])
+        basket = StockReservation().claim(self.user.id)
+        self.fill_basket(self.products[2:3])
+
+        self.assertFalse(StockReservation().restore(self.user.id, basket))
+
+        self.assertEqual(len(self.get_basket().hydrate_basket()), 1)
+        self.assertEqual(redis_client_first_db.xlen(StockReservation.dead_key), 1)
+        redis_client_first_db.delete(StockReservation.dead_key)
+
+
+class BasketConcurrencyTestCase(TransactionTestCase):
+    """
+    Test case for verifying that concurrent requests from one user keep the basket consistent.
+    """
+
+    def setUp(self):
+        """
+        Creates a customer, a discount code and a catalog of products.
+        """
+        self.user = User.objects.create(
+            email='concurrentuser@gmail.com',
+            username='concurrentUsername',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        self.seller = SellerProfile.objects.create(user=self.user)
+        self.category = Category.objects.create(name='concurrent-category')
+        self.products = [
+            Product.objects.create(
+                name=f"Concurrent Product {i}",
+                price=1000 * (i + 1),
+                detail="concurrent product",
+                category=self.category,
+                warehouse=10,
+                slug=f"concurrent-product-{i}",
+                seller=self.seller
+            )
+            for i in range(20)
+        ]
+        self.code = DiscountCode.objects.create(code='SAVE10', type_of_discount='percentage', discount=10,
+                                                user=self.user)
+
+    def tearDown(self):
+        redis_client_first_db.delete(
+            f"user:{self.user.id}",
+            DiscountCodeService.attempts_key(self.user.id),
+            DiscountRedemptionLedger.redemptions_key(self.code.id),
+            DiscountRedemptionLedger.queue_key
+        )
+        redis_client_first_db.zrem(StockReservation.deadlines_key, self.user.id)
+
+    def get_basket(self, product=None):
+        request = RequestFactory().post('/api/order/basket/')
+        request.user = self.user
+        return BasketAndOrderRedisAdapter(request=request, product=product, quantity=1)
+
+    def run_concurrently(self, function, arguments):
+        def target(argument):
+            try:
+                return function(argument)
+            except ValueError:
+                return False
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            return list(executor.map(target, arguments))
+
+    def test_concurrent_adds_keep_pay_amount_consistent(self):
+        """
+        Test that adding 20 products at once leaves pay_amount equal to the basket total.
+        """
+        self.run_concurrently(lambda product: self.get_basket(product.id).add_to_basket(), self.products)
+
+        displayed = self.get_basket().display_basket()
+        expected_total = sum(product.price for product in self.products)
+        self.assertEqual(displayed['total_price'], expected_total)
+        self.assertEqual(displayed['price_after_discount'], expected_total)
+
+    def test_discount_code_is_applied_once_under_concurrency(self):
+        """
+        Test that a discount code applied by many simultaneous requests only takes effect once.
+        """
+        self.get_basket(self.products[0].id).add_to_basket()
+
+        results = self.run_concurrently(lambda _: self.get_basket().apply_discount('SAVE10'), range(10))
+
+        self.assertEqual(results.count(True), 1)
+        displayed = self.get_basket().display_basket()
+        self.assertEqual(displayed['price_after_discount'], self.products[0].price * 0.9)
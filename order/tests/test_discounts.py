@@ -0,0 +1,121 @@
+import uuid
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from authentication.models import User
+from authentication.tokens import ClaimsTokenObtainPairSerializer
+from config.settings import redis_client_first_db
+from order.discounts import DiscountCodeService, TooManyAttempts, discount_codes
+from order.models import DiscountCode
+
+
+class DiscountCodeServiceTestCase(TestCase):
+    """
+    Test case for verifying that discount codes are validated from a cache behind a rate limit.
+    """
+
+    def setUp(self):
+        """
+        Creates two users and a discount code owned by the first one.
+        """
+        self.user = User.objects.create(
+            email='discountuser@gmail.com',
+            username='discountUsername',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        self.other = User.objects.create(
+            email='otherdiscountuser@gmail.com',
+            username='otherDiscountUsername',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        self.code = DiscountCode.objects.create(code='OFF20', type_of_discount='cash', discount=20, user=self.user)
+
+    def tearDown(self):
+        redis_client_first_db.delete(
+            DiscountCodeService.code_key('OFF20'),
+            DiscountCodeService.code_key('OFF30'),
+            DiscountCodeService.code_key('MISSING'),
+            DiscountCodeService.attempts_key(self.user.id),
+            DiscountCodeService.attempts_key(self.other.id)
+        )
+
+    def check(self, user, code):
+        with CaptureQueriesContext(connection) as context:
+            result = discount_codes.check(user.id, code)
+        return result, len(context.captured_queries)
+
+    def test_code_is_resolved_with_one_query_and_then_cached(self):
+        """
+        Test that a code costs a single query on first use and none afterwards.
+        """
+        first, first_queries = self.check(self.user, 'OFF20')
+        second, second_queries = self.check(self.user, 'OFF20')
+
+        self.assertEqual((first['type'], first['value']), ('cash', 20))
+        self.assertEqual(second, first)
+        self.assertEqual(first_queries, 1)
+        self.assertEqual(second_queries, 0)
+
+    def test_missing_codes_are_cached(self):
+        """
+        Test that a code that does not exist is only looked up once.
+        """
+        self.check(self.user, 'MISSING')
+        result, queries = self.check(self.user, 'MISSING')
+
+        self.assertIsNone(result)
+        self.assertEqual(queries, 0)
+
+    def test_codes_of_other_users_are_rejected(self):
+        """
+        Test that a code cannot be used by a user who does not own it.
+        """
+        result, _ = self.check(self.other, 'OFF20')
+
+        self.assertIsNone(result)
+
+    def test_saving_a_code_invalidates_the_cache(self):
+        """
+        Test that changes to a code are seen right away, including under its old name.
+        """
+        self.check(self.user, 'OFF20')
+        self.check(self.user, 'OFF30')
+
+        self.code.code = 'OFF30'
+        self.code.discount = 30
+        self.code.save()
+
+        self.assertIsNone(self.check(self.user, 'OFF20')[0])
+        self.assertEqual(self.check(self.user, 'OFF30')[0]['value'], 30)
+
+    def test_attempts_above_the_limit_are_rejected_without_a_query(self):
+        """
+        Test that a user exceeding the attempt limit is stopped before the cache or database.
+        """
+        for _ in range(DiscountCodeService.attempt_limit):
+            self.check(self.user, 'MISSING')
+
+        with CaptureQueriesContext(connection) as context:
+            with self.assertRaises(TooManyAttempts):
+                discount_codes.check(self.user.id, 'OFF20')
+        self.assertEqual(len(context.captured_queries), 0)
+
+    def test_rate_limited_requests_get_429(self):
+        """
+        Test that the discount endpoint answers 429 once the attempt limit is exceeded.
+        """
+        client = APIClient()
+        token = ClaimsTokenObtainPairSerializer.get_token(self.user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        url = reverse('basket-set-discount-code')
+
+        for _ in range(DiscountCodeService.attempt_limit):
+            client.post(url, {'code': 'MISSING'})
+        response = client.post(url, {'code': 'OFF20'})
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
@@ -0,0 +1,191 @@
+import uuid
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from authentication.models import User, SellerProfile, Address
+from config.settings import redis_client_first_db, redis_client_second_db
+from order.basket import BasketAndOrderRedisAdapter
+from order.finalization import OrderFinalizationQueue
+from order.models import Order
+from order.reservation import StockReservation
+from products.models import Product, Category
+
+
+class OrderFinalizationTestCase(TransactionTestCase):
+    """
+    Test case for verifying that paid baskets are finalized into orders by queue workers.
+    """
+
+    def setUp(self):
+        """
+        Creates a customer with an address and a few products.
+        """
+        self.user = User.objects.create(
+            email='finalizeuser@gmail.com',
+            username='finalizeUsername',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        self.address = Address.objects.create(
+            costumer=self.user,
+            province="Tehran",
+            city="Tehran",
+            street="1st Golbarg",
+            house_number=5,
+            full_address="1st Golbarg, Narenjestan Blvd."
+        )
+        seller = SellerProfile.objects.create(user=self.user)
+        category = Category.objects.create(name='finalize-category')
+        self.products = [
+            Product.objects.create(
+                name=f"Finalize Product {i}",
+                price=1000 + i,
+                detail="finalize product",
+                category=category,
+                warehouse=10,
+                slug=f"finalize-product-{i}",
+                seller=seller
+            )
+            for i in range(3)
+        ]
+
+    def tearDown(self):
+        redis_client_first_db.delete(
+            f"user:{self.user.id}",
+            OrderFinalizationQueue.stream_key,
+            OrderFinalizationQueue.dead_key,
+            OrderFinalizationQueue.attempts_key
+        )
+        redis_client_first_db.zrem(StockReservation.deadlines_key, self.user.id)
+
+    def get_basket(self, **kwargs):
+        request = RequestFactory().post('/api/order/basket/')
+        request.user = self.user
+        return BasketAndOrderRedisAdapter(request=request, **kwargs)
+
+    def fill_basket(self, address=None):
+        for product in self.products:
+            self.get_basket(product=product.id, quantity=2).add_to_basket()
+        self.get_basket(address=str(address or self.address.id)).add_or_update_address()
+
+    def drain(self):
+        call_command('finalize_orders', '--drain', '--workers', '2', stdout=StringIO())
+
+    def test_payment_queues_the_order_without_writing_it(self):
+        """
+        Test that a successful payment only queues the basket and a worker then writes the order.
+        """
+        self.fill_basket()
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post('/api/payment/', {
+                "card_number": "6037", "cvv2": "123", "exp_date": "04/09", "password": "1234"
+            })
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse([query for query in context.captured_queries if query['sql'].startswith('INSERT')])
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(self.get_basket().check_if_basket_exists())
+
+        self.drain()
+
+        order = Order.objects.get(payment_id=response.data['payment_id'])
+        self.assertEqual(order.total_price, sum(product.price * 2 for product in self.products))
+        self.assertEqual(order.order_items.count(), 3)
+        self.assertEqual(redis_client_first_db.xlen(OrderFinalizationQueue.stream_key), 0)
+
+    def test_payment_is_recorded_as_failed_when_the_basket_is_not_queued(self):
+        """
+        Test that a payment whose basket cannot be queued is not left recorded as successful.
+        """
+        self.fill_basket()
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        with mock.patch.object(BasketAndOrderRedisAdapter, 'submit_order',
+                               side_effect=ValueError("Basket is not completed yet")):
+            response = client.post('/api/payment/', {
+                "card_number": "6037", "cvv2": "123", "exp_date": "04/09", "password": "1234"
+            })
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        payment = redis_client_second_db.hgetall(f"payment:{self.user.uuid}")
+        self.assertEqual(payment[b'status'], b'fail')
+        redis_client_second_db.delete(f"payment:{self.user.uuid}")
+
+    def test_same_payment_is_finalized_once(self):
+        """
+        Test that finalizing one payment twice writes a single order.
+        """
+        self.fill_basket()
+        basket = StockReservation().claim(self.user.id)
+
+        first = BasketAndOrderRedisAdapter(user=self.user.id).finalize_order(dict(basket), payment_id='payment-1')
+        second = BasketAndOrderRedisAdapter(user=self.user.id).finalize_order(dict(basket), payment_id='payment-1')
+
+        self.assertTrue(first)
+        self.assertFalse(second)
+        self.assertEqual(Order.objects.filter(payment_id='payment-1').count(), 1)
+
+    def test_order_keeps_the_claimed_prices_of_deleted_products(self):
+        """
+        Test that a claimed basket is ordered at its basket prices even if a product is repriced and deleted.
+        """
+        self.fill_basket()
+        basket = StockReservation().claim(self.user.id)
+        product = Product.objects.get(id=self.products[0].id)
+        product.price = 5000
+        product.save()
+        product.soft_delete()
+
+        BasketAndOrderRedisAdapter(user=self.user.id).finalize_order(dict(basket), payment_id='payment-3')
+
+        order = Order.objects.get(payment_id='payment-3')
+        receipt = order.product_list[str(self.products[0].id)]
+        self.assertEqual(receipt['name'], self.products[0].name)
+        self.assertEqual(receipt['total_price'], self.products[0].price * 2)
+        item = order.order_items.get(product_id=self.products[0].id)
+        self.assertEqual(item.unit_price, self.products[0].price)
+        self.assertEqual(order.order_items.count(), 3)
+
+    def test_failing_job_is_given_up_and_basket_restored(self):
+        """
+        Test that a job failing max_attempts times goes to the dead letter stream and the basket comes back.
+        """
+        self.fill_basket(address=self.address.id + 1000)
+        self.get_basket().submit_order('payment-2')
+
+        with mock.patch.object(OrderFinalizationQueue, 'retry_after', 0), \
+                self.assertLogs('order.management.commands.finalize_orders', level='ERROR') as logs:
+            for _ in range(OrderFinalizationQueue.max_attempts):
+                self.drain()
+
+        self.assertEqual(len([line for line in logs.output if "Gave up on payment payment-2" in line]), 1)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(redis_client_first_db.xlen(OrderFinalizationQueue.dead_key), 1)
+        self.assertEqual(len(self.get_basket().hydrate_basket()), 3)
+
+    def test_given_up_job_does_not_merge_into_a_new_basket(self):
+        """
+        Test that a job given up while the user has a new basket is only dead-lettered.
+        """
+        self.fill_basket(address=self.address.id + 1000)
+        message_id = OrderFinalizationQueue().enqueue(self.user.id, 'payment-3')
+        self.get_basket(product=self.products[0].id, quantity=1).add_to_basket()
+        job = {'user': str(self.user.id), 'payment_id': 'payment-3',
+               'basket': redis_client_first_db.xrange(OrderFinalizationQueue.stream_key)[0][1][b'basket'].decode()}
+
+        with mock.patch.object(OrderFinalizationQueue, 'max_attempts', 1):
+            self.assertTrue(OrderFinalizationQueue().fail(message_id, job))
+
+        dead = redis_client_first_db.xrange(OrderFinalizationQueue.dead_key)
+        self.assertEqual(len(dead), 1)
+        self.assertEqual(dead[0][1][b'payment_id'], b'payment-3')
+        self.assertEqual(self.get_basket().hydrate_basket()[0][1], 1)
@@ -0,0 +1,99 @@
+import uuid
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from authentication.models import User, SellerProfile
+from order.models import Order, OrderItem
+from products.models import Product, Category
+
+
+class OrderItemTestCase(TestCase):
+    """
+    Test case for verifying sales queries over normalized order items.
+    """
+
+    def setUp(self):
+        """
+        Creates two sellers with a product each and a few historical orders.
+        """
+        self.user = User.objects.create(
+            email='itemuser@gmail.com',
+            username='itemUsername',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        other_user = User.objects.create(
+            email='itemseller@gmail.com',
+            username='itemSeller',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        self.sellers = [SellerProfile.objects.create(user=self.user), SellerProfile.objects.create(user=other_user)]
+        category = Category.objects.create(name='item-category')
+        self.products = [
+            Product.objects.create(
+                name=f"Item Product {i}",
+                price=1000 * (i + 1),
+                detail="item product",
+                category=category,
+                warehouse=10,
+                slug=f"item-product-{i}",
+                seller=self.sellers[i]
+            )
+            for i in range(2)
+        ]
+
+    def make_order(self, quantities):
+        product_list = {
+            str(product.id): {
+                "name": product.name,
+                "slug": product.slug,
+                "price": product.price,
+                "quantity": quantity,
+                "total_price": product.price * quantity
+            }
+            for product, quantity in zip(self.products, quantities)
+            if quantity
+        }
+        return Order.objects.create(
+            user=self.user,
+            product_list=product_list,
+            total_price=sum(line['total_price'] for line in product_list.values()),
+            address="somewhere"
+        )
+
+    def test_backfill_writes_items_once(self):
+        """
+        Test that the backfill command creates items from receipts and skips orders that already have them.
+        """
+        first = self.make_order([1, 2])
+        second = self.make_order([3, 0])
+
+        call_command('backfill_order_items', stdout=StringIO())
+        call_command('backfill_order_items', stdout=StringIO())
+
+        self.assertEqual(first.order_items.count(), 2)
+        self.assertEqual(second.order_items.count(), 1)
+        item = first.order_items.get(product=self.products[1])
+        self.assertEqual((item.quantity, item.unit_price, item.total_price), (2, 2000, 4000))
+        self.assertEqual(item.seller_id, self.sellers[1].id)
+
+    def test_sales_aggregates(self):
+        """
+        Test that orders containing a product, units sold and seller revenue are computed in SQL.
+        """
+        self.make_order([1, 2])
+        self.make_order([3, 0])
+        call_command('backfill_order_items', stdout=StringIO())
+
+        with self.assertNumQueries(1):
+            units = list(OrderItem.objects.units_sold_per_product())
+        with self.assertNumQueries(1):
+            revenue = list(OrderItem.objects.revenue_per_seller())
+
+        self.assertEqual(OrderItem.objects.containing(self.products[1].id).count(), 1)
+        self.assertEqual(units[0], {'product_id': self.products[0].id, 'units_sold': 4})
+        self.assertEqual(
+            {row['seller_id']: row['revenue'] for row in revenue},
+            {self.sellers[0].id: 4000, self.sellers[1].id: 4000}
+        )
@@ -0,0 +1,199 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.db import connection
+from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from authentication.models import User, SellerProfile, Address
+from config.settings import redis_client_first_db
+from order.basket import BasketAndOrderRedisAdapter
+from order.discounts import DiscountCodeService, discount_codes
+from order.finalization import OrderFinalizationQueue
+from order.models import DiscountCode, DiscountRedemption
+from order.redemptions import DiscountRedemptionLedger, RedemptionError, redemption_ledger
+from order.reservation import StockReservation
+from products.models import Product, Category
+
+
+class DiscountRedemptionTestCase(TestCase):
+    """
+    Test case for verifying that discount codes are redeemed once and persisted in bulk.
+    """
+
+    def setUp(self):
+        """
+        Creates a few users, a product, a code owned by the first user and a public code with a usage limit.
+        """
+        self.users = [
+            User.objects.create(
+                email=f'redeemuser{i}@gmail.com',
+                username=f'redeemUsername{i}',
+                password='TestP@assword',
+                uuid=uuid.uuid4()
+            )
+            for i in range(4)
+        ]
+        self.user = self.users[0]
+        self.product = Product.objects.create(
+            name="Redeem Product",
+            price=1000,
+            detail="redeem product",
+            category=Category.objects.create(name='redeem-category'),
+            warehouse=100,
+            slug="redeem-product",
+            seller=SellerProfile.objects.create(user=self.user)
+        )
+        self.own_code = DiscountCode.objects.create(code='MINE10', type_of_discount='cash', discount=10,
+                                                    user=self.user)
+        self.shared_code = DiscountCode.objects.create(code='ALL5', type_of_discount='cash', discount=5,
+                                                       is_public=True, usage_limit=2)
+
+    def tearDown(self):
+        redis_client_first_db.delete(
+            DiscountRedemptionLedger.queue_key,
+            *(DiscountRedemptionLedger.redemptions_key(code.id) for code in (self.own_code, self.shared_code)),
+            *(DiscountCodeService.code_key(code) for code in ('MINE10', 'ALL5', 'OLD5', 'NOBODY5')),
+            *(DiscountCodeService.attempts_key(user.id) for user in self.users),
+            *(f"user:{user.id}" for user in self.users),
+            OrderFinalizationQueue.stream_key
+        )
+        redis_client_first_db.zrem(StockReservation.deadlines_key, *(user.id for user in self.users))
+
+    def get_basket(self, user, **kwargs):
+        request = RequestFactory().post('/api/order/basket/')
+        request.user = user
+        return BasketAndOrderRedisAdapter(request=request, **kwargs)
+
+    def order_with_code(self, user, code):
+        self.get_basket(user, product=self.product.id, quantity=1).add_to_basket()
+        self.get_basket(user).apply_discount(code)
+        return self.get_basket(user).create_order()
+
+    def test_flushed_basket_does_not_use_the_code(self):
+        """
+        Test that a code applied to a basket that is flushed without an order can be applied again.
+        """
+        self.assertTrue(self.get_basket(self.user).apply_discount('MINE10'))
+        self.get_basket(self.user).flush_basket()
+
+        self.assertTrue(self.get_basket(self.user).apply_discount('MINE10'))
+        self.assertFalse(redis_client_first_db.exists(DiscountRedemptionLedger.redemptions_key(self.own_code.id)))
+
+    def test_code_cannot_be_redeemed_again_after_an_order(self):
+        """
+        Test that a code redeemed by an order cannot be applied to the next basket.
+        """
+        self.order_with_code(self.user, 'MINE10')
+
+        with self.assertRaisesMessage(RedemptionError, 'You have already used this code'):
+            self.get_basket(self.user).apply_discount('MINE10')
+
+    def test_usage_limit_counts_orders_not_baskets(self):
+        """
+        Test that only ordered baskets count against a shared code's usage limit.
+        """
+        for user in self.users[1:3]:
+            self.get_basket(user).apply_discount('ALL5')
+            self.get_basket(user).flush_basket()
+        self.order_with_code(self.users[1], 'ALL5')
+        self.order_with_code(self.users[2], 'ALL5')
+
+        with self.assertRaisesMessage(RedemptionError, 'This code has reached its usage limit'):
+            self.get_basket(self.users[3]).apply_discount('ALL5')
+
+    def test_code_exhausted_before_ordering_is_dropped_from_the_basket(self):
+        """
+        Test that a basket whose code reached its usage limit meanwhile cannot be ordered with it.
+        """
+        self.get_basket(self.users[3], product=self.product.id, quantity=1).add_to_basket()
+        self.get_basket(self.users[3]).apply_discount('ALL5')
+        self.order_with_code(self.users[1], 'ALL5')
+        self.order_with_code(self.users[2], 'ALL5')
+
+        with self.assertRaisesMessage(ValueError, 'This code has reached its usage limit, it was removed from your basket'):
+            self.get_basket(self.users[3]).submit_order('payment-1')
+
+        displayed = self.get_basket(self.users[3]).display_basket()
+        self.assertEqual(displayed['price_after_discount'], self.product.price)
+        self.assertTrue(self.get_basket(self.users[3]).submit_order('payment-1'))
+
+    def test_codes_without_an_owner_are_private_unless_public(self):
+        """
+        Test that a code with no owner is not redeemable unless it is marked public.
+        """
+        DiscountCode.objects.create(code='NOBODY5', type_of_discount='cash', discount=5)
+
+        with self.assertRaises(RuntimeError):
+            self.get_basket(self.users[1]).apply_discount('NOBODY5')
+        with self.assertRaises(RuntimeError):
+            self.get_basket(self.users[1]).apply_discount('MINE10')
+        self.assertTrue(self.get_basket(self.users[1]).apply_discount('ALL5'))
+
+    def test_expired_codes_are_invalid(self):
+        """
+        Test that a code past its expiry cannot be applied.
+        """
+        DiscountCode.objects.create(code='OLD5', type_of_discount='cash', discount=5, is_public=True,
+                                    expires_at=timezone.now() - timedelta(minutes=1))
+
+        with self.assertRaises(RuntimeError):
+            self.get_basket(self.user).apply_discount('OLD5')
+
+    def test_concurrent_claims_respect_the_usage_limit(self):
+        """
+        Test that simultaneous claims of a shared code never exceed its usage limit.
+        """
+        discount = discount_codes.check(self.user.id, 'ALL5')
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda user_id: redemption_ledger.claim(discount, user_id), range(1000, 1016)))
+
+        self.assertEqual(results.count(1), 2)
+        self.assertEqual(results.count(-1), 14)
+
+    def test_failed_order_keeps_its_redemption(self):
+        """
+        Test that a basket put back after a failed order is ordered again without claiming its code twice.
+        """
+        self.get_basket(self.user, product=self.product.id, quantity=1).add_to_basket()
+        self.get_basket(self.user).apply_discount('MINE10')
+        redis_client_first_db.hset(f"user:{self.user.id}", 'address', 0)
+        with self.assertRaises(Address.DoesNotExist):
+            self.get_basket(self.user).create_order()
+        redis_client_first_db.hdel(f"user:{self.user.id}", 'address')
+
+        self.assertTrue(self.get_basket(self.user).create_order())
+        self.assertEqual(redis_client_first_db.llen(DiscountRedemptionLedger.queue_key), 1)
+
+    def test_queued_redemptions_are_written_with_one_insert(self):
+        """
+        Test that claimed redemptions reach the table in bulk and duplicates are ignored.
+        """
+        for user in self.users[1:3]:
+            self.order_with_code(user, 'ALL5')
+        self.order_with_code(self.user, 'MINE10')
+        duplicate = redis_client_first_db.lindex(DiscountRedemptionLedger.queue_key, 0)
+        redis_client_first_db.rpush(DiscountRedemptionLedger.queue_key, duplicate)
+
+        with CaptureQueriesContext(connection) as context:
+            written = redemption_ledger.drain()
+
+        inserts = [query for query in context.captured_queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(written, 4)
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(DiscountRedemption.objects.filter(discount_code=self.shared_code).count(), 2)
+        self.assertEqual(DiscountRedemption.objects.filter(discount_code=self.own_code, user=self.user).count(), 1)
+
+    def test_restore_rebuilds_claims_from_the_table(self):
+        """
+        Test that redemptions stored in the table are enforced again after Redis lost them.
+        """
+        self.order_with_code(self.user, 'MINE10')
+        redemption_ledger.drain()
+        redis_client_first_db.delete(DiscountRedemptionLedger.redemptions_key(self.own_code.id))
+
+        redemption_ledger.restore()
+
+        with self.assertRaisesMessage(RedemptionError, 'You have already used this code'):
+            self.get_basket(self.user).apply_discount('MINE10')
@@ -0,0 +1,125 @@
+import uuid
+from unittest import mock
+from django.db import connection
+from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from authentication.models import User, SellerProfile, Address
+from authentication.tokens import ClaimsTokenObtainPairSerializer
+from config.settings import redis_client_first_db
+from core.context import RequestContext
+from order.basket import BasketAndOrderRedisAdapter
+from order.reservation import StockReservation
+from products.models import Product, Category
+
+
+class RequestContextTestCase(TestCase):
+    """
+    Test case for verifying that the facts a basket request needs are fetched once per request.
+    """
+
+    def setUp(self):
+        """
+        Creates a customer with an address, a product and an authenticated client.
+        """
+        self.user = User.objects.create(
+            email='contextuser@gmail.com',
+            username='contextUsername',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        self.address = Address.objects.create(
+            costumer=self.user,
+            province="Tehran",
+            city="Tehran",
+            street="1st Golbarg",
+            house_number=5,
+            full_address="1st Golbarg, Narenjestan Blvd."
+        )
+        self.product = Product.objects.create(
+            name="Context Product",
+            price=1000,
+            detail="context product",
+            category=Category.objects.create(name='context-category'),
+            warehouse=10,
+            slug="context-product",
+            seller=SellerProfile.objects.create(user=self.user)
+        )
+        self.client = APIClient()
+        token = ClaimsTokenObtainPairSerializer.get_token(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def tearDown(self):
+        redis_client_first_db.delete(f"user:{self.user.id}")
+        redis_client_first_db.zrem(StockReservation.deadlines_key, self.user.id)
+
+    def get_request(self):
+        request = RequestFactory().post('/api/order/basket/')
+        request.user = self.user
+        request.context = RequestContext(request)
+        return request
+
+    def test_permission_and_view_read_the_basket_once(self):
+        """
+        Test that the basket validated by the payment permission is reused by the view.
+        """
+        request = self.get_request()
+        BasketAndOrderRedisAdapter(request=request, product=self.product.id, quantity=1).add_to_basket()
+        BasketAndOrderRedisAdapter(request=request, address=str(self.address.id)).add_or_update_address()
+
+        with mock.patch.object(BasketAndOrderRedisAdapter, 'read_basket', autospec=True,
+                               side_effect=BasketAndOrderRedisAdapter.read_basket) as read_basket:
+            response = self.client.get('/api/payment/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(read_basket.call_count, 1)
+
+    def test_mutations_drop_the_memoized_basket(self):
+        """
+        Test that an adapter built after a mutation does not see the basket read before it.
+        """
+        request = self.get_request()
+        self.assertFalse(BasketAndOrderRedisAdapter(request=request).check_if_basket_exists())
+
+        BasketAndOrderRedisAdapter(request=request, product=self.product.id, quantity=1).add_to_basket()
+
+        self.assertTrue(BasketAndOrderRedisAdapter(request=request).check_if_basket_exists())
+
+    def test_address_ownership_is_checked_against_memoized_addresses(self):
+        """
+        Test that submitting an address reads the user's addresses with a single query.
+        """
+        BasketAndOrderRedisAdapter(request=self.get_request(), product=self.product.id, quantity=1).add_to_basket()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(reverse('submit_basket-list'), {'address_id': self.address.id})
+
+        address_queries = [query for query in context.captured_queries
+                           if '"authentication_address"' in query['sql']]
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(address_queries), 1)
+
+    def test_other_users_address_is_rejected(self):
+        """
+        Test that an address of another user cannot be attached to the basket.
+        """
+        other = User.objects.create(
+            email='othercontextuser@gmail.com',
+            username='otherContextUsername',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        address = Address.objects.create(
+            costumer=other,
+            province="Tehran",
+            city="Tehran",
+            street="2nd Golbarg",
+            house_number=6,
+            full_address="2nd Golbarg, Narenjestan Blvd."
+        )
+
+        response = self.client.post(reverse('submit_basket-list'), {'address_id': address.id})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
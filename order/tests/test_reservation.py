@@ -0,0 +1,120 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection
+from django.test import TransactionTestCase, RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from authentication.models import User, SellerProfile
+from config.settings import redis_client_first_db
+from order.basket import BasketAndOrderRedisAdapter
+from order.reservation import StockReservation
+from products.models import Product, Category
+from products.snapshots import snapshot_cache
+
+
+class StockReservationTestCase(TransactionTestCase):
+    """
+    Test case for verifying that stock reservations never oversell, including under concurrency.
+    """
+
+    def setUp(self):
+        """
+        Creates a product with limited stock and a crowd of customers competing for it.
+        """
+        users = [
+            User(
+                email=f"reservation_user_{i}@gmail.com",
+                username=f"reservation_user_{i}",
+                password='!',
+                uuid=uuid.uuid4()
+            )
+            for i in range(200)
+        ]
+        self.users = User.objects.bulk_create(users)
+        self.seller = SellerProfile.objects.create(user=self.users[0])
+        self.category = Category.objects.create(name='reservation-category')
+        self.product = Product.objects.create(
+            name="Limited Product",
+            price=1000,
+            detail="only a few left",
+            category=self.category,
+            warehouse=50,
+            slug="limited-product",
+            seller=self.seller
+        )
+        self.reservation = StockReservation()
+        self.basket_url = reverse('basket-list')
+
+    def tearDown(self):
+        for user in self.users:
+            redis_client_first_db.delete(f"user:{user.id}")
+            redis_client_first_db.zrem(StockReservation.deadlines_key, user.id)
+
+    def add_to_basket(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        try:
+            response = client.post(self.basket_url, {"product_id": self.product.id, "quantity": 1})
+            return response.status_code
+        finally:
+            connection.close()
+
+    def get_basket(self, user, method='get'):
+        request = getattr(RequestFactory(), method)('/api/order/basket/')
+        request.user = user
+        return BasketAndOrderRedisAdapter(request=request, product=self.product.id, quantity=1)
+
+    def test_concurrent_basket_creates_never_oversell(self):
+        """
+        Test that 200 concurrent add-to-basket requests for 50 units reserve exactly 50.
+        """
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            statuses = list(executor.map(self.add_to_basket, self.users))
+
+        self.product.refresh_from_db()
+        self.assertEqual(statuses.count(status.HTTP_201_CREATED), 50)
+        self.assertEqual(statuses.count(status.HTTP_400_BAD_REQUEST), 150)
+        self.assertEqual(self.product.warehouse, 0)
+
+    def test_flushed_basket_returns_stock(self):
+        """
+        Test that flushing a basket puts its reserved quantity back into the warehouse.
+        """
+        basket = self.get_basket(self.users[0], method='post')
+        basket.add_to_basket()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.warehouse, 49)
+
+        basket.flush_basket()
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.warehouse, 50)
+        self.assertFalse(basket.check_if_basket_exists())
+
+    def test_expired_reservations_are_released(self):
+        """
+        Test that only baskets past their reservation deadline are released.
+        """
+        self.get_basket(self.users[0], method='post').add_to_basket()
+        self.get_basket(self.users[1], method='post').add_to_basket()
+
+        released = self.reservation.release_expired(now=time.time() + StockReservation.ttl + 1)
+
+        self.product.refresh_from_db()
+        self.assertEqual(released, 2)
+        self.assertEqual(self.product.warehouse, 50)
+        self.assertEqual(self.reservation.release_expired(), 0)
+
+    def test_failed_reservation_keeps_the_caches(self):
+        """
+        Test that a reservation the conditional update rejects does not invalidate the product's snapshot.
+        """
+        snapshot_cache.get(self.product.id)
+        Product.objects.filter(id=self.product.id).update(warehouse=0)
+        version = redis_client_first_db.get(snapshot_cache.version_key(self.product.id))
+
+        with self.assertRaisesMessage(ValueError, "Product not available in stock!"):
+            StockReservation.reserve(self.product.id, 1)
+
+        self.assertEqual(redis_client_first_db.get(snapshot_cache.version_key(self.product.id)), version)
@@ -2,19 +2,20 @@ from django.contrib.auth import get_user_model
 from django.http import HttpRequest
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from authentication.tokens import StatelessJWTAuthentication
 from authentication.models import Address
 from authentication.permissions import IsOwner
 from rest_framework.viewsets import ViewSet
 from rest_framework.decorators import action
 from order.basket import BasketAndOrderRedisAdapter
+from order.discounts import TooManyAttempts
 
 class BasketViewSet(ViewSet):
     """
     A viewset for managing basket operations including listing, adding, updating,
     and deleting items in the basket, as well as applying discount codes.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsOwner]
     user_model = get_user_model()
 
@@ -104,8 +105,10 @@ class BasketViewSet(ViewSet):
         try:
             basket.apply_discount(code=code)
             return Response({"message": "Discount successfully applied!"})
-        except ValueError:
-            return Response({"message": "You have already used this code."})
+        except TooManyAttempts as e:
+            return Response({"message": str(e)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        except ValueError as e:
+            return Response({"message": str(e)})
         except RuntimeError:
             return Response({"message": "Invalid code!"})
 
@@ -125,7 +128,7 @@ class BasketSubmitViewSet(ViewSet):
     """
     A viewset to manage the submission of baskets with user address handling.
     """
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsOwner]
 
     def list(self, request, *args, **kwargs):
@@ -147,12 +150,13 @@ class BasketSubmitViewSet(ViewSet):
         """
         address_id = request.POST.get("address_id")
         try:
-            address = Address.objects.get(id=int(address_id))
+            if int(address_id) not in request.context.addresses():
+                if Address.objects.filter(id=int(address_id)).exists():
+                    return Response({"message": "You are not the address owner!"}, status=status.HTTP_403_FORBIDDEN)
+                return Response({"message": "Address does not exist!"}, status=status.HTTP_404_NOT_FOUND)
             basket = BasketAndOrderRedisAdapter(request=request, address=str(address_id))
-            if request.user.id == address.costumer.id:
-                basket.add_or_update_address()
-                return Response({"message": "Address added successfully."}, status=status.HTTP_201_CREATED)
-            return Response({"message": "You are not the address owner!"}, status=status.HTTP_403_FORBIDDEN)
+            basket.add_or_update_address()
+            return Response({"message": "Address added successfully."}, status=status.HTTP_201_CREATED)
         except Exception as e:
             return Response({"message": str(e)}, status=status.HTTP_404_NOT_FOUND)
 
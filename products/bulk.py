@@ -0,0 +1,239 @@
+import csv
+import io
+import json
+import uuid
+from collections import Counter
+from itertools import islice
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+from slugify import slugify
+from core.cache import response_cache
+from .facets import facet_cache, facet_values
+from .models import Category, CategoryProductCounter, Product
+
+FORMATS = ('csv', 'jsonl')
+EXPORT_FIELDS = ('id', 'name', 'slug', 'price', 'effective_price', 'detail', 'category', 'warehouse')
+CONTENT_TYPES = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+# Room left in Product.slug for the name once "-<uuid4>" is appended.
+SLUG_BASE_LENGTH = Product._meta.get_field('slug').max_length - 37
+
+
+class ProductImportRowSerializer(serializers.Serializer):
+    """
+    Validates one row of a product import.
+
+    The category is checked against the database per chunk by ProductImporter,
+    not per row, so validating a row runs no query.
+    """
+    name = serializers.CharField(max_length=250)
+    price = serializers.IntegerField(min_value=0)
+    detail = serializers.CharField(max_length=250)
+    category = serializers.IntegerField()
+    warehouse = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+    slug = serializers.CharField(max_length=200, required=False, allow_blank=True)
+
+
+def detect_format(filename, requested=None):
+    """
+    Returns the import format, as requested or from the file extension.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    file_format = (requested or filename.rsplit('.', 1)[-1]).lower()
+    if file_format == 'ndjson':
+        file_format = 'jsonl'
+    if file_format not in FORMATS:
+        raise ValueError(f"Format must be in {list(FORMATS)}")
+    return file_format
+
+
+def read_rows(stream, file_format):
+    """
+    Lazily parses rows of a CSV or JSON lines text stream.
+
+    Blank CSV cells are left out, so optional columns can be empty.
+
+    Args:
+        stream (io.TextIOBase): The text to parse.
+        file_format (str): ``csv`` or ``jsonl``.
+
+    Yields:
+        tuple: The row number and the row as a dict, or None if it cannot be parsed.
+    """
+    if file_format == 'csv':
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            yield number, {key: value for key, value in row.items() if key and value not in ('', None)}
+        return
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row if isinstance(row, dict) else None
+
+
+class ProductImporter:
+    """
+    Creates products of a seller from a stream of rows in chunks.
+
+    Each chunk is validated with one serializer instance, whose fields are built
+    once instead of per row, checked against the existing categories with one
+    query and inserted with a single ``bulk_create`` in its own transaction, so
+    an import of any size keeps one chunk in memory. Invalid rows are skipped
+    and counted; only the first ``max_errors`` are reported with their row
+    number, so the report stays small however many rows are rejected. Since ``bulk_create`` bypasses
+    ``Product.save()`` and its signals, slugs and effective prices are set here
+    and category counters, facet counts and cached listings are updated once
+    per chunk.
+
+    Attributes:
+        seller: The seller the products are created for.
+        batch_size: Rows validated and inserted per chunk.
+        max_errors: Rejected rows listed in the report.
+    """
+
+    def __init__(self, seller, batch_size=None, max_errors=None):
+        self.seller = seller
+        self.batch_size = batch_size or settings.PRODUCT_IMPORT_BATCH_SIZE
+        self.max_errors = settings.PRODUCT_IMPORT_MAX_ERRORS if max_errors is None else max_errors
+        self.serializer = ProductImportRowSerializer()
+
+    def run(self, rows):
+        """
+        Imports every row.
+
+        Args:
+            rows (iterable): ``(row number, row)`` pairs, as yielded by read_rows().
+
+        Returns:
+            dict: The number of created and rejected products, the errors of the
+            first ``max_errors`` rejected rows and whether more were left out.
+        """
+        report = {'created': 0, 'rejected': 0, 'errors': [], 'errors_truncated': False}
+        categories = set()
+        rows = iter(rows)
+        while chunk := list(islice(rows, self.batch_size)):
+            products = self.validate(chunk, report)
+            if products:
+                self.insert(products)
+                report['created'] += len(products)
+                categories.update(product.category_id for product in products)
+        if categories:
+            response_cache.invalidate('products', *(f"category:{category_id}" for category_id in categories))
+        return report
+
+    def validate(self, chunk, report):
+        """
+        Validates a chunk of rows and builds the products of the valid ones.
+
+        Args:
+            chunk (list): ``(row number, row)`` pairs.
+            report (dict): The import report rejected rows are recorded in.
+
+        Returns:
+            list: Unsaved products.
+        """
+        valid = []
+        for number, row in chunk:
+            if row is None:
+                self.reject(report, number, {'non_field_errors': ['Row could not be parsed.']})
+                continue
+            try:
+                valid.append((number, self.serializer.run_validation(row)))
+            except serializers.ValidationError as error:
+                self.reject(report, number, error.detail)
+
+        category_ids = set(Category.objects.filter(
+            id__in={data['category'] for _, data in valid}
+        ).values_list('id', flat=True))
+        products = []
+        for number, data in valid:
+            if data['category'] not in category_ids:
+                self.reject(report, number, {'category': ['Category does not exist.']})
+                continue
+            products.append(self.build(data))
+        return products
+
+    def reject(self, report, number, errors):
+        """
+        Counts a rejected row, listing its errors while fewer than ``max_errors`` are listed.
+
+        Args:
+            report (dict): The import report.
+            number (int): The number of the rejected row.
+            errors (dict): The errors of the row.
+        """
+        report['rejected'] += 1
+        if len(report['errors']) < self.max_errors:
+            report['errors'].append({'row': number, 'errors': errors})
+        else:
+            report['errors_truncated'] = True
+
+    def build(self, data):
+        return Product(
+            name=data['name'],
+            price=data['price'],
+            effective_price=data['price'],
+            detail=data['detail'],
+            category_id=data['category'],
+            warehouse=data.get('warehouse'),
+            slug=f"{slugify(data.get('slug') or data['name'], max_length=SLUG_BASE_LENGTH)}-{uuid.uuid4()}",
+            seller=self.seller
+        )
+
+    def insert(self, products):
+        with transaction.atomic():
+            Product.objects.bulk_create(products, batch_size=self.batch_size)
+            if settings.CATEGORY_PRODUCT_COUNTER_ENABLED:
+                for category_id, count in Counter(product.category_id for product in products).items():
+                    CategoryProductCounter.add(category_id, count)
+        facet_cache.add_many(
+            facet_values(product.category_id, product.seller_id, product.effective_price) for product in products
+        )
+
+
+class Echo:
+    """
+    File-like object handing back what is written to it, so csv.writer can format single lines.
+    """
+
+    def write(self, value):
+        return value
+
+
+def render_products(queryset, file_format, chunk_size=2000):
+    """
+    Renders products as CSV or JSON lines without loading them into memory.
+
+    Rows are read through a server-side cursor in chunks and formatted one at a
+    time, so the output can be streamed to a response or a file.
+
+    Args:
+        queryset (QuerySet): The products to export.
+        file_format (str): ``csv`` or ``jsonl``.
+        chunk_size (int): Rows fetched from the database at a time.
+
+    Yields:
+        str: The header, if any, and then one line per product.
+    """
+    rows = queryset.order_by('id').values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    if file_format == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            yield writer.writerow(row)
+        return
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row))) + '\n'
+
+
+def open_text(file):
+    """
+    Returns:
+        io.TextIOWrapper: A text stream over an uploaded or opened binary file.
+    """
+    return io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
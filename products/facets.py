@@ -0,0 +1,221 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, CharField, Q, Value, When
+from config.settings import redis_client_first_db
+from .models import Product
+
+FACETS = ('category', 'seller', 'price')
+
+
+def price_buckets(bounds=None):
+    """
+    Splits prices into half-open buckets at the configured bounds.
+
+    Bucket labels use the syntax of the ``price`` filter, e.g. ``100-500``, and
+    the last one is open ended, e.g. ``10000``.
+
+    Args:
+        bounds (iterable): Ascending bucket bounds, PRODUCT_PRICE_FACET_BOUNDS by default.
+
+    Returns:
+        list: ``(label, lower, upper)`` tuples, with None as the upper bound of the last bucket.
+    """
+    bounds = [0, *(bounds or settings.PRODUCT_PRICE_FACET_BOUNDS)]
+    buckets = [(f"{lower}-{upper}", lower, upper) for lower, upper in zip(bounds, bounds[1:])]
+    buckets.append((f"{bounds[-1]}", bounds[-1], None))
+    return buckets
+
+
+def price_bucket(price):
+    """
+    Returns:
+        str: The label of the bucket a price falls into.
+    """
+    for label, lower, upper in price_buckets():
+        if upper is None or price < upper:
+            return label
+
+
+def facet_values(category_id, seller_id, price):
+    """
+    Returns the facet values of a live product.
+
+    Returns:
+        dict: The category ID, seller ID and price bucket keyed by facet.
+    """
+    return {'category': category_id, 'seller': seller_id, 'price': price_bucket(price)}
+
+
+def format_facets(counts):
+    """
+    Orders facet counts for a response, by bucket for prices and by count for the other facets.
+
+    Args:
+        counts (dict): Counts keyed by facet and value.
+
+    Returns:
+        dict: Lists of ``{'value': ..., 'count': ...}`` keyed by facet.
+    """
+    labels = [label for label, _, _ in price_buckets()]
+    facets = {}
+    for facet in FACETS:
+        values = [(value, count) for value, count in counts.get(facet, {}).items() if count > 0]
+        if facet == 'price':
+            values.sort(key=lambda item: labels.index(item[0]) if item[0] in labels else len(labels))
+        else:
+            values.sort(key=lambda item: (-item[1], item[0]))
+        facets[facet] = [{'value': value, 'count': count} for value, count in values]
+    return facets
+
+
+def count_facets(queryset):
+    """
+    Counts products per category, seller and price bucket with a single grouped query.
+
+    The filtered products are grouped by ``GROUPING SETS``, so every facet is
+    counted in the same scan instead of one COUNT query per facet value.
+
+    Args:
+        queryset (QuerySet): The filtered products.
+
+    Returns:
+        dict: Counts keyed by facet and value.
+    """
+    buckets = [
+        When(Q(effective_price__gte=lower) & (Q(effective_price__lt=upper) if upper is not None else Q()),
+             then=Value(label))
+        for label, lower, upper in price_buckets()
+    ]
+    rows = queryset.order_by().annotate(
+        price_bucket=Case(*buckets, output_field=CharField())
+    ).values('category_id', 'seller_id', 'price_bucket')
+    sql, params = rows.query.sql_with_params()
+
+    counts = {facet: {} for facet in FACETS}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT GROUPING(category_id, seller_id, price_bucket), category_id, seller_id, price_bucket, COUNT(*) "
+            f"FROM ({sql}) AS facet_rows "
+            "GROUP BY GROUPING SETS ((category_id), (seller_id), (price_bucket))",
+            params
+        )
+        for grouping, category_id, seller_id, bucket, count in cursor.fetchall():
+            if grouping == 0b011:
+                counts['category'][category_id] = count
+            elif grouping == 0b101:
+                counts['seller'][seller_id] = count
+            elif bucket is not None:
+                counts['price'][bucket] = count
+    return counts
+
+
+class FacetCache:
+    """
+    Redis hash of the facet counts of the whole catalog, kept current incrementally.
+
+    Product and discount signals move a product between facet values with
+    HINCRBY as it is created, moved, repriced, soft-deleted, restored or deleted,
+    so the unfiltered catalog is faceted without touching the database. The
+    adjustments only apply while the hash exists; a missing hash is rebuilt
+    from the database on the next read or by rebuild_product_facets.
+
+    Attributes:
+        key: The Redis hash holding ``<facet>:<value>`` counters.
+    """
+    __client = redis_client_first_db
+    key = "product:facets"
+
+    ADJUST_SCRIPT = """
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return 0
+    end
+    for i = 1, #ARGV, 2 do
+        if redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1]) <= 0 then
+            redis.call('HDEL', KEYS[1], ARGV[i])
+        end
+    end
+    return 1
+    """
+
+    def __init__(self):
+        self.__adjust = self.__class__.__client.register_script(self.ADJUST_SCRIPT)
+
+    @property
+    def enabled(self):
+        return settings.PRODUCT_FACET_CACHE_ENABLED
+
+    def get(self):
+        """
+        Returns the cached counts of the catalog, rebuilding them on a miss.
+
+        Returns:
+            dict: Counts keyed by facet and value.
+        """
+        stored = self.__class__.__client.hgetall(self.key)
+        if not stored:
+            return self.rebuild()
+        counts = {facet: {} for facet in FACETS}
+        for field, count in stored.items():
+            facet, _, value = field.decode('utf-8').partition(':')
+            if facet in counts:
+                counts[facet][int(value) if facet != 'price' else value] = int(count)
+        return counts
+
+    def rebuild(self):
+        """
+        Recounts the catalog and atomically replaces the cached counts.
+
+        Returns:
+            dict: Counts keyed by facet and value.
+        """
+        counts = count_facets(Product.objects.all())
+        mapping = {f"{facet}:{value}": count for facet in FACETS for value, count in counts[facet].items()}
+        pipeline = self.__class__.__client.pipeline()
+        pipeline.delete(self.key)
+        if mapping:
+            pipeline.hset(self.key, mapping=mapping)
+        pipeline.execute()
+        return counts
+
+    def move(self, before, after):
+        """
+        Moves a product between facet values.
+
+        Args:
+            before (dict|None): The facet values the product was counted under, or None.
+            after (dict|None): The facet values the product is counted under now, or None.
+        """
+        self.adjust([(before, -1), (after, 1)])
+
+    def add_many(self, products):
+        """
+        Counts several new products with a single script call.
+
+        Args:
+            products (iterable): The facet values of each product.
+        """
+        self.adjust((values, 1) for values in products)
+
+    def adjust(self, changes):
+        """
+        Applies the net change of several facet value moves.
+
+        Args:
+            changes (iterable): ``(facet values, delta)`` pairs; None values are skipped.
+        """
+        if not self.enabled:
+            return
+        deltas = {}
+        for values, delta in changes:
+            for facet, value in (values or {}).items():
+                field = f"{facet}:{value}"
+                deltas[field] = deltas.get(field, 0) + delta
+        args = [item for field, delta in deltas.items() if delta for item in (field, delta)]
+        if args:
+            self.__adjust(keys=[self.key], args=args)
+
+    def clear(self):
+        self.__class__.__client.delete(self.key)
+
+
+facet_cache = FacetCache()
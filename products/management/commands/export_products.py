@@ -0,0 +1,26 @@
+import sys
+from django.core.management.base import BaseCommand
+from products.bulk import render_products
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = "Streams live products as CSV or JSON lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seller', type=int, help="Only export the products of this seller profile.")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], default='csv', help="Output format.")
+        parser.add_argument('--output', default='-', help="File to write, standard output by default.")
+
+    def handle(self, *args, **options):
+        queryset = Product.objects.all()
+        if options['seller']:
+            queryset = queryset.filter(seller_id=options['seller'])
+
+        stream = sys.stdout if options['output'] == '-' else open(options['output'], 'w', encoding='utf-8', newline='')
+        try:
+            for line in render_products(queryset, options['format']):
+                stream.write(line)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from authentication.models import SellerProfile
+from products.bulk import ProductImporter, detect_format, read_rows
+
+
+class Command(BaseCommand):
+    help = "Creates a seller's products from a CSV or JSON lines file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="The file to import.")
+        parser.add_argument('--seller', type=int, required=True, help="ID of the seller profile owning the products.")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="File format, detected from the extension by default.")
+        parser.add_argument('--batch-size', type=int, help="Rows validated and inserted per transaction.")
+        parser.add_argument('--max-errors', type=int, help="Rejected rows listed in the output.")
+
+    def handle(self, *args, **options):
+        seller = SellerProfile.objects.filter(id=options['seller']).first()
+        if seller is None:
+            raise CommandError(f"Seller profile {options['seller']} does not exist.")
+        try:
+            file_format = detect_format(options['path'], options['format'])
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+            report = ProductImporter(
+                seller, batch_size=options['batch_size'], max_errors=options['max_errors']
+            ).run(read_rows(stream, file_format))
+
+        for error in report['errors']:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if report['errors_truncated']:
+            self.stderr.write(f"Only the first {len(report['errors'])} rejected rows are listed.")
+        self.stdout.write(f"Created {report['created']} product(s), rejected {report['rejected']} row(s).")
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from products.snapshots import snapshot_cache
+
+
+class Command(BaseCommand):
+    help = "Shows hit and miss counters of the product snapshot cache."
+
+    def handle(self, *args, **options):
+        stats = snapshot_cache.stats()
+        lookups = sum(stats.values())
+        for key, value in stats.items():
+            self.stdout.write(f"{key}: {value}")
+        if lookups:
+            hit_ratio = (stats['local_hits'] + stats['redis_hits']) / lookups
+            self.stdout.write(f"hit_ratio: {hit_ratio:.2%}")
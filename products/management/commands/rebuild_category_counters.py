@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from products.models import CategoryProductCounter
+
+
+class Command(BaseCommand):
+    help = "Recomputes the cached number of live products of every category."
+
+    def handle(self, *args, **options):
+        counted = CategoryProductCounter.rebuild()
+        self.stdout.write(f"Counted products of {counted} category(ies).")
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from products.models import Category
+
+
+class Command(BaseCommand):
+    help = "Recomputes the materialized path and depth of every category from its parent."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Categories written per UPDATE batch.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            changed = Category.rebuild_tree(batch_size=options['batch_size'])
+        self.stdout.write(f"Rebuilt the path of {changed} category(ies).")
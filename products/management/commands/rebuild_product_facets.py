@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from products.facets import facet_cache
+
+
+class Command(BaseCommand):
+    help = "Recomputes the cached facet counts of the product catalog."
+
+    def handle(self, *args, **options):
+        counts = facet_cache.rebuild()
+        self.stdout.write(f"Counted {sum(counts['category'].values())} product(s) into facets.")
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = "Recomputes the stored effective price of every product from its price and discounts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Products processed per transaction.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = 0
+        updated = 0
+        while True:
+            products = list(
+                Product.everything.filter(id__gt=last_id)
+                .order_by('id')
+                .only('id', 'price', 'effective_price')
+                .prefetch_related('product_discount')[:batch_size]
+            )
+            if not products:
+                break
+            last_id = products[-1].id
+
+            now = timezone.now()
+            changed = []
+            for product in products:
+                effective_price = product.get_discounted_price()
+                if effective_price != product.effective_price:
+                    product.effective_price = effective_price
+                    product.updated_at = now
+                    changed.append(product)
+            with transaction.atomic():
+                Product.everything.bulk_update(changed, ['effective_price', 'updated_at'])
+            updated += len(changed)
+
+        self.stdout.write(f"Updated the effective price of {updated} product(s).")
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Count, Q
+from django.db.models.functions import Coalesce
+
+
+class CategoryQuerySet(models.QuerySet):
+    def with_details(self):
+        """
+        Returns categories with their parent joined and their live product count
+        annotated as ``product_amount``, so serializing any number of them costs
+        one query. The count is read from CategoryProductCounter when
+        CATEGORY_PRODUCT_COUNTER_ENABLED is set and aggregated otherwise.
+        """
+        queryset = self.select_related('parent')
+        if settings.CATEGORY_PRODUCT_COUNTER_ENABLED:
+            return queryset.annotate(product_amount=Coalesce('product_counter__product_count', 0))
+        return queryset.annotate(
+            product_amount=Count('product_category', filter=Q(product_category__is_deleted=False))
+        )
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:08
+
+from django.db import migrations, models
+from django.db.models import F
+
+from products.pricing import calculate_effective_price
+
+
+def populate_effective_price(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    Discount = apps.get_model('products', 'Discount')
+    Product._base_manager.update(effective_price=F('price'))
+    discounted = {}
+    for discount in Discount.objects.order_by('id'):
+        discounted.setdefault(discount.product_id, []).append((discount.type_of_discount, discount.discount))
+    for product in Product._base_manager.filter(id__in=discounted):
+        product.effective_price = calculate_effective_price(product.price, discounted[product.id])
+        product.save(update_fields=['effective_price'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_delete_discountcode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='effective_price',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_effective_price, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_category_path'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryProductCounter',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='product_counter', serialize=False, to='products.category')),
+                ('product_count', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:40
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Builds the listing indexes, partial over live products, without locking writes.
+    """
+    atomic = False
+
+    dependencies = [
+        ('products', '0009_product_search'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['effective_price', 'id'], name='product_live_price_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['created_at', 'id'], name='product_live_created_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['category', 'id'], name='product_live_cat_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['category', 'effective_price', 'id'], name='product_live_cat_price_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['category', 'created_at', 'id'], name='product_live_cat_created_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:30
+
+from django.db import migrations, models
+from django.db.models import F
+
+from core.archive import create_archive_sql, drop_archive_sql
+
+ARCHIVED_TABLES = (
+    ('products_product', True, ()),
+    ('products_discount', False, ('product_id',)),
+    ('products_image', False, ('product_id',)),
+)
+
+
+def backfill_deleted_at(apps, schema_editor):
+    for model_name in ('Product', 'Image'):
+        model = apps.get_model('products', model_name)
+        model._base_manager.filter(is_deleted=True, deleted_at=None).update(deleted_at=F('updated_at'))
+
+
+def create_archive_tables(apps, schema_editor):
+    for table, deleted_only, index_columns in ARCHIVED_TABLES:
+        for sql in create_archive_sql(table, deleted_only, index_columns):
+            schema_editor.execute(sql)
+
+
+def drop_archive_tables(apps, schema_editor):
+    for table, _, _ in ARCHIVED_TABLES:
+        for sql in drop_archive_sql(table):
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0010_live_product_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_deleted_at, migrations.RunPython.noop),
+        migrations.RunPython(create_archive_tables, drop_archive_tables),
+    ]
@@ -3,13 +3,26 @@ import uuid
 from django.contrib.auth import get_user_model
 
 from authentication.models import SellerProfile, User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import FileExtensionValidator
-from django.db import models
-from core.models import TimeStampMixin, SoftDelete
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat, Substr
+from django.utils import timezone
+from core.archive import SoftDeleteArchive
+from core.models import TimeStampMixin, SoftDelete, TrackChangesMixin
 from slugify import slugify
+from .managers import CategoryQuerySet
+from .pricing import calculate_effective_price
+from .search import product_search_vector
+from .tree import PATH_SEPARATOR, compute_paths, make_path, path_ids
 user = get_user_model()
 
-class Product(TimeStampMixin, SoftDelete):
+LIVE = Q(is_deleted=False)
+
+class Product(TrackChangesMixin, TimeStampMixin, SoftDelete):
     """
     Product model for save products.
     Attributes:
@@ -19,6 +32,16 @@ class Product(TimeStampMixin, SoftDelete):
         category (ForeignKey): Foreign key to Category model.
         warehouse (PositiveIntegerField): Product warehouse number.
         slug (SlugField): Product slug.
+        effective_price (FloatField): Price after discounts, kept current on
+            price and Discount changes so listings can filter and sort by it in SQL.
+        search_vector (GeneratedField): Weighted full-text document over name and
+            detail, maintained by the database and GIN indexed. A trigram index on
+            name is created by migration where pg_trgm is available.
+
+    The listing indexes are partial over live products, matching the
+    ``is_deleted = false`` condition every query through ``objects`` carries,
+    so soft-deleted rows take no space in them. The search index skips the GIN
+    pending list, so searches never scan unmerged entries.
     """
     name = models.CharField(max_length=250)
     price = models.PositiveIntegerField()
@@ -27,24 +50,28 @@ class Product(TimeStampMixin, SoftDelete):
     warehouse = models.PositiveIntegerField(null=True, blank=True)
     slug = models.SlugField(unique=True, max_length=250)
     seller = models.ForeignKey(SellerProfile, on_delete=models.PROTECT, related_name='seller_product')
+    effective_price = models.FloatField(default=0, editable=False)
+    search_vector = models.GeneratedField(
+        expression=product_search_vector(),
+        output_field=SearchVectorField(),
+        db_persist=True
+    )
 
     expired_at = None
 
     def get_discounted_price(self):
-        discounts = self.product_discount.all()
-        discounted_price = self.price
+        """
+        Computes the discounted price from the product's discount rows.
 
-        for discount in discounts:
-            if discount.type_of_discount == 'percentage':
-                discounted_price = self.price - (self.price * (discount.discount / 100))
-            else:
-                discounted_price -= discount.discount
-
-        return discounted_price
+        Returns:
+            float: The price after applying every discount of the product.
+        """
+        discounts = [(discount.type_of_discount, discount.discount) for discount in self.product_discount.all()]
+        return calculate_effective_price(self.price, discounts)
 
     @property
     def discounted_price(self):
-        return self.get_discounted_price()
+        return self.effective_price
 
     def __str__(self):
         return f'{self.name}'
@@ -52,8 +79,25 @@ class Product(TimeStampMixin, SoftDelete):
     def save(self, *args, **kwargs):
         text = f"{self.slug}{uuid.uuid4()}"
         self.slug = slugify(text)
+        if self.pk is None:
+            self.effective_price = self.price
+        elif self.has_changed('price'):
+            self.effective_price = self.get_discounted_price()
         super(Product, self).save(*args, **kwargs)
 
+    def refresh_effective_price(self):
+        """
+        Recomputes the stored effective price after the product's discounts changed.
+
+        The column is written with a single UPDATE that also bumps ``updated_at``,
+        so signals tied to a full save are not triggered.
+        """
+        self.effective_price = self.get_discounted_price()
+        self.updated_at = timezone.now()
+        Product.everything.filter(pk=self.pk).update(
+            effective_price=self.effective_price, updated_at=self.updated_at
+        )
+
     @property
     def discount_amount(self):
         for discount in self.product_discount.all():
@@ -62,6 +106,16 @@ class Product(TimeStampMixin, SoftDelete):
 
     class Meta:
         ordering = ('price',)
+        indexes = [
+            models.Index(fields=['effective_price', 'id'], name='product_live_price_id_idx', condition=LIVE),
+            models.Index(fields=['created_at', 'id'], name='product_live_created_id_idx', condition=LIVE),
+            models.Index(fields=['category', 'id'], name='product_live_cat_id_idx', condition=LIVE),
+            models.Index(fields=['category', 'effective_price', 'id'], name='product_live_cat_price_idx',
+                         condition=LIVE),
+            models.Index(fields=['category', 'created_at', 'id'], name='product_live_cat_created_idx',
+                         condition=LIVE),
+            GinIndex(fields=['search_vector'], name='product_search_gin_idx', fastupdate=False),
+        ]
 
 
 class Category(TimeStampMixin):
@@ -70,19 +124,191 @@ class Category(TimeStampMixin):
     Attributes:
         name (CharField): Category name.
         parent (ForeignKey): Foreign key to Category model.
+        path (CharField): Materialized path of IDs from the root, e.g. ``/1/5/12/``.
+        depth (PositiveIntegerField): Number of ancestors of the category.
         expired_at (DateTimeField): Timestamp for expiration.
+
+    The path is kept current on save: a moved category rewrites the paths of
+    its whole subtree with one UPDATE, so subtree and ancestor lookups are
+    single indexed queries instead of a walk with one query per level.
     """
     name = models.CharField(max_length=250)
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name="child")
+    path = models.CharField(max_length=255, default='', editable=False)
+    depth = models.PositiveIntegerField(default=0, editable=False)
     expired_at = None
 
+    objects = CategoryQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['path'], name='category_path_idx', opclasses=['varchar_pattern_ops']),
+        ]
+
     def get_all_parents(self):
         return Category.objects.filter(parent_id=None)
 
+    def get_descendants(self, include_self=False):
+        """
+        Returns every category below this one with a single indexed prefix query.
+
+        Args:
+            include_self (bool): Whether to include the category itself.
+
+        Returns:
+            QuerySet: The categories of the subtree, parents before their children.
+
+        Raises:
+            ValidationError: If the category has no path yet, e.g. after a bulk_create.
+        """
+        if not self.path:
+            raise ValidationError("The category has no path; run rebuild_category_tree.")
+        queryset = Category.objects.filter(path__startswith=self.path).order_by('path')
+        if not include_self:
+            queryset = queryset.exclude(id=self.id)
+        return queryset
+
+    def get_ancestors(self, include_self=False):
+        """
+        Returns the chain of categories above this one, root first, with a single query.
+
+        Args:
+            include_self (bool): Whether to include the category itself.
+
+        Returns:
+            QuerySet: The ancestor categories ordered by depth.
+        """
+        ids = path_ids(self.path)
+        if not include_self:
+            ids = ids[:-1]
+        return Category.objects.filter(id__in=ids).order_by('depth')
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the category and keeps the materialized paths of it and its subtree current.
+
+        The category and its parent are locked and their paths read from the
+        database, so an instance loaded before an ancestor moved still rewrites
+        the subtree from its current path.
+
+        Raises:
+            ValidationError: If the category is moved below itself or its parent has no path yet.
+        """
+        with transaction.atomic():
+            locked = {
+                category_id: (path, depth)
+                for category_id, path, depth in Category.objects.select_for_update().filter(
+                    pk__in=[pk for pk in (self.pk, self.parent_id) if pk is not None]
+                ).order_by('pk').values_list('id', 'path', 'depth')
+            }
+            if self.pk in locked:
+                self.path, self.depth = locked[self.pk]
+            if self.parent_id and self.parent_id not in locked:
+                raise Category.DoesNotExist("The parent category does not exist.")
+            parent_path = locked[self.parent_id][0] if self.parent_id else PATH_SEPARATOR
+            if not parent_path:
+                raise ValidationError("The parent category has no path; run rebuild_category_tree.")
+            if self.pk is not None and self.path and parent_path.startswith(self.path):
+                raise ValidationError("A category cannot be moved below itself.")
+            super().save(*args, **kwargs)
+
+            path = make_path(parent_path, self.pk)
+            if path == self.path:
+                return
+            old_path, depth = self.path, len(path_ids(path)) - 1
+            Category.objects.filter(pk=self.pk).update(path=path, depth=depth)
+            if old_path:
+                Category.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                    path=Concat(Value(path), Substr('path', len(old_path) + 1)),
+                    depth=F('depth') + (depth - self.depth)
+                )
+            self.path, self.depth = path, depth
+
+    @classmethod
+    def rebuild_tree(cls, batch_size=1000):
+        """
+        Recomputes the path and depth of every category from the parent links.
+
+        Args:
+            batch_size (int): Rows written per UPDATE batch.
+
+        Returns:
+            int: The number of categories whose path changed.
+        """
+        rows = list(cls.objects.values_list('id', 'parent_id', 'path', 'depth'))
+        paths = compute_paths({category_id: parent_id for category_id, parent_id, _, _ in rows})
+        changed = [
+            cls(id=category_id, path=paths[category_id][0], depth=paths[category_id][1])
+            for category_id, _, path, depth in rows
+            if category_id in paths and paths[category_id] != (path, depth)
+        ]
+        cls.objects.bulk_update(changed, ['path', 'depth'], batch_size=batch_size)
+        return len(changed)
+
     def __str__(self):
         return f"{self.name}"
 
 
+class CategoryProductCounter(models.Model):
+    """
+    Cached number of live products per category.
+
+    Kept current by product signals as products are created, moved, soft-deleted,
+    restored and deleted, so category pages can show product counts without
+    aggregating the product table. Used when CATEGORY_PRODUCT_COUNTER_ENABLED is
+    set; rebuild_category_counters recomputes it after bulk writes.
+
+    -----fields-----
+        category = models.OneToOneField(Category, on_delete=models.CASCADE, primary_key=True)
+        product_count = models.IntegerField(default=0)
+    """
+    category = models.OneToOneField(Category, on_delete=models.CASCADE, primary_key=True,
+                                    related_name='product_counter')
+    product_count = models.IntegerField(default=0)
+
+    @classmethod
+    def add(cls, category_id, delta):
+        """
+        Adds to the counter of a category, initializing it from the product table if it is missing.
+
+        Args:
+            category_id (int): The ID of the category.
+            delta (int): The change in live products.
+        """
+        if category_id is None or not delta:
+            return
+        if cls.objects.filter(category_id=category_id).update(product_count=F('product_count') + delta):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    category_id=category_id,
+                    product_count=Product.objects.filter(category_id=category_id).count()
+                )
+        except IntegrityError:
+            cls.objects.filter(category_id=category_id).update(product_count=F('product_count') + delta)
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Recomputes every counter from the product table.
+
+        Returns:
+            int: The number of categories counted.
+        """
+        counts = dict(
+            Product.objects.order_by().values_list('category_id').annotate(product_count=models.Count('id'))
+        )
+        counters = [
+            cls(category_id=category_id, product_count=counts.get(category_id, 0))
+            for category_id in Category.objects.values_list('id', flat=True)
+        ]
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(counters, batch_size=1000)
+        return len(counters)
+
+
 class Image(TimeStampMixin, SoftDelete):
     image = models.ImageField(
         validators=[
@@ -112,3 +338,6 @@ class Discount(TimeStampMixin):
     type_of_discount = models.CharField(choices=DISCOUNT_CHOICES, max_length=250, null=True, blank=True)
     discount = models.PositiveIntegerField(blank=True, null=True, unique=True)
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='product_discount')
+
+
+product_archive = SoftDeleteArchive(Product, dependents=[(Discount, 'product'), (Image, 'product')])
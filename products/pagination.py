@@ -0,0 +1,207 @@
+import base64
+import json
+from datetime import datetime
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F, Field, FloatField, Func, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class ProductCursorPagination(BasePagination):
+    """
+    Keyset pagination for product listings.
+
+    Pages are selected with a row comparison against the sort key of the last
+    row already seen, e.g. ``(effective_price, id) > (1200, 57)``, instead of an OFFSET,
+    so the database walks the matching composite index straight to the page and
+    deep pages cost the same as the first one. The ``id`` tie-breaker makes the
+    sort key unique, so rows sharing a price are neither skipped nor repeated.
+    Ordering by ``price`` sorts by the discounted price customers pay.
+
+    Attributes:
+        orderings: Sort keys for the supported ``order`` query parameter values.
+        default_order: Order used when the request does not specify one.
+        page_size: Default number of products per page.
+        max_page_size: Upper bound for the ``page_size`` query parameter.
+    """
+    cursor_query_param = 'cursor'
+    order_query_param = 'order'
+    page_size_query_param = 'page_size'
+    page_size = settings.PRODUCT_PAGE_SIZE
+    max_page_size = 100
+    orderings = {
+        'id': ('id',),
+        '-id': ('-id',),
+        'price': ('effective_price', 'id'),
+        '-price': ('-effective_price', '-id'),
+        'created_at': ('created_at', 'id'),
+        '-created_at': ('-created_at', '-id'),
+    }
+    default_order = 'price'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Returns one page of the queryset in the requested order.
+
+        Args:
+            queryset (QuerySet): The filtered products.
+            request (Request): The current request.
+            view (View): The view being paginated.
+
+        Returns:
+            list: The products on the page.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request)
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request, queryset.model)
+
+        reverse = bool(cursor and cursor['reverse'])
+        ordering = [self.invert(field) for field in self.ordering] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            queryset = queryset.filter(self.after(cursor['position'], ordering))
+
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        self.has_next = bool(results) and (reverse or has_more)
+        self.has_previous = bool(results) and (has_more if reverse else cursor is not None)
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_ordering(self, request):
+        """
+        Returns the sort key for the ``order`` query parameter.
+
+        Raises:
+            ValidationError: If the order is not supported.
+        """
+        order = request.query_params.get(self.order_query_param, self.default_order)
+        if order not in self.orderings:
+            raise ValidationError({'error': f'Order field must be in {list(self.orderings)}'})
+        return self.orderings[order]
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def after(position, ordering):
+        """
+        Builds the row comparison selecting the rows that follow a position.
+
+        Args:
+            position (list): The sort key values of the last row seen.
+            ordering (list): The sort key, all fields in the same direction.
+
+        Returns:
+            Lookup: A boolean expression usable in filter().
+        """
+        fields = [field.lstrip('-') for field in ordering]
+        lookup = LessThan if ordering[0].startswith('-') else GreaterThan
+        return lookup(
+            Func(*[F(field) for field in fields], function='ROW', output_field=Field()),
+            Func(*[Value(value) for value in position], function='ROW', output_field=Field())
+        )
+
+    def encode_cursor(self, instance, reverse):
+        position = [getattr(instance, field.lstrip('-')) for field in self.ordering]
+        position = [value.isoformat() if isinstance(value, datetime) else value for value in position]
+        payload = json.dumps({'p': position, 'r': int(reverse)})
+        cursor = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_cursor_field(self, model, name):
+        """
+        Returns the field used to parse the cursor value of a sort key column.
+        """
+        return model._meta.get_field(name)
+
+    def decode_cursor(self, request, model):
+        """
+        Parses the cursor query parameter.
+
+        Raises:
+            NotFound: If the cursor is malformed or does not match the requested order.
+
+        Returns:
+            dict|None: The position and direction, or None on the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            fields = [self.get_cursor_field(model, field.lstrip('-')) for field in self.ordering]
+            if len(payload['p']) != len(fields):
+                raise ValueError
+            position = [field.to_python(value) for field, value in zip(fields, payload['p'])]
+            return {'position': position, 'reverse': bool(payload['r'])}
+        except (TypeError, ValueError, KeyError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class ProductSearchPagination(ProductCursorPagination):
+    """
+    Keyset pagination for search results.
+
+    Results are ordered by relevance by default, ``(rank, id)`` descending, and
+    can also be sorted by any of the listing orders. The rank is an annotation
+    rather than a column, so its cursor value is parsed as a plain float.
+    """
+    orderings = {
+        'relevance': ('-rank', '-id'),
+        **ProductCursorPagination.orderings,
+    }
+    default_order = 'relevance'
+    annotation_fields = {'rank': FloatField()}
+
+    def get_cursor_field(self, model, name):
+        if name in self.annotation_fields:
+            return self.annotation_fields[name]
+        return super().get_cursor_field(model, name)
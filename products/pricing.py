@@ -0,0 +1,21 @@
+def calculate_effective_price(price, discounts):
+    """
+    Applies a product's discounts to its price.
+
+    A percentage discount is taken from the base price and replaces any earlier
+    discount, while cash discounts are subtracted from the running price.
+
+    Args:
+        price (int): The base price of the product.
+        discounts (iterable): (type_of_discount, discount) pairs of the product.
+
+    Returns:
+        float: The price the product is sold at.
+    """
+    effective_price = price
+    for type_of_discount, discount in discounts:
+        if type_of_discount == 'percentage':
+            effective_price = price - (price * ((discount or 0) / 100))
+        else:
+            effective_price -= discount or 0
+    return effective_price
@@ -0,0 +1,61 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'english'
+TRIGRAM_EXTENSION = 'pg_trgm'
+
+_trigram_installed = None
+
+
+def product_search_vector():
+    """
+    Returns the expression of the stored product search document: the name
+    weighted above the description.
+    """
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('detail', weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def trigram_installed():
+    """
+    Checks once per process whether the pg_trgm extension is installed.
+
+    Returns:
+        bool: True if trigram similarity can be used.
+    """
+    global _trigram_installed
+    if _trigram_installed is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = %s", [TRIGRAM_EXTENSION])
+            _trigram_installed = cursor.fetchone() is not None
+    return _trigram_installed
+
+
+def search_products(queryset, term):
+    """
+    Narrows a product queryset to the matches of a search term and annotates their relevance.
+
+    A product matches if its search document matches the term as a web search
+    query, or, when pg_trgm is installed, if its name is trigram-similar to the
+    term, which tolerates typos. Both conditions are served by GIN indexes.
+    The rank is cast to double precision so that the value a cursor carries
+    compares equal to the rank it was read from.
+
+    Args:
+        queryset (QuerySet): The products to search.
+        term (str): The search term.
+
+    Returns:
+        QuerySet: The matching products annotated with ``rank``.
+    """
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch')
+    condition = Q(search_vector=query)
+    rank = SearchRank(F('search_vector'), query)
+    if trigram_installed():
+        condition |= Q(name__trigram_similar=term)
+        rank = rank + TrigramSimilarity('name', Value(term))
+    return queryset.annotate(rank=Cast(rank, FloatField())).filter(condition)
@@ -43,8 +43,11 @@ class CategoryDetailActionSerializer(serializers.ModelSerializer):
             obj (Category): The category instance.
 
         Returns:
-            int: The count of products in the category.
+            int: The count of products in the category, read from the
+            ``product_amount`` annotation when the queryset provides it.
         """
+        if hasattr(obj, 'product_amount'):
+            return obj.product_amount
         return obj.product_category.count()
 
     def get_parent_name(self, obj):
@@ -57,7 +60,7 @@ class CategoryDetailActionSerializer(serializers.ModelSerializer):
         Returns:
             str or None: The name of the parent category, or None if no parent exists.
         """
-        if obj.parent:
+        if obj.parent_id:
             return obj.parent.name  # Return name of the parent if it exists
         return None  # No parent, so return None
 
@@ -77,7 +80,18 @@ class ProductListActionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Product
-        exclude = ('detail', 'category', 'slug', 'warehouse', 'seller')
+        exclude = ('detail', 'category', 'slug', 'warehouse', 'seller', 'effective_price', 'search_vector')
+
+
+class ProductSearchResultSerializer(ProductListActionSerializer):
+    """
+    Serializer for search results, adding the relevance of each product.
+
+    Attributes:
+        rank: A read-only field with the relevance of the product to the search term.
+    """
+
+    rank = serializers.FloatField(read_only=True)
 
 
 class ProductDetailActionSerializer(serializers.ModelSerializer):
@@ -97,7 +111,7 @@ class ProductDetailActionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Product
-        fields = '__all__'
+        exclude = ('effective_price', 'search_vector')
 
 
 class ProductCreateActionSerializer(serializers.ModelSerializer):
@@ -110,4 +124,4 @@ class ProductCreateActionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Product
-        fields = '__all__'
\ No newline at end of file
+        exclude = ('search_vector',)
\ No newline at end of file
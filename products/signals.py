@@ -0,0 +1,144 @@
+from functools import partial
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from config.settings import redis_client_first_db
+from core.cache import response_cache
+from .facets import facet_cache, facet_values
+from .models import Product, Category, CategoryProductCounter, Discount, Image
+from .snapshots import snapshot_cache
+
+PRICE_VERSION_KEY = "product:price_version"
+
+
+@receiver(post_save, sender=Product)
+def bump_price_version(sender, instance, created, **kwargs):
+    """
+    Bumps the product price version whenever an existing product's price changes,
+    so baskets know their maintained totals need reconciling. The bump waits for
+    the commit, so a basket cannot reconcile against the old price and record the
+    new version.
+    """
+    if not created and instance.has_changed('price'):
+        transaction.on_commit(partial(redis_client_first_db.incr, PRICE_VERSION_KEY))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_snapshot(sender, instance, **kwargs):
+    """
+    Invalidates the cached snapshot of a product whenever it is saved or deleted.
+
+    The version is bumped once the transaction commits; bumping it earlier lets a
+    concurrent read cache the uncommitted row's previous state under the new version.
+    """
+    transaction.on_commit(partial(snapshot_cache.invalidate, instance.id))
+
+
+@receiver(post_save, sender=Discount)
+@receiver(post_delete, sender=Discount)
+def refresh_effective_price(sender, instance, **kwargs):
+    """
+    Recomputes the effective price of a product whenever one of its discounts changes,
+    moving it to its new price bucket in the cached facet counts.
+    """
+    product = Product.everything.filter(pk=instance.product_id).first()
+    if product is not None:
+        previous_price = product.effective_price
+        product.refresh_effective_price()
+        if not product.is_deleted:
+            facet_cache.move(
+                facet_values(product.category_id, product.seller_id, previous_price),
+                facet_values(product.category_id, product.seller_id, product.effective_price)
+            )
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_responses(sender, instance, **kwargs):
+    """
+    Invalidates cached responses showing a product, including the listing of
+    the category it was moved out of.
+    """
+    tags = {f"product:{instance.id}", "products", f"category:{instance.category_id}"}
+    previous_category = getattr(instance, '_loaded_values', {}).get('category_id')
+    if previous_category is not None:
+        tags.add(f"category:{previous_category}")
+    transaction.on_commit(partial(response_cache.invalidate, *tags))
+
+
+@receiver(post_save, sender=Discount)
+@receiver(post_delete, sender=Discount)
+@receiver(post_save, sender=Image)
+@receiver(post_delete, sender=Image)
+def invalidate_product_detail_responses(sender, instance, **kwargs):
+    """
+    Invalidates cached responses of the product a discount or image belongs to.
+    """
+    transaction.on_commit(partial(response_cache.invalidate, f"product:{instance.product_id}", "products"))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_responses(sender, instance, **kwargs):
+    """
+    Invalidates cached category listings and the responses of the category itself.
+    """
+    transaction.on_commit(partial(response_cache.invalidate, "categories", f"category:{instance.id}"))
+
+
+@receiver(post_save, sender=Product)
+def update_category_product_counter(sender, instance, created, **kwargs):
+    """
+    Moves a product between category counters when it is created, moved,
+    soft-deleted or restored.
+    """
+    if not settings.CATEGORY_PRODUCT_COUNTER_ENABLED:
+        return
+    loaded_values = getattr(instance, '_loaded_values', {})
+    if not created and 'is_deleted' not in loaded_values:
+        return
+    before = None if created or loaded_values['is_deleted'] else loaded_values['category_id']
+    after = None if instance.is_deleted else instance.category_id
+    if before != after:
+        CategoryProductCounter.add(before, -1)
+        CategoryProductCounter.add(after, 1)
+
+
+@receiver(post_delete, sender=Product)
+def decrement_category_product_counter(sender, instance, **kwargs):
+    """
+    Removes a deleted product from its category counter.
+    """
+    if settings.CATEGORY_PRODUCT_COUNTER_ENABLED and not instance.is_deleted:
+        CategoryProductCounter.add(instance.category_id, -1)
+
+
+@receiver(post_save, sender=Product)
+def update_product_facets(sender, instance, created, **kwargs):
+    """
+    Moves a product between cached facet counts when it is created, moved,
+    repriced, soft-deleted or restored.
+    """
+    loaded_values = getattr(instance, '_loaded_values', {})
+    if not created and 'is_deleted' not in loaded_values:
+        return
+    before = None
+    if not created and not loaded_values['is_deleted']:
+        before = facet_values(
+            loaded_values['category_id'], loaded_values['seller_id'], loaded_values['effective_price']
+        )
+    after = None
+    if not instance.is_deleted:
+        after = facet_values(instance.category_id, instance.seller_id, instance.effective_price)
+    facet_cache.move(before, after)
+
+
+@receiver(post_delete, sender=Product)
+def remove_product_facets(sender, instance, **kwargs):
+    """
+    Removes a deleted product from the cached facet counts.
+    """
+    if not instance.is_deleted:
+        facet_cache.move(facet_values(instance.category_id, instance.seller_id, instance.effective_price), None)
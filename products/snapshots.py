@@ -0,0 +1,169 @@
+import json
+import threading
+from collections import Counter, OrderedDict, namedtuple
+from django.conf import settings
+from config.settings import redis_client_first_db
+from .models import Product
+
+ProductSnapshot = namedtuple('ProductSnapshot', ['id', 'name', 'slug', 'price', 'warehouse', 'seller_id', 'version'])
+
+
+class ProductSnapshotCache:
+    """
+    Two-tier cache of compact product snapshots for the basket and order hot path.
+
+    Snapshots hold only the fields basket and checkout code needs. They live in a
+    bounded per-process LRU in front of Redis. Every product has a version counter
+    in Redis that is bumped whenever the product changes; a snapshot is only used
+    if it carries the current version, so both tiers are invalidated by a single
+    INCR no matter which process cached them.
+
+    Attributes:
+        fields: Product fields copied into a snapshot.
+        stats_key: Redis hash aggregating hit and miss counters across processes.
+        ttl: Seconds a snapshot is kept in Redis.
+        local_size: Maximum number of snapshots kept in process memory.
+    """
+    __client = redis_client_first_db
+    fields = ('id', 'name', 'slug', 'price', 'warehouse', 'seller_id')
+    stats_key = "product:snapshot:stats"
+    ttl = settings.PRODUCT_SNAPSHOT_TTL
+    local_size = settings.PRODUCT_SNAPSHOT_LOCAL_SIZE
+    stats_flush_threshold = 100
+
+    def __init__(self):
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending_stats = Counter()
+
+    @staticmethod
+    def version_key(product_id):
+        return f"product:version:{product_id}"
+
+    @staticmethod
+    def snapshot_key(product_id):
+        return f"product:snapshot:{product_id}"
+
+    def get(self, product_id):
+        """
+        Returns the snapshot of a single product.
+
+        Args:
+            product_id (int): The ID of the product.
+
+        Returns:
+            ProductSnapshot|None: The snapshot, or None if the product does not exist.
+        """
+        return self.get_many([product_id]).get(int(product_id))
+
+    def get_many(self, product_ids):
+        """
+        Returns snapshots for several products, reading each tier at most once.
+
+        Args:
+            product_ids (iterable): The IDs of the products.
+
+        Returns:
+            dict: Snapshots keyed by product ID. Products that do not exist are left out.
+        """
+        product_ids = list(dict.fromkeys(int(product_id) for product_id in product_ids))
+        if not product_ids:
+            return {}
+
+        versions = self.__class__.__client.mget([self.version_key(product_id) for product_id in product_ids])
+        versions = {
+            product_id: int(version or 0)
+            for product_id, version in zip(product_ids, versions)
+        }
+
+        snapshots = {}
+        with self._lock:
+            for product_id in product_ids:
+                snapshot = self._local.get(product_id)
+                if snapshot is not None and snapshot.version == versions[product_id]:
+                    self._local.move_to_end(product_id)
+                    snapshots[product_id] = snapshot
+        stats = Counter(local_hits=len(snapshots))
+
+        missing = [product_id for product_id in product_ids if product_id not in snapshots]
+        pipeline = self.__class__.__client.pipeline(transaction=False)
+        if missing:
+            stored = self.__class__.__client.mget([self.snapshot_key(product_id) for product_id in missing])
+            for product_id, value in zip(missing, stored):
+                if value is None:
+                    continue
+                try:
+                    snapshot = ProductSnapshot(**json.loads(value))
+                except TypeError:
+                    continue
+                if snapshot.version == versions[product_id]:
+                    snapshots[product_id] = snapshot
+            stats['redis_hits'] = len(snapshots) - stats['local_hits']
+
+            missing = [product_id for product_id in missing if product_id not in snapshots]
+            if missing:
+                stats['misses'] = len(missing)
+                for values in Product.objects.filter(id__in=missing).values(*self.fields):
+                    snapshot = ProductSnapshot(version=versions[values['id']], **values)
+                    snapshots[snapshot.id] = snapshot
+                    pipeline.set(self.snapshot_key(snapshot.id), json.dumps(snapshot._asdict()), ex=self.ttl)
+
+        self._remember(snapshots.values())
+        self._record(stats, pipeline)
+        return snapshots
+
+    def invalidate(self, *product_ids):
+        """
+        Bumps the version of the given products so every cached snapshot of them is ignored.
+
+        Args:
+            product_ids (int): The IDs of the changed products.
+        """
+        pipeline = self.__class__.__client.pipeline(transaction=False)
+        for product_id in product_ids:
+            pipeline.incr(self.version_key(product_id))
+            pipeline.delete(self.snapshot_key(product_id))
+        pipeline.execute()
+        with self._lock:
+            for product_id in product_ids:
+                self._local.pop(int(product_id), None)
+
+    def stats(self):
+        """
+        Returns the hit and miss counters aggregated across processes.
+
+        Returns:
+            dict: Counts of local hits, Redis hits and misses.
+        """
+        pipeline = self.__class__.__client.pipeline(transaction=False)
+        self._record(Counter(), pipeline, force=True)
+        stored = self.__class__.__client.hgetall(self.stats_key)
+        counters = {'local_hits': 0, 'redis_hits': 0, 'misses': 0}
+        counters.update({key.decode('utf-8'): int(value) for key, value in stored.items()})
+        return counters
+
+    def _remember(self, snapshots):
+        with self._lock:
+            for snapshot in snapshots:
+                self._local[snapshot.id] = snapshot
+                self._local.move_to_end(snapshot.id)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _record(self, stats, pipeline, force=False):
+        """
+        Adds counters to the pending totals and sends them to Redis along with the
+        pipeline, so fully local reads do not pay an extra round trip for bookkeeping.
+        """
+        with self._lock:
+            self._pending_stats.update(stats)
+            pending = sum(self._pending_stats.values())
+            if pending and (force or len(pipeline) or pending >= self.stats_flush_threshold):
+                for key, value in self._pending_stats.items():
+                    pipeline.hincrby(self.stats_key, key, value)
+                self._pending_stats.clear()
+        if len(pipeline):
+            pipeline.execute()
+
+
+snapshot_cache = ProductSnapshotCache()
@@ -0,0 +1,111 @@
+import uuid
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from authentication.models import User, SellerProfile
+from products.models import Product, Category, CategoryProductCounter
+from products.serializers import CategoryDetailActionSerializer
+
+
+class CategoryCountsTestCase(TestCase):
+    """
+    Test case for verifying annotated and cached category product counts.
+    """
+
+    def setUp(self):
+        """
+        Creates a root category with many children and a few products.
+        """
+        user = User.objects.create(
+            email='countseller@gmail.com',
+            username='countSeller',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        self.seller = SellerProfile.objects.create(user=user)
+        self.root = Category.objects.create(name='count-root')
+        self.children = Category.objects.bulk_create(
+            [Category(name=f'count-child-{i}', parent=self.root) for i in range(499)]
+        )
+        self.products = [self.create_product(self.children[0], i) for i in range(3)]
+
+    def create_product(self, category, i):
+        return Product.objects.create(
+            name=f"Count Product {i}",
+            price=1000,
+            detail="count product",
+            category=category,
+            warehouse=10,
+            slug=f"count-product-{i}",
+            seller=self.seller
+        )
+
+    def serialize(self):
+        return CategoryDetailActionSerializer(Category.objects.with_details().order_by('id'), many=True).data
+
+    def test_page_of_500_categories_renders_in_one_query(self):
+        """
+        Test that 500 categories with counts and parent names are serialized with a single query.
+        """
+        self.products[0].soft_delete()
+
+        with self.assertNumQueries(1):
+            data = self.serialize()
+
+        self.assertEqual(len(data), 500)
+        self.assertEqual(data[1]['product_amount'], 2)
+        self.assertEqual(data[1]['parent_name'], 'count-root')
+        self.assertIsNone(data[0]['parent_name'])
+
+    @override_settings(CATEGORY_PRODUCT_COUNTER_ENABLED=True)
+    def test_counters_follow_product_lifecycle(self):
+        """
+        Test that counters follow creating, moving, soft-deleting, restoring and deleting products.
+        """
+        call_command('rebuild_category_counters', stdout=StringIO())
+        first, second = self.children[0], self.children[1]
+
+        def counts():
+            return [CategoryProductCounter.objects.get(category=category).product_count for category in (first, second)]
+
+        self.assertEqual(counts(), [3, 0])
+        self.create_product(second, 3)
+        self.assertEqual(counts(), [3, 1])
+
+        product = Product.objects.get(id=self.products[0].id)
+        product.category = second
+        product.save()
+        self.assertEqual(counts(), [2, 2])
+
+        product.soft_delete()
+        self.assertEqual(counts(), [2, 1])
+        product.restore()
+        self.assertEqual(counts(), [2, 2])
+
+        Product.objects.get(id=self.products[1].id).delete()
+        self.assertEqual(counts(), [1, 2])
+
+        with self.assertNumQueries(1):
+            data = self.serialize()
+        self.assertEqual([data[1]['product_amount'], data[2]['product_amount']], [1, 2])
+
+
+class CategoryDetailEndpointTestCase(APITestCase):
+    """
+    Test case for verifying the category detail endpoint query count.
+    """
+
+    def test_category_detail_costs_fixed_queries(self):
+        """
+        Test that the detail endpoint annotates the count and joins the parent instead of extra queries.
+        """
+        root = Category.objects.create(name='detail-root')
+        child = Category.objects.create(name='detail-child', parent=root)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('categories-detail', kwargs={'id': child.id}))
+
+        self.assertEqual(response.data['parent_name'], 'detail-root')
+        self.assertEqual(response.data['product_amount'], 0)
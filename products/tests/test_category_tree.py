@@ -0,0 +1,152 @@
+import uuid
+from io import StringIO
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from authentication.models import User, SellerProfile
+from products.models import Product, Category
+
+
+class CategoryTreeTestCase(TestCase):
+    """
+    Test case for verifying the materialized category paths.
+    """
+
+    def setUp(self):
+        """
+        Creates the tree electronics > computers > laptops and a separate books root.
+        """
+        self.electronics = Category.objects.create(name='electronics')
+        self.computers = Category.objects.create(name='computers', parent=self.electronics)
+        self.laptops = Category.objects.create(name='laptops', parent=self.computers)
+        self.books = Category.objects.create(name='books')
+
+    def test_paths_are_set_on_create(self):
+        """
+        Test that new categories get the path of their parent plus their own ID.
+        """
+        self.assertEqual(self.laptops.path, f"/{self.electronics.id}/{self.computers.id}/{self.laptops.id}/")
+        self.assertEqual(self.laptops.depth, 2)
+        self.assertEqual(self.books.path, f"/{self.books.id}/")
+
+    def test_subtree_and_ancestors_take_one_query(self):
+        """
+        Test that descendant and ancestor lookups are single queries.
+        """
+        with self.assertNumQueries(1):
+            descendants = list(self.electronics.get_descendants())
+        with self.assertNumQueries(1):
+            ancestors = list(self.laptops.get_ancestors())
+
+        self.assertEqual(descendants, [self.computers, self.laptops])
+        self.assertEqual(ancestors, [self.electronics, self.computers])
+
+    def test_moving_a_category_moves_its_subtree(self):
+        """
+        Test that moving a category rewrites the paths of all of its descendants.
+        """
+        self.computers.parent = self.books
+        self.computers.save()
+
+        self.laptops.refresh_from_db()
+        self.assertEqual(self.laptops.path, f"/{self.books.id}/{self.computers.id}/{self.laptops.id}/")
+        self.assertEqual(list(self.books.get_descendants()), [self.computers, self.laptops])
+        self.assertFalse(self.electronics.get_descendants().exists())
+
+    def test_stale_instance_moves_its_current_subtree(self):
+        """
+        Test that a category loaded before an ancestor moved still rewrites its subtree from its current path.
+        """
+        gaming = Category.objects.create(name='gaming', parent=self.laptops)
+        stale_laptops = Category.objects.get(id=self.laptops.id)
+        self.computers.parent = self.books
+        self.computers.save()
+
+        stale_laptops.parent = self.electronics
+        stale_laptops.save()
+
+        gaming.refresh_from_db()
+        self.assertEqual(gaming.path, f"/{self.electronics.id}/{self.laptops.id}/{gaming.id}/")
+        self.assertEqual(gaming.depth, 2)
+        self.assertFalse(self.books.get_descendants().filter(id=gaming.id).exists())
+
+    def test_category_cannot_be_moved_below_itself(self):
+        """
+        Test that moving a category into its own subtree is rejected.
+        """
+        self.electronics.parent = self.laptops
+        with self.assertRaises(ValidationError):
+            self.electronics.save()
+
+    def test_missing_paths_are_rejected_until_rebuilt(self):
+        """
+        Test that bulk created categories without a path are not treated as the root of every category.
+        """
+        orphan = Category.objects.bulk_create([Category(name='bulk')])[0]
+
+        with self.assertRaises(ValidationError):
+            orphan.get_descendants()
+        with self.assertRaises(ValidationError):
+            Category.objects.create(name='bulk-child', parent=orphan)
+
+        Category.rebuild_tree()
+        orphan.refresh_from_db()
+        self.assertFalse(orphan.get_descendants().exists())
+
+    def test_rebuild_command_repairs_paths(self):
+        """
+        Test that the rebuild command recomputes paths written behind the model's back.
+        """
+        Category.objects.update(path='', depth=0)
+
+        call_command('rebuild_category_tree', stdout=StringIO())
+
+        self.laptops.refresh_from_db()
+        self.assertEqual(self.laptops.path, f"/{self.electronics.id}/{self.computers.id}/{self.laptops.id}/")
+        self.assertEqual(self.laptops.depth, 2)
+
+
+class CategoryDescendantProductsTestCase(APITestCase):
+    """
+    Test case for verifying the descendant-inclusive product filter.
+    """
+
+    def test_descendants_filter_includes_subtree_products(self):
+        """
+        Test that descendants=true lists products of the category and every category below it.
+        """
+        user = User.objects.create(
+            email='treeseller@gmail.com',
+            username='treeSeller',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        seller = SellerProfile.objects.create(user=user)
+        root = Category.objects.create(name='tree-root')
+        child = Category.objects.create(name='tree-child', parent=root)
+        grandchild = Category.objects.create(name='tree-grandchild', parent=child)
+        other = Category.objects.create(name='tree-other')
+        products = {
+            category.id: Product.objects.create(
+                name=f"Tree Product {category.name}",
+                price=1000,
+                detail="tree product",
+                category=category,
+                warehouse=10,
+                slug=f"tree-product-{category.name}",
+                seller=seller
+            )
+            for category in (root, child, grandchild, other)
+        }
+        url = reverse('category-products-list', kwargs={'category_id': child.id})
+
+        direct = self.client.get(url)
+        subtree = self.client.get(url, {'descendants': 'true'})
+
+        self.assertEqual([product['id'] for product in direct.data['results']], [products[child.id].id])
+        self.assertEqual(
+            {product['id'] for product in subtree.data['results']},
+            {products[child.id].id, products[grandchild.id].id}
+        )
@@ -0,0 +1,153 @@
+import uuid
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+from authentication.models import User, SellerProfile
+from core.cache import response_cache
+from products.models import Product, Category, Discount
+
+
+class ConditionalGetTestCase(APITestCase):
+    """
+    Test case for verifying ETag and Last-Modified revalidation of catalog resources.
+    """
+
+    def setUp(self):
+        """
+        Creates a category with a few products.
+        """
+        user = User.objects.create(
+            email='etagseller@gmail.com',
+            username='etagSeller',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        seller = SellerProfile.objects.create(user=user)
+        self.category = Category.objects.create(name='etag-category')
+        self.products = [
+            Product.objects.create(
+                name=f"ETag Product {i}",
+                price=1000 * (i + 1),
+                detail="etag product",
+                category=self.category,
+                warehouse=10,
+                slug=f"etag-product-{i}",
+                seller=seller
+            )
+            for i in range(3)
+        ]
+
+    def detail_url(self, product):
+        product.refresh_from_db()
+        return reverse('category-products-detail', kwargs={'category_id': self.category.id, 'slug': product.slug})
+
+    def test_matching_etag_returns_not_modified_without_serializing(self):
+        """
+        Test that a matching If-None-Match is answered with 304 after a single aggregate query.
+        """
+        url = reverse('product-list')
+        response = self.client.get(url, {'order': 'price'})
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            revalidated = self.client.get(url, {'order': 'price'}, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(revalidated.content, b'')
+
+    def test_etag_changes_when_rows_change_or_disappear(self):
+        """
+        Test that a discount change and a deletion both produce a new ETag.
+        """
+        url = reverse('product-list')
+        etag = self.client.get(url)['ETag']
+
+        Discount.objects.create(type_of_discount='cash', discount=100, product=self.products[0])
+        after_discount = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(after_discount.status_code, status.HTTP_200_OK)
+
+        self.products[1].soft_delete()
+        after_delete = self.client.get(url, HTTP_IF_NONE_MATCH=after_discount['ETag'])
+        self.assertEqual(after_delete.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(after_delete['ETag'], after_discount['ETag'])
+
+    def test_product_detail_honours_if_modified_since(self):
+        """
+        Test that the product detail answers If-Modified-Since until the product changes.
+        """
+        url = self.detail_url(self.products[0])
+        response = self.client.get(url)
+
+        revalidated = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        stale = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(stale.status_code, status.HTTP_200_OK)
+
+    def test_list_is_not_revalidated_by_date_after_a_deletion(self):
+        """
+        Test that a list has no Last-Modified, so deleting its newest row cannot be answered with 304.
+        """
+        url = reverse('product-list')
+        fetched_at = http_date()
+
+        Product.everything.filter(pk=self.products[2].pk).delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=fetched_at)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Last-Modified', response)
+
+    def test_category_list_has_validators(self):
+        """
+        Test that the category list is revalidated by ETag.
+        """
+        url = reverse('categories-list')
+        etag = self.client.get(url)['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(CATALOG_CACHE_ENABLED=True)
+    def test_cached_response_is_revalidated_without_queries(self):
+        """
+        Test that revalidating a cached response needs no database query at all.
+        """
+        response_cache.clear()
+        url = reverse('product-list')
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(0):
+            revalidated = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        response_cache.clear()
+
+    def test_category_detail_etag_follows_its_products_and_parent(self):
+        """
+        Test that adding or soft-deleting a product and renaming the parent change the category detail's ETag.
+        """
+        parent = Category.objects.create(name='etag-parent')
+        self.category.parent = parent
+        self.category.save()
+        url = reverse('categories-detail', kwargs={'id': self.category.id})
+        etag = self.client.get(url)['ETag']
+
+        Product.objects.create(name="ETag Product 3", price=4000, detail="etag product", category=self.category,
+                               warehouse=10, slug="etag-product-3", seller=self.products[0].seller)
+        added = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.products[0].soft_delete()
+        deleted = self.client.get(url, HTTP_IF_NONE_MATCH=added['ETag'])
+        parent.name = 'etag-parent-renamed'
+        parent.save()
+        renamed = self.client.get(url, HTTP_IF_NONE_MATCH=deleted['ETag'])
+
+        self.assertEqual(added.status_code, status.HTTP_200_OK)
+        self.assertEqual(added.data['product_amount'], 4)
+        self.assertEqual(deleted.status_code, status.HTTP_200_OK)
+        self.assertEqual(deleted.data['product_amount'], 3)
+        self.assertEqual(renamed.status_code, status.HTTP_200_OK)
+        self.assertEqual(renamed.data['parent_name'], 'etag-parent-renamed')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=renamed['ETag']).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
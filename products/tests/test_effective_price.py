@@ -0,0 +1,87 @@
+import uuid
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from authentication.models import User, SellerProfile
+from products.models import Product, Category, Discount
+
+
+class EffectivePriceTestCase(APITestCase):
+    """
+    Test case for verifying that the stored effective price follows price and discount changes.
+    """
+
+    def setUp(self):
+        """
+        Creates three products with different prices.
+        """
+        user = User.objects.create(
+            email='effectiveseller@gmail.com',
+            username='effectiveSeller',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        seller = SellerProfile.objects.create(user=user)
+        category = Category.objects.create(name='effective-category')
+        self.products = [
+            Product.objects.create(
+                name=f"Effective Product {i}",
+                price=price,
+                detail="effective product",
+                category=category,
+                warehouse=10,
+                slug=f"effective-product-{i}",
+                seller=seller
+            )
+            for i, price in enumerate([1000, 2000, 3000])
+        ]
+
+    def effective_price(self, product):
+        return Product.objects.values_list('effective_price', flat=True).get(id=product.id)
+
+    def test_discount_and_price_changes_update_effective_price(self):
+        """
+        Test that creating and deleting discounts and changing the price keep effective_price current.
+        """
+        product = self.products[1]
+        self.assertEqual(self.effective_price(product), 2000)
+
+        discount = Discount.objects.create(type_of_discount='percentage', discount=50, product=product)
+        self.assertEqual(self.effective_price(product), 1000)
+
+        product = Product.objects.get(id=product.id)
+        product.price = 4000
+        product.save()
+        self.assertEqual(self.effective_price(product), 2000)
+
+        discount.delete()
+        self.assertEqual(self.effective_price(product), 4000)
+
+    def test_listing_filters_and_sorts_by_effective_price(self):
+        """
+        Test that the price filter and price order use the discounted price.
+        """
+        Discount.objects.create(type_of_discount='cash', discount=2500, product=self.products[2])
+
+        response = self.client.get(reverse('product-list'), {'price': '-1500', 'order': 'price'})
+
+        self.assertEqual(
+            [product['id'] for product in response.data['results']],
+            [self.products[2].id, self.products[0].id]
+        )
+        self.assertEqual(response.data['results'][0]['discounted_price'], 500)
+
+    def test_recompute_command_repairs_stale_prices(self):
+        """
+        Test that the recompute command fixes effective prices written behind the model's back.
+        """
+        Discount.objects.create(type_of_discount='cash', discount=100, product=self.products[0])
+        Product.objects.update(effective_price=0)
+
+        call_command('recompute_effective_prices', stdout=StringIO())
+
+        self.assertEqual(
+            [self.effective_price(product) for product in self.products],
+            [900, 2000, 3000]
+        )
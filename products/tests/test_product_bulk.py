@@ -0,0 +1,167 @@
+import csv
+import io
+import json
+import uuid
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from authentication.models import User, SellerProfile
+from products.facets import count_facets, facet_cache
+from products.models import Product, Category, CategoryProductCounter
+
+
+class ProductBulkTestCase(APITestCase):
+    """
+    Test case for verifying bulk product import and export.
+    """
+
+    def setUp(self):
+        """
+        Creates a seller, a customer and two categories.
+        """
+        self.user = User.objects.create(
+            email='bulkseller@gmail.com',
+            username='bulkSeller',
+            password='TestP@assword',
+            is_seller=True,
+            uuid=uuid.uuid4()
+        )
+        self.seller = SellerProfile.objects.create(user=self.user)
+        self.customer = User.objects.create(
+            email='bulkcustomer@gmail.com',
+            username='bulkCustomer',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        self.categories = [Category.objects.create(name=f'bulk-category-{i}') for i in range(2)]
+        self.import_url = reverse('product-import-products')
+        self.export_url = reverse('product-export-products')
+
+    def csv_file(self, rows, name='products.csv'):
+        stream = io.StringIO()
+        writer = csv.DictWriter(stream, fieldnames=['name', 'price', 'detail', 'category', 'warehouse'])
+        writer.writeheader()
+        writer.writerows(rows)
+        return SimpleUploadedFile(name, stream.getvalue().encode('utf-8'), content_type='text/csv')
+
+    def rows(self, count):
+        return [
+            {'name': f'Bulk Product {i}', 'price': 100 + i, 'detail': 'bulk product',
+             'category': self.categories[i % 2].id, 'warehouse': '' if i % 3 else 5}
+            for i in range(count)
+        ]
+
+    def test_csv_import_creates_valid_rows_and_reports_errors(self):
+        """
+        Test that valid rows are created in chunks while invalid ones are reported by row number.
+        """
+        rows = self.rows(45)
+        rows[3]['price'] = 'cheap'
+        rows[10]['category'] = 999999
+        rows[20]['name'] = ''
+        self.client.force_authenticate(self.user)
+
+        with self.settings(PRODUCT_IMPORT_BATCH_SIZE=20):
+            with self.assertNumQueries(1 + 3 * 4):
+                response = self.client.post(self.import_url, {'file': self.csv_file(rows)}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 42)
+        self.assertEqual([error['row'] for error in response.data['errors']], [4, 11, 21])
+        self.assertIn('price', response.data['errors'][0]['errors'])
+        product = Product.objects.get(name='Bulk Product 6')
+        self.assertEqual((product.effective_price, product.warehouse, product.seller_id), (106, 5, self.seller.id))
+        self.assertTrue(product.slug.startswith('bulk-product-6'))
+        self.assertEqual(Product.objects.filter(seller=self.seller).values('slug').distinct().count(), 42)
+
+    @override_settings(PRODUCT_IMPORT_MAX_ERRORS=2)
+    def test_import_report_lists_only_the_first_errors(self):
+        """
+        Test that every rejected row is counted but only the first PRODUCT_IMPORT_MAX_ERRORS are listed.
+        """
+        rows = self.rows(10)
+        for row in rows[:5]:
+            row['price'] = 'cheap'
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post(self.import_url, {'file': self.csv_file(rows)}, format='multipart')
+
+        self.assertEqual(response.data['created'], 5)
+        self.assertEqual(response.data['rejected'], 5)
+        self.assertEqual([error['row'] for error in response.data['errors']], [1, 2])
+        self.assertTrue(response.data['errors_truncated'])
+
+    def test_longest_valid_name_fits_the_slug(self):
+        """
+        Test that a row with a 250 character name is imported with a slug within the column's length.
+        """
+        rows = self.rows(1)
+        rows[0]['name'] = 'n' * 250
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post(self.import_url, {'file': self.csv_file(rows)}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(len(Product.objects.get(seller=self.seller).slug), 250)
+
+    @override_settings(CATEGORY_PRODUCT_COUNTER_ENABLED=True, PRODUCT_FACET_CACHE_ENABLED=True)
+    def test_jsonl_import_keeps_counters_and_facets_current(self):
+        """
+        Test that JSON lines imports update category counters and cached facets despite skipping signals.
+        """
+        CategoryProductCounter.rebuild()
+        facet_cache.rebuild()
+        lines = [json.dumps({**row, 'warehouse': row['warehouse'] or None}) for row in self.rows(10)] + ['{not json']
+        upload = SimpleUploadedFile('products.jsonl', '\n'.join(lines).encode('utf-8'))
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post(self.import_url, {'file': upload}, format='multipart')
+
+        self.assertEqual(response.data['created'], 10)
+        self.assertEqual(response.data['errors'][0]['row'], 11)
+        self.assertEqual(CategoryProductCounter.objects.get(category=self.categories[0]).product_count, 5)
+        self.assertEqual(facet_cache.get(), count_facets(Product.objects.all()))
+        facet_cache.clear()
+
+    def test_only_sellers_can_import_and_export(self):
+        """
+        Test that anonymous users and customers cannot import or export products.
+        """
+        response = self.client.post(self.import_url, {'file': self.csv_file(self.rows(1))}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.force_authenticate(self.customer)
+        response = self.client.post(self.import_url, {'file': self.csv_file(self.rows(1))}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(self.export_url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_streams_the_sellers_products(self):
+        """
+        Test that the export streams every live product of the seller in both formats.
+        """
+        call_command('import_products', self.write_rows(self.rows(30)), '--seller', str(self.seller.id),
+                     stdout=io.StringIO())
+        Product.objects.first().soft_delete()
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(self.export_url)
+        self.assertTrue(response.streaming)
+        exported = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode('utf-8'))))
+        self.assertEqual(len(exported), 29)
+        self.assertEqual(exported[0]['name'], 'Bulk Product 1')
+
+        response = self.client.get(self.export_url, {'file_format': 'jsonl'})
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(json.loads(lines[-1])['name'], 'Bulk Product 29')
+
+    def write_rows(self, rows):
+        path = f"/tmp/bulk-products-{uuid.uuid4()}.csv"
+        with open(path, 'w', newline='') as stream:
+            writer = csv.DictWriter(stream, fieldnames=['name', 'price', 'detail', 'category', 'warehouse'])
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
@@ -0,0 +1,100 @@
+import uuid
+from io import StringIO
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from authentication.models import User, SellerProfile
+from products.facets import count_facets, facet_cache
+from products.models import Product, Category, Discount
+
+
+class ProductFacetsTestCase(APITestCase):
+    """
+    Test case for verifying facet counts of product listings.
+    """
+
+    def setUp(self):
+        """
+        Creates products of two sellers over two categories and several price buckets.
+        """
+        self.sellers = [
+            SellerProfile.objects.create(user=User.objects.create(
+                email=f'facetseller{i}@gmail.com',
+                username=f'facetSeller{i}',
+                password='TestP@assword',
+                uuid=uuid.uuid4()
+            ))
+            for i in range(2)
+        ]
+        self.categories = [Category.objects.create(name=f'facet-category-{i}') for i in range(2)]
+        self.products = [
+            self.create_product(i, price, category, seller)
+            for i, (price, category, seller) in enumerate([
+                (50, 0, 0), (150, 0, 0), (700, 1, 0), (700, 1, 1), (20000, 1, 1),
+            ])
+        ]
+        self.url = reverse('product-list')
+        facet_cache.clear()
+
+    def tearDown(self):
+        facet_cache.clear()
+
+    def create_product(self, i, price, category, seller):
+        return Product.objects.create(
+            name=f"Facet Product {i}",
+            price=price,
+            detail="facet product",
+            category=self.categories[category],
+            warehouse=10,
+            slug=f"facet-product-{i}",
+            seller=self.sellers[seller]
+        )
+
+    def facet(self, response, name):
+        return {value['value']: value['count'] for value in response.data['facets'][name]}
+
+    def test_listing_returns_facets_with_one_extra_query(self):
+        """
+        Test that facet counts of the whole filtered listing cost a single grouped query.
+        """
+        self.products[0].soft_delete()
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'facets': 'true', 'page_size': 1})
+
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(self.facet(response, 'category'), {self.categories[1].id: 3, self.categories[0].id: 1})
+        self.assertEqual(self.facet(response, 'seller'), {self.sellers[0].id: 2, self.sellers[1].id: 2})
+        self.assertEqual(list(self.facet(response, 'price').items()), [('100-500', 1), ('500-1000', 2), ('10000', 1)])
+
+    def test_facets_follow_the_price_filter(self):
+        """
+        Test that facets count only the products matching the price filter.
+        """
+        response = self.client.get(self.url, {'facets': 'true', 'price': '100-1000'})
+
+        self.assertEqual(self.facet(response, 'category'), {self.categories[1].id: 2, self.categories[0].id: 1})
+        self.assertEqual(self.facet(response, 'price'), {'100-500': 1, '500-1000': 2})
+        self.assertNotIn('facets', self.client.get(self.url).data)
+
+    @override_settings(PRODUCT_FACET_CACHE_ENABLED=True)
+    def test_cached_facets_follow_product_changes(self):
+        """
+        Test that the cached catalog facets stay equal to a fresh count as products change.
+        """
+        call_command('rebuild_product_facets', stdout=StringIO())
+
+        product = Product.objects.get(id=self.products[1].id)
+        product.category = self.categories[1]
+        product.price = 3000
+        product.save()
+        self.products[2].soft_delete()
+        self.create_product(5, 300, 0, 1)
+        Discount.objects.create(type_of_discount='percentage', discount=50, product=self.products[3])
+        Product.objects.get(id=self.products[4].id).delete()
+
+        self.assertEqual(facet_cache.get(), count_facets(Product.objects.all()))
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'facets': 'true'})
+        self.assertEqual(self.facet(response, 'price'), {'0-100': 1, '100-500': 2, '1000-5000': 1})
@@ -0,0 +1,107 @@
+import uuid
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from authentication.models import User, SellerProfile
+from products.models import Product, Category
+
+
+class ProductPaginationTestCase(APITestCase):
+    """
+    Test case for verifying keyset pagination of product listings.
+    """
+
+    def setUp(self):
+        """
+        Creates a catalog where many products share the same price.
+        """
+        user = User.objects.create(
+            email='pageseller@gmail.com',
+            username='pageSeller',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        seller = SellerProfile.objects.create(user=user)
+        self.category = Category.objects.create(name='page-category')
+        other_category = Category.objects.create(name='other-page-category')
+        self.products = [
+            Product.objects.create(
+                name=f"Page Product {i}",
+                price=1000 + (i % 5) * 100,
+                detail="page product",
+                category=self.category if i % 3 else other_category,
+                warehouse=10,
+                slug=f"page-product-{i}",
+                seller=seller
+            )
+            for i in range(45)
+        ]
+        self.url = reverse('product-list')
+
+    def walk(self, url, params):
+        pages = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data['results'])
+            if not response.data['next']:
+                return pages
+            response = self.client.get(response.data['next'])
+
+    def test_pages_cover_catalog_in_order_without_duplicates(self):
+        """
+        Test that walking the pages by price yields every product once, in (price, id) order.
+        """
+        pages = self.walk(self.url, {'order': 'price', 'page_size': 10})
+
+        ids = [product['id'] for page in pages for product in page]
+        expected = sorted(self.products, key=lambda product: (product.price, product.id))
+        self.assertEqual(len(pages), 5)
+        self.assertEqual(ids, [product.id for product in expected])
+
+    def test_descending_order_and_previous_links(self):
+        """
+        Test that previous links walk back over the same pages in descending created_at order.
+        """
+        forward = self.walk(self.url, {'order': '-created_at', 'page_size': 20})
+        last_page = self.client.get(self.url, {'order': '-created_at', 'page_size': 20})
+        while last_page.data['next']:
+            last_page = self.client.get(last_page.data['next'])
+        previous = self.client.get(last_page.data['previous'])
+
+        ids = [product['id'] for page in forward for product in page]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertEqual(previous.data['results'], forward[-2])
+
+    def test_deep_page_costs_the_same_as_the_first_page(self):
+        """
+        Test that a deep page runs the same queries as the first one and none of them uses OFFSET.
+        """
+        with CaptureQueriesContext(connection) as first:
+            response = self.client.get(self.url, {'order': 'price', 'page_size': 5})
+        for _ in range(6):
+            response = self.client.get(response.data['next'])
+        with CaptureQueriesContext(connection) as deep:
+            self.client.get(response.data['next'])
+
+        self.assertEqual(len(first.captured_queries), len(deep.captured_queries))
+        self.assertFalse([query for query in deep.captured_queries if 'OFFSET' in query['sql']])
+
+    def test_category_products_are_paginated(self):
+        """
+        Test that the nested category listing is paginated and filtered to the category.
+        """
+        url = reverse('category-products-list', kwargs={'category_id': self.category.id})
+        pages = self.walk(url, {'page_size': 7})
+
+        ids = {product['id'] for page in pages for product in page}
+        self.assertEqual(ids, {product.id for product in self.products if product.category_id == self.category.id})
+
+    def test_invalid_order_and_cursor_are_rejected(self):
+        """
+        Test that unsupported orders and malformed cursors are rejected.
+        """
+        self.assertEqual(self.client.get(self.url, {'order': 'name'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'cursor': 'garbage'}).status_code, status.HTTP_404_NOT_FOUND)
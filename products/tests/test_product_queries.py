@@ -0,0 +1,82 @@
+import uuid
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from authentication.models import User, SellerProfile
+from products.models import Product, Category, Discount
+
+
+class ProductListingQueriesTestCase(APITestCase):
+    """
+    Test case for verifying that product endpoints load discounts in bulk.
+    """
+
+    def setUp(self):
+        """
+        Creates a category of discounted products.
+        """
+        user = User.objects.create(
+            email='queryseller@gmail.com',
+            username='querySeller',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        self.seller = SellerProfile.objects.create(user=user)
+        self.category = Category.objects.create(name='query-category')
+        self.products = []
+        self.add_products(5)
+
+    def add_products(self, count):
+        for _ in range(count):
+            i = len(self.products)
+            product = Product.objects.create(
+                name=f"Query Product {i}",
+                price=1000,
+                detail="query product",
+                category=self.category,
+                warehouse=10,
+                slug=f"query-product-{i}",
+                seller=self.seller
+            )
+            Discount.objects.create(type_of_discount='percentage', discount=i + 1, product=product)
+            self.products.append(product)
+
+    def test_product_list_query_count_is_constant(self):
+        """
+        Test that listing 5 or 25 discounted products costs the validator aggregate plus a single query,
+        with no discount rows read.
+        """
+        url = reverse('product-list')
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'page_size': 50})
+        self.assertEqual(len(response.data['results']), 5)
+
+        self.add_products(20)
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'page_size': 50})
+        self.assertEqual(len(response.data['results']), 25)
+        self.assertEqual(response.data['results'][0]['discounted_price'], 750)
+
+    def test_category_product_list_query_count_is_constant(self):
+        """
+        Test that the nested category listing costs the validator aggregate plus a single query.
+        """
+        self.add_products(20)
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse('category-products-list', kwargs={'category_id': self.category.id}), {'page_size': 50}
+            )
+        self.assertEqual(len(response.data['results']), 25)
+
+    def test_product_detail_loads_discounts_once(self):
+        """
+        Test that the detail endpoint serves discounted_price and discount_amount from one discount query.
+        """
+        product = self.products[1]
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                reverse('category-products-detail', kwargs={'category_id': self.category.id, 'slug': product.slug})
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['discounted_price'], 980)
+        self.assertEqual(response.data['discount_amount'], "2 percentage")
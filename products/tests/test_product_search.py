@@ -0,0 +1,116 @@
+import uuid
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from authentication.models import User, SellerProfile
+from products.models import Product, Category
+from products.search import trigram_installed
+
+
+class ProductSearchTestCase(APITestCase):
+    """
+    Test case for verifying full-text product search.
+    """
+
+    def setUp(self):
+        """
+        Creates a small catalog over two categories.
+        """
+        user = User.objects.create(
+            email='searchseller@gmail.com',
+            username='searchSeller',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        self.seller = SellerProfile.objects.create(user=user)
+        self.phones = Category.objects.create(name='phones')
+        self.cases = Category.objects.create(name='cases', parent=self.phones)
+        self.laptop = self.create_product("Gaming Laptop", "fast keyboard and screen", self.phones, 3000)
+        self.keyboard = self.create_product("Mechanical Keyboard", "clicky switches", self.cases, 200)
+        self.mouse = self.create_product("Wireless Mouse", "ergonomic mouse for laptops", self.cases, 100)
+        self.url = reverse('product-search')
+
+    def create_product(self, name, detail, category, price):
+        return Product.objects.create(
+            name=name,
+            price=price,
+            detail=detail,
+            category=category,
+            warehouse=10,
+            slug=name.lower().replace(' ', '-'),
+            seller=self.seller
+        )
+
+    def ids(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [product['id'] for product in response.data['results']]
+
+    def test_name_matches_rank_above_description_matches(self):
+        """
+        Test that a product named after the term ranks above one only describing it.
+        """
+        response = self.client.get(self.url, {'q': 'laptop'})
+
+        self.assertEqual(self.ids(response)[:2], [self.laptop.id, self.mouse.id])
+        self.assertGreater(response.data['results'][0]['rank'], response.data['results'][1]['rank'])
+
+    def test_search_combines_with_price_and_category_filters(self):
+        """
+        Test that search results are narrowed by the price range and the category subtree.
+        """
+        self.assertEqual(self.ids(self.client.get(self.url, {'q': 'keyboard', 'price': '-500'})), [self.keyboard.id])
+        self.assertEqual(
+            self.ids(self.client.get(self.url, {'q': 'laptop', 'category': self.cases.id})), [self.mouse.id]
+        )
+        self.assertEqual(
+            set(self.ids(self.client.get(self.url, {'q': 'keyboard', 'category': self.phones.id, 'descendants': 'true'}))),
+            {self.laptop.id, self.keyboard.id}
+        )
+
+    def test_results_are_keyset_paginated(self):
+        """
+        Test that walking the pages yields every match once, in descending relevance.
+        """
+        for i in range(7):
+            self.create_product(f"Laptop Stand {i}", "laptop " * (i + 1), self.cases, 50)
+
+        ids, ranks = [], []
+        response = self.client.get(self.url, {'q': 'laptop', 'page_size': 3})
+        while True:
+            ids += self.ids(response)
+            ranks += [product['rank'] for product in response.data['results']]
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+
+        self.assertEqual(len(ids), 9)
+        self.assertEqual(len(set(ids)), 9)
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+
+    def test_soft_deleted_and_updated_products(self):
+        """
+        Test that the search document follows renames and soft-deleted products are not found.
+        """
+        self.keyboard.soft_delete()
+        self.mouse.name = "Wireless Trackball"
+        self.mouse.save()
+
+        self.assertEqual(self.ids(self.client.get(self.url, {'q': 'keyboard'})), [self.laptop.id])
+        self.assertEqual(self.ids(self.client.get(self.url, {'q': 'trackball'})), [self.mouse.id])
+
+    def test_misspelled_names_match_with_trigrams(self):
+        """
+        Test that a misspelled term still finds the product by trigram similarity.
+        """
+        if not trigram_installed():
+            self.skipTest("pg_trgm is not installed")
+        self.assertIn(self.keyboard.id, self.ids(self.client.get(self.url, {'q': 'mechanicl keybord'})))
+
+    def test_missing_term_is_rejected(self):
+        """
+        Test that a search without a term is rejected.
+        """
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.client.get(self.url, {'q': 'laptop', 'category': 'x'}).status_code, status.HTTP_400_BAD_REQUEST
+        )
@@ -0,0 +1,73 @@
+import uuid
+from django.test import TestCase
+from authentication.models import User, SellerProfile
+from products.models import Product, Category
+from products.snapshots import ProductSnapshotCache, snapshot_cache
+
+
+class ProductSnapshotCacheTestCase(TestCase):
+    """
+    Test case for verifying the two-tier product snapshot cache.
+    """
+
+    def setUp(self):
+        """
+        Creates a product to take snapshots of.
+        """
+        user = User.objects.create(
+            email='snapshotseller@gmail.com',
+            username='snapshotSeller',
+            password='TestP@assword',
+            is_seller=True,
+            uuid=uuid.uuid4()
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product = Product.objects.create(
+                name="Snapshot Product",
+                price=1500,
+                detail="snapshot product",
+                category=Category.objects.create(name='snapshot-category'),
+                warehouse=10,
+                slug="snapshot-product",
+                seller=SellerProfile.objects.create(user=user)
+            )
+
+    def test_snapshot_is_served_from_cache(self):
+        """
+        Test that a second lookup is answered without querying the database.
+        """
+        snapshot_cache.get(self.product.id)
+        with self.assertNumQueries(0):
+            snapshot = snapshot_cache.get(self.product.id)
+        self.assertEqual(snapshot.price, 1500)
+        self.assertEqual(snapshot.slug, self.product.slug)
+
+    def test_other_process_reads_snapshot_from_redis(self):
+        """
+        Test that a cache with an empty local tier picks the snapshot up from Redis.
+        """
+        snapshot_cache.get(self.product.id)
+        other_process_cache = ProductSnapshotCache()
+        before = other_process_cache.stats()
+        with self.assertNumQueries(0):
+            other_process_cache.get(self.product.id)
+        after = other_process_cache.stats()
+        self.assertEqual(after['redis_hits'], before['redis_hits'] + 1)
+
+    def test_saving_product_invalidates_snapshot(self):
+        """
+        Test that saving a product bumps its version once committed so stale snapshots are not served.
+        """
+        snapshot_cache.get(self.product.id)
+        other_process_cache = ProductSnapshotCache()
+        other_process_cache.get(self.product.id)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.product.price = 2500
+            self.product.save()
+            self.assertEqual(other_process_cache.get(self.product.id).price, 1500)
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(snapshot_cache.get(self.product.id).price, 2500)
+        self.assertEqual(other_process_cache.get(self.product.id).price, 2500)
@@ -0,0 +1,101 @@
+import uuid
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from authentication.models import User, SellerProfile
+from core.testing import QueryPlanAssertionsMixin
+from products.models import Product, Category
+
+
+class ProductQueryPlansTestCase(QueryPlanAssertionsMixin, APITestCase):
+    """
+    Test case for verifying that hot product endpoints are planned on indexes
+    over a large catalog.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Seeds 20,000 products over 50 categories, a tenth of them soft-deleted.
+        """
+        user = User.objects.create(
+            email='planseller@gmail.com',
+            username='planSeller',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        seller = SellerProfile.objects.create(user=user)
+        cls.categories = Category.objects.bulk_create([Category(name=f'plan-category-{i}') for i in range(50)])
+        Product.objects.bulk_create([
+            Product(
+                name=f"Plan Product {i}",
+                price=(i * 37) % 5000,
+                effective_price=(i * 37) % 5000,
+                detail="plan product",
+                category=cls.categories[i % 50],
+                warehouse=10,
+                slug=f"plan-product-{i}",
+                seller=seller,
+                is_deleted=i % 10 == 0
+            )
+            for i in range(20000)
+        ], batch_size=5000)
+        cls.analyze('products_product', 'products_category')
+
+    def test_catalog_pages_use_the_live_sort_indexes(self):
+        """
+        Test that catalog pages, including deep ones, walk the partial index of their sort key.
+        """
+        url = reverse('product-list')
+        response = self.assertIndexScan(
+            lambda: self.client.get(url, {'order': 'price'}),
+            'products_product', index='product_live_price_id_idx', contains='LIMIT'
+        )
+        self.assertIndexScan(
+            lambda: self.client.get(response.data['next']),
+            'products_product', index='product_live_price_id_idx', contains='LIMIT'
+        )
+        self.assertIndexScan(
+            lambda: self.client.get(url, {'order': '-created_at'}),
+            'products_product', index='product_live_created_id_idx', contains='LIMIT'
+        )
+
+    def test_price_range_uses_the_price_index(self):
+        """
+        Test that a price range filter is served by the price index.
+        """
+        self.assertIndexScan(
+            lambda: self.client.get(reverse('product-list'), {'price': '100-120', 'order': 'price'}),
+            'products_product', index='product_live_price_id_idx'
+        )
+
+    def test_category_listing_uses_the_category_indexes(self):
+        """
+        Test that every query of a category listing, validators included, reads the category indexes.
+        """
+        url = reverse('category-products-list', kwargs={'category_id': self.categories[7].id})
+        self.assertIndexScan(
+            lambda: self.client.get(url, {'order': 'created_at'}),
+            'products_product', index='product_live_cat_created_idx'
+        )
+        self.assertIndexScan(
+            lambda: self.client.get(url, {'order': 'price'}),
+            'products_product', index='product_live_cat_price_idx', contains='LIMIT'
+        )
+
+    def test_product_detail_uses_the_slug_index(self):
+        """
+        Test that the product detail endpoint looks the product up by its unique slug index.
+        """
+        url = reverse('category-products-detail', kwargs={'category_id': self.categories[3].id, 'slug': 'plan-product-53'})
+        response = self.assertIndexScan(lambda: self.client.get(url), 'products_product')
+        self.assertEqual(response.data['slug'], 'plan-product-53')
+
+    def test_search_uses_the_search_vector_index(self):
+        """
+        Test that a selective search term is matched through the GIN index of the search document.
+        """
+        response = self.assertIndexScan(
+            lambda: self.client.get(reverse('product-search'), {'q': '12345'}),
+            'products_product', index='product_search_gin_idx'
+        )
+        self.assertEqual([product['name'] for product in response.data['results']], ['Plan Product 12345'])
@@ -0,0 +1,100 @@
+import uuid
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from authentication.models import User, SellerProfile
+from core.cache import response_cache
+from products.models import Product, Category, Discount
+
+
+@override_settings(CATALOG_CACHE_ENABLED=True)
+class ResponseCacheTestCase(APITestCase):
+    """
+    Test case for verifying that catalog responses are cached and invalidated by tag.
+    """
+
+    def setUp(self):
+        """
+        Creates two categories with a product each.
+        """
+        response_cache.clear()
+        user = User.objects.create(
+            email='cacheseller@gmail.com',
+            username='cacheSeller',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        seller = SellerProfile.objects.create(user=user)
+        self.categories = [Category.objects.create(name=f'cache-category-{i}') for i in range(2)]
+        self.products = [
+            Product.objects.create(
+                name=f"Cache Product {i}",
+                price=1000 * (i + 1),
+                detail="cache product",
+                category=category,
+                warehouse=10,
+                slug=f"cache-product-{i}",
+                seller=seller
+            )
+            for i, category in enumerate(self.categories)
+        ]
+
+    def tearDown(self):
+        response_cache.clear()
+
+    def detail_url(self, product):
+        product.refresh_from_db()
+        return reverse('category-products-detail', kwargs={'category_id': product.category_id, 'slug': product.slug})
+
+    def test_anonymous_hits_are_served_without_queries(self):
+        """
+        Test that repeated catalog requests are answered from the cache without touching the database.
+        """
+        urls = [
+            (reverse('categories-list'), {}),
+            (reverse('product-list'), {'order': '-price', 'price': '500-5000'}),
+            (self.detail_url(self.products[0]), {}),
+        ]
+        first = [self.client.get(url, params).data for url, params in urls]
+
+        with self.assertNumQueries(0):
+            cached = [self.client.get(url, params).data for url, params in urls]
+        self.assertEqual(cached, first)
+
+    def test_query_params_are_normalized(self):
+        """
+        Test that parameter order and unrelated parameters do not create new entries.
+        """
+        self.client.get(reverse('product-list'), {'order': 'price', 'price': '500-5000'})
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse('product-list') + '?price=500-5000&order=price&utm_source=mail')
+
+    def test_product_change_invalidates_only_its_tags(self):
+        """
+        Test that changing a product refreshes the listing and its own detail but not another product's.
+        """
+        list_url = reverse('product-list')
+        other_detail = self.detail_url(self.products[1])
+        self.client.get(list_url)
+        self.client.get(other_detail)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Discount.objects.create(type_of_discount='cash', discount=100, product=self.products[0])
+
+        response = self.client.get(list_url)
+        self.assertEqual(response.data['results'][0]['discounted_price'], 900)
+        with self.assertNumQueries(0):
+            self.client.get(other_detail)
+
+    def test_category_change_invalidates_category_list(self):
+        """
+        Test that creating a category refreshes the cached category list.
+        """
+        url = reverse('categories-list')
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name='cache-category-new')
+
+        self.assertEqual(len(self.client.get(url).data), 3)
@@ -0,0 +1,104 @@
+import uuid
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from authentication.models import User, SellerProfile
+from products.models import Product, Category, Discount, Image, product_archive
+
+
+class SoftDeleteArchiveTestCase(TestCase):
+    """
+    Test case for verifying that long soft-deleted products move into the archive table.
+    """
+
+    def setUp(self):
+        """
+        Creates products with discounts and images, some of them deleted long ago.
+        """
+        user = User.objects.create(
+            email='archiveseller@gmail.com',
+            username='archiveSeller',
+            password='TestP@assword',
+            uuid=uuid.uuid4()
+        )
+        self.seller = SellerProfile.objects.create(user=user)
+        self.category = Category.objects.create(name='archive-category')
+        self.products = [self.create_product(i) for i in range(4)]
+        for product in self.products:
+            Discount.objects.create(type_of_discount='percentage', discount=product.id % 90 + 1, product=product)
+            Image.objects.create(image='archive.png', product=product)
+        for product in self.products[:3]:
+            product.soft_delete()
+        Product.everything.filter(id__in=[self.products[0].id, self.products[1].id]).update(
+            deleted_at=timezone.now() - timedelta(days=90)
+        )
+
+    def create_product(self, i):
+        return Product.objects.create(
+            name=f"Archive Product {i}",
+            price=1000,
+            detail="archive product",
+            category=self.category,
+            warehouse=10,
+            slug=f"archive-product-{i}",
+            seller=self.seller
+        )
+
+    @staticmethod
+    def hot_ids(table):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT id FROM ONLY "{table}"')
+            return {row[0] for row in cursor.fetchall()}
+
+    def archive(self):
+        out = StringIO()
+        call_command('archive_soft_deleted', '--older-than', '30', stdout=out)
+        return out.getvalue()
+
+    def test_long_deleted_products_and_dependents_are_archived(self):
+        """
+        Test that products deleted before the cutoff move out of the hot tables with their discounts and images.
+        """
+        output = self.archive()
+        archived = {self.products[0].id, self.products[1].id}
+
+        self.assertIn("Archived 2 products", output)
+        self.assertEqual(product_archive.count(), 2)
+        self.assertFalse(archived & self.hot_ids('products_product'))
+        self.assertIn(self.products[2].id, self.hot_ids('products_product'))
+        self.assertFalse(archived & set(Discount.objects.filter(id__in=self.hot_ids('products_discount'))
+                                        .values_list('product_id', flat=True)))
+        self.assertEqual(Image.objects.filter(product_id__in=archived).count(), 2)
+
+        product = Product.everything.get(id=self.products[0].id)
+        self.assertEqual(product.product_discount.count(), 1)
+        self.assertEqual(Product.everything.count(), 4)
+        self.assertEqual(Product.objects.count(), 1)
+
+    def test_archived_products_can_be_restored_and_deleted(self):
+        """
+        Test that restoring an archived product moves it back and hard-deleting one removes it everywhere.
+        """
+        self.archive()
+
+        product = Product.everything.get(id=self.products[0].id)
+        product.restore()
+        self.assertIn(product.id, self.hot_ids('products_product'))
+        self.assertTrue(Discount.objects.filter(product_id=product.id).exists())
+        self.assertTrue(set(Discount.objects.filter(product_id=product.id).values_list('id', flat=True))
+                        <= self.hot_ids('products_discount'))
+        self.assertIsNone(Product.objects.get(id=product.id).deleted_at)
+
+        Product.everything.get(id=self.products[1].id).delete()
+        self.assertEqual(product_archive.count(), 0)
+        self.assertFalse(Discount.objects.filter(product_id=self.products[1].id).exists())
+
+    def test_live_queries_skip_the_archive(self):
+        """
+        Test that live product queries are planned on the hot table alone while everything reads both.
+        """
+        self.assertNotIn('products_product_archive', Product.objects.filter(category=self.category).explain())
+        self.assertIn('products_product_archive', Product.everything.filter(category=self.category).explain())
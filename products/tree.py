@@ -0,0 +1,43 @@
+PATH_SEPARATOR = '/'
+
+
+def make_path(parent_path, category_id):
+    """
+    Returns the materialized path of a category below the given parent path.
+
+    Paths list the IDs from the root down and end with the separator, e.g.
+    ``/1/5/12/``, so ``path LIKE '/1/5/%'`` matches a whole subtree.
+    """
+    return f"{parent_path or PATH_SEPARATOR}{category_id}{PATH_SEPARATOR}"
+
+
+def path_ids(path):
+    """
+    Returns the category IDs of a path, from the root down.
+    """
+    return [int(category_id) for category_id in path.strip(PATH_SEPARATOR).split(PATH_SEPARATOR) if category_id]
+
+
+def compute_paths(parents):
+    """
+    Computes the path and depth of every category from its parent.
+
+    Args:
+        parents (dict): Parent IDs keyed by category ID, None for roots.
+
+    Returns:
+        dict: (path, depth) tuples keyed by category ID. Categories caught in a
+        parent cycle are left out.
+    """
+    children = {}
+    for category_id, parent_id in parents.items():
+        children.setdefault(parent_id, []).append(category_id)
+
+    paths = {}
+    stack = [(category_id, PATH_SEPARATOR, 0) for category_id in children.get(None, [])]
+    while stack:
+        category_id, parent_path, depth = stack.pop()
+        path = make_path(parent_path, category_id)
+        paths[category_id] = (path, depth)
+        stack.extend((child_id, path, depth + 1) for child_id in children.get(category_id, []))
+    return paths
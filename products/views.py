@@ -1,19 +1,26 @@
-from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
-from django.http import HttpRequest
+from django.http import HttpRequest, StreamingHttpResponse
 from rest_framework import status
-from rest_framework.exceptions import ValidationError
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from authentication.tokens import StatelessJWTAuthentication
 from .models import Category, Product
+from .bulk import CONTENT_TYPES, ProductImporter, detect_format, open_text, read_rows, render_products
+from .facets import count_facets, facet_cache, format_facets
+from .pagination import ProductCursorPagination, ProductSearchPagination
+from .search import search_products
 from .serializers import CategoryDetailActionSerializer, CategoryListActionSerializer, ProductDetailActionSerializer, \
-    ProductListActionSerializer, ProductCreateActionSerializer
-from rest_framework.permissions import IsAdminUser, AllowAny
+    ProductListActionSerializer, ProductCreateActionSerializer, ProductSearchResultSerializer
+from rest_framework.permissions import IsAdminUser, AllowAny, IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
+from authentication.models import SellerProfile
 from authentication.permissions import IsSellerOrAdminOrReadOnly
+from core.mixins import CachedResponseMixin, ConditionalGetMixin
 
 
-class CategoryViewSet(ModelViewSet):
+class CategoryViewSet(CachedResponseMixin, ConditionalGetMixin, ModelViewSet):
     """
     ViewSet for managing product categories.
 
@@ -21,25 +28,49 @@ class CategoryViewSet(ModelViewSet):
         serializer_class: The serializer used for category representations.
         queryset: The base queryset for category operations.
         lookup_field: The field used for looking up categories (ID in this case).
+        cache_query_params: Query parameters the cached category list depends on.
     """
 
     serializer_class = CategoryListActionSerializer
     queryset = Category.objects.all()
     lookup_field = 'id'
+    cache_query_params = ('category',)
+
+    def get_cache_tags(self, response):
+        return ['categories']
 
     def get_queryset(self):
         """
         Retrieves the list of categories, optionally filtering by parent category.
+        Actions other than list join the parent and annotate product counts.
 
         Returns:
             queryset: All categories or only parent categories based on request parameters.
         """
         queryset = super().get_queryset()
+        if self.action != 'list':
+            queryset = queryset.with_details()
         category = self.request.query_params.get('category', '').lower()
         if category == 'parents':
             queryset = queryset.filter(parent=None)
         return queryset
 
+    def get_related_validator_querysets(self, request, *args, **kwargs):
+        """
+        Adds the products counted in ``product_amount`` and the parent named in
+        ``parent_name`` to the validators of a category's detail. Products are
+        taken with soft-deleted ones, so deleting one changes the validators.
+
+        Returns:
+            list: The category's products and its parent.
+        """
+        if self.action != 'retrieve':
+            return []
+        return [
+            Product.everything.filter(category_id=kwargs['id']),
+            Category.objects.filter(child__id=kwargs['id']),
+        ]
+
     def get_serializer_class(self, *args, **kwargs):
         """
         Returns appropriate serializer class based on current action.
@@ -66,7 +97,7 @@ class CategoryViewSet(ModelViewSet):
         return super().get_permissions()
 
 
-class ProductViewSet(ModelViewSet):
+class ProductViewSet(CachedResponseMixin, ConditionalGetMixin, ModelViewSet):
     """
     ViewSet for managing products.
 
@@ -76,13 +107,20 @@ class ProductViewSet(ModelViewSet):
         authentication_classes: List of authentication classes (JWT for token-based auth).
         lookup_field: The field used for looking up products (slug in this case).
         filter_backends: List of filter backends used for query filtering.
+        pagination_class: Keyset pagination over the ``order`` query parameter.
+        cache_actions: Actions served from the response cache.
     """
 
     queryset = Product.objects.all()
     serializer_class = ProductListActionSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     lookup_field = 'slug'
     filter_backends = []
+    pagination_class = ProductCursorPagination
+    cache_actions = ('retrieve',)
+
+    def get_cache_tags(self, response):
+        return [f"product:{response.data['id']}"]
 
     def get_permissions(self):
         """
@@ -114,6 +152,8 @@ class ProductViewSet(ModelViewSet):
     def get_queryset(self):
         """
         Retrieves the list of products, optionally filtering by category and products query parameter.
+        With ``descendants=true`` products of every category below the given one are included,
+        matched by an indexed prefix lookup on the category path.
 
         Returns:
             queryset: All products or filtered products based on request parameters.
@@ -122,6 +162,9 @@ class ProductViewSet(ModelViewSet):
         products = self.request.query_params.get('products')
         if products == 'all':
             queryset = Product.objects.all()
+        if self.request.query_params.get('descendants', '').lower() == 'true':
+            path = Category.objects.filter(id=self.kwargs['category_id']).values_list('path', flat=True).first()
+            return queryset.filter(category__path__startswith=path) if path else queryset.none()
         queryset = queryset.filter(category__id=self.kwargs['category_id'])
         return queryset
 
@@ -134,18 +177,42 @@ class ProductViewSet(ModelViewSet):
             category_id (str): The ID of the product's category (if applicable).
             slug (str): The slug of the product to retrieve.
 
+        Returns:
+            Response: JSON response containing the product details or an error message if not found.
+        """
+        return self.cached_response(request, self.conditional_response, self.get_product_detail, slug=slug)
+
+    def get_validator_queryset(self, request, *args, **kwargs):
+        """
+        Returns the rows the response is built from; retrieve looks products up by slug alone.
+
+        Returns:
+            QuerySet: The products behind the response.
+        """
+        if self.action == 'retrieve':
+            return Product.objects.filter(slug=kwargs['slug'])
+        return super().get_validator_queryset(request, *args, **kwargs)
+
+    def get_product_detail(self, request, slug=None):
+        """
+        Serializes a product looked up by its slug.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            slug (str): The slug of the product to retrieve.
+
         Returns:
             Response: JSON response containing the product details or an error message if not found.
         """
         try:
-            queryset = Product.objects.get(slug=slug)
+            queryset = Product.objects.prefetch_related('product_discount').get(slug=slug)
             serializer = ProductDetailActionSerializer(queryset)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Product.DoesNotExist:
             return Response({"error": "Product not found"}, status=status.HTTP_404_NOT_FOUND)
 
 
-class AllProductsViewSet(ModelViewSet):
+class AllProductsViewSet(CachedResponseMixin, ConditionalGetMixin, ModelViewSet):
     """
     ViewSet that allows access to all products with additional filtering options.
 
@@ -154,12 +221,21 @@ class AllProductsViewSet(ModelViewSet):
         queryset: The base queryset for product operations.
         authentication_classes: List of authentication classes (JWT for token-based auth).
         lookup_field: The field used for looking up products (slug in this case).
+        pagination_class: Keyset pagination over the ``order`` query parameter.
+        cache_query_params: Query parameters the cached product list depends on.
+        filter_query_params: Query parameters that narrow the listing, and so its facet counts.
     """
 
     serializer_class = ProductListActionSerializer
     queryset = Product.objects.all()
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     lookup_field = "slug"
+    pagination_class = ProductCursorPagination
+    cache_query_params = ('price', 'order', 'cursor', 'page_size', 'facets')
+    filter_query_params = ('price',)
+
+    def get_cache_tags(self, response):
+        return ['products']
 
     def get_permissions(self):
         """
@@ -170,8 +246,10 @@ class AllProductsViewSet(ModelViewSet):
         """
         if self.action in ['retrieve', 'update', 'create']:
             return [IsSellerOrAdminOrReadOnly()]
-        if self.action == 'list':
+        if self.action in ['list', 'search']:
             return [AllowAny()]
+        if self.action in ['import_products', 'export_products']:
+            return [IsAuthenticated(), IsSellerOrAdminOrReadOnly()]
         return super().get_permissions()
 
     def get_serializer_class(self, *args, **kwargs):
@@ -185,17 +263,24 @@ class AllProductsViewSet(ModelViewSet):
             return ProductCreateActionSerializer
         if self.action in ['retrieve', 'destroy', 'update']:
             return ProductDetailActionSerializer
+        if self.action == 'search':
+            return ProductSearchResultSerializer
         else:
             return self.serializer_class
 
     def get_queryset(self):
         """
-        Retrieves the list of products, applying filtering based on price range and order.
+        Retrieves the list of products, applying filtering based on price range.
+        Ordering by the ``order`` query parameter is applied by the paginator.
+        Both work on the stored effective price, so listings read no discount rows;
+        other actions prefetch discounts for ``discount_amount``.
 
         Returns:
             queryset: Filtered products based on request parameters.
         """
         queryset = super().get_queryset()
+        if self.action not in ['list', 'search']:
+            queryset = queryset.prefetch_related('product_discount')
         price = self.request.query_params.get('price')
         if price:
             if '-' in price:
@@ -203,23 +288,137 @@ class AllProductsViewSet(ModelViewSet):
                 max_value = str(price.split('-')[1])
                 if min_value and max_value:
                     queryset = queryset.filter(
-                        price__gte=int(min_value),
-                        price__lte=int(max_value)
+                        effective_price__gte=int(min_value),
+                        effective_price__lte=int(max_value)
                     )
                 if price[0] == '-':
-                    queryset = queryset.filter(price__lte=int(price.split('-')[1]))
+                    queryset = queryset.filter(effective_price__lte=int(price.split('-')[1]))
             if '-' not in price:
-                queryset = queryset.filter(price__gte=int(price))
+                queryset = queryset.filter(effective_price__gte=int(price))
 
-        order = self.request.query_params.get('order')
-        if order is not None:
-            fields = ['id', '-id', 'price', '-price', 'created_at', '-created_at']
-            if order in fields:
-                queryset = queryset.order_by(order)
+        return queryset
+
+    def get_paginated_response(self, data):
+        """
+        Returns the page, adding facet counts of the whole filtered listing when ``facets=true``.
+        """
+        response = super().get_paginated_response(data)
+        if self.action == 'list' and self.request.query_params.get('facets', '').lower() == 'true':
+            response.data['facets'] = format_facets(self.get_facet_counts())
+        return response
+
+    def get_facet_counts(self):
+        """
+        Counts the filtered products per category, seller and price bucket.
+
+        The unfiltered catalog is read from the Redis facet cache when
+        PRODUCT_FACET_CACHE_ENABLED is set; filtered listings are counted with
+        one grouped query.
+
+        Returns:
+            dict: Counts keyed by facet and value.
+        """
+        filtered = any(self.request.query_params.get(param) for param in self.filter_query_params)
+        if facet_cache.enabled and not filtered:
+            return facet_cache.get()
+        return count_facets(self.get_queryset())
+
+    @action(detail=False, methods=['get'], pagination_class=ProductSearchPagination)
+    def search(self, request, *args, **kwargs):
+        """
+        Searches products by name and description, most relevant first.
+
+        The ``q`` term is matched against the indexed full-text document of each
+        product and, where pg_trgm is installed, by trigram similarity of the name.
+        Results combine with the ``price`` filter and with ``category``, which
+        includes the categories below it when ``descendants=true``, and are keyset
+        paginated by relevance or any listing ``order``.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            Response: A page of matching products with their relevance.
+        """
+        term = request.query_params.get('q', '').strip()
+        if not term:
+            raise ValidationError({'error': 'Search term (q) is required'})
+        queryset = search_products(self.get_queryset(), term)
+
+        category_id = request.query_params.get('category')
+        if category_id:
+            if not category_id.isdigit():
+                raise ValidationError({'error': 'Category must be an ID'})
+            if request.query_params.get('descendants', '').lower() == 'true':
+                path = Category.objects.filter(id=category_id).values_list('path', flat=True).first()
+                queryset = queryset.filter(category__path__startswith=path) if path else queryset.none()
             else:
-                raise ValidationError({'error': f'Order field must be in {fields}'})
+                queryset = queryset.filter(category_id=category_id)
 
-        return queryset
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def get_seller(self, request):
+        """
+        Returns the seller profile of the requesting user.
+
+        Raises:
+            PermissionDenied: If the user has no seller profile.
+        """
+        seller = SellerProfile.objects.filter(user_id=request.user.id).first()
+        if seller is None:
+            raise PermissionDenied("Only sellers can import and export products.")
+        return seller
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_products(self, request, *args, **kwargs):
+        """
+        Creates the requesting seller's products from an uploaded CSV or JSON lines file.
+
+        The file is parsed as a stream and inserted in chunks (see ProductImporter).
+        Valid rows are created even if others are rejected.
+
+        Args:
+            request (HttpRequest): The HTTP request with the ``file`` and an optional ``file_format``.
+
+        Returns:
+            Response: The number of created and rejected products and the errors of the first rejected rows.
+        """
+        seller = self.get_seller(request)
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'error': 'A file is required'})
+        try:
+            file_format = detect_format(upload.name, request.data.get('file_format'))
+        except ValueError as error:
+            raise ValidationError({'error': str(error)})
+
+        report = ProductImporter(seller).run(read_rows(open_text(upload), file_format))
+        response_status = status.HTTP_201_CREATED if report['created'] else status.HTTP_400_BAD_REQUEST
+        return Response(report, status=response_status)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export_products(self, request, *args, **kwargs):
+        """
+        Streams the requesting seller's products as CSV or JSON lines (``file_format`` query parameter).
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            StreamingHttpResponse: The exported products.
+        """
+        seller = self.get_seller(request)
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in CONTENT_TYPES:
+            raise ValidationError({'error': f'Format must be in {list(CONTENT_TYPES)}'})
+        response = StreamingHttpResponse(
+            render_products(Product.objects.filter(seller=seller), file_format),
+            content_type=CONTENT_TYPES[file_format]
+        )
+        response['Content-Disposition'] = f'attachment; filename="products.{file_format}"'
+        return response
 
     def destroy(self, request: HttpRequest, *args, **kwargs):
         """
@@ -232,9 +431,8 @@ class AllProductsViewSet(ModelViewSet):
             Response: JSON response indicating success or failure of the deletion operation.
         """
         product = Product.objects.get(slug=kwargs.get("slug"))
-        user = get_user_model().objects.get(id=request.user.id)
         try:
-            if user.is_seller:
+            if request.user.is_seller:
                 product.soft_delete()
                 return Response({"message": "Product has been deleted successfully!"}, status=status.HTTP_200_OK)
             if request.user.is_superuser:
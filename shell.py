@@ -2,6 +2,7 @@ import random
 import uuid
 from django.utils.text import slugify
 from authentication.models import User, SellerProfile
+from authentication.provisioning import UserProvisioner
 from authentication.models import *
 from order.models import *
 from products.models import *
@@ -10,30 +11,24 @@ categories = []
 for i in range(20):
     categories.append(Category(name=f"Category {i + 1}"))
 Category.objects.bulk_create(categories)
+Category.rebuild_tree()
 
-# Create Users
-users = []
-for i in range(100):
-    users.append(User(
-        username=f"user_{i + 1}",
-        email=f"user_{i + 1}@gmail.com",
-        password='password123',  # Set a default password for simplicity
-        is_staff=False,
-        is_superuser=False
-    ))
-User.objects.bulk_create(users)
-
-# Create Seller Profiles
-seller_profiles = []
-for user in users[:20]:  # Assign SellerProfile to the first 20 users
-    seller_profiles.append(SellerProfile(
-        user=user,
-        first_name=f"FirstName_{user.username}",
-        last_name=f"LastName_{user.username}",
-        company_name=f"Company_{user.username}",
-        about_company=f"About {user.username}"
-    ))
-SellerProfile.objects.bulk_create(seller_profiles)
+# Create Users, the first 20 of them sellers with a SellerProfile
+UserProvisioner(hasher='pbkdf2_sha256_bulk').run(
+    {
+        'username': f"user_{i + 1}",
+        'email': f"user_{i + 1}@gmail.com",
+        'password': 'password123',  # Set a default password for simplicity
+        'is_seller': i < 20,
+        'first_name': f"FirstName_user_{i + 1}",
+        'last_name': f"LastName_user_{i + 1}",
+        'company_name': f"Company_user_{i + 1}",
+        'about_company': f"About user_{i + 1}"
+    }
+    for i in range(100)
+)
+users = list(User.objects.filter(username__startswith='user_'))
+seller_profiles = list(SellerProfile.objects.filter(user__in=users))
 
 # Create Discount Codes
 discount_codes = []
@@ -50,9 +45,11 @@ DiscountCode.objects.bulk_create(discount_codes)
 products = []
 categories = list(Category.objects.all())  # Get all categories
 for i in range(100):
+    price = random.randint(1000, 10000)  # Random price between 1000 and 10000
     products.append(Product(
         name=f"Product {i + 1}",
-        price=random.randint(1000, 10000),  # Random price between 1000 and 10000
+        price=price,
+        effective_price=price,
         detail=f"This is a description for product {i + 1}.",
         category=random.choice(categories),
         warehouse=random.randint(1, 100),  # Random warehouse number between 1 and 100